@@ -0,0 +1,382 @@
+# Agrégation en continu des événements de jeu (interface, simulations, serveur) : cartes de
+# chaleur des tirs et des touches par case, tirs nécessaires pour couler chaque type de navire,
+# durée des coups et centiles du taux de réussite par partie. La boucle de jeu ne fait que déposer
+# des tuples dans une file ; un fil d'arrière-plan les regroupe en lots, les accumule dans des
+# tableaux NumPy de taille fixe (mémoire constante quel que soit le nombre de parties) et vide
+# régulièrement les agrégats sur disque.
+import argparse
+import logging
+import os
+import queue
+import threading
+import time
+
+from enregistrement import COULE, MANQUE, TOUCHE
+from instrumentation import BORNES, Histogramme
+from moteur import NOMS_NAVIRES
+
+journal = logging.getLogger(__name__)
+
+TYPES_NAVIRES = sorted(set(NOMS_NAVIRES)) + ["Autre"]  # Types suivis ("Autre" : navires hors flotte standard)
+RANG_MAX = 400  # Rang de tir maximal distingué pour les navires coulés (au-delà : dernier intervalle)
+BORNES_COUP = BORNES + (2.5, 5.0, 10.0, 30.0, 60.0)  # Bornes (s) des durées de coup, humains compris
+INTERVALLE_VIDAGE = 5.0  # Délai (s) entre deux écritures des agrégats sur disque
+TAILLE_LOT = 4096  # Événements accumulés d'un coup
+PAUSE = 0.05  # Délai (s) entre deux relèves de la file d'événements
+DELAI_ATTENTE = 30.0  # Attente maximale (s) du fil d'agrégation avant de continuer sans lui
+CHAMPS = ("tirs", "touches", "coules", "durees", "somme_durees", "taux", "victoires")  # Tableaux des agrégats
+
+# Types d'événements déposés dans la file
+TIR = 0
+FIN = 1
+FUSION = 2
+SYNCHRO = 3
+
+np = None  # Module NumPy, importé au premier besoin (hors du thread de l'interface)
+
+# Importe NumPy (environ 0,2 s) au premier appel
+def charger_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+# Indice d'un intervalle contenant le quantile q d'une distribution donnée par ses comptes
+def indice_quantile(comptes, q):
+    total = int(comptes.sum())
+    if not total:
+        return 0
+    return int(np.searchsorted(np.cumsum(comptes), q * total))
+
+# Agrégats d'une série de parties sur un plateau de taille donnée
+class Agregats:
+    def __init__(self, taille=10):
+        charger_numpy()
+        self.taille = taille
+        cases = taille * taille
+        self.tirs = np.zeros(cases, dtype=np.int64)  # Tirs reçus par case
+        self.touches = np.zeros(cases, dtype=np.int64)  # Tirs réussis (touché ou coulé) par case
+        self.coules = np.zeros((len(TYPES_NAVIRES), RANG_MAX + 1), dtype=np.int64)  # Type -> rang du tir qui coule
+        self.durees = np.zeros((2, len(BORNES_COUP) + 1), dtype=np.int64)  # Tireur -> histogramme des durées
+        self.somme_durees = np.zeros(2)  # Tireur -> somme des durées (s)
+        self.taux = np.zeros((2, 101), dtype=np.int64)  # Tireur -> parties par taux de réussite (%)
+        self.victoires = np.zeros(2, dtype=np.int64)  # Victoires de chaque tireur
+        self.codes = {"Manqué": (MANQUE, 0), "Touché": (TOUCHE, 0)}  # Résultat -> (code, type coulé)
+
+    # Nombre de parties terminées
+    @property
+    def parties(self):
+        return int(self.victoires.sum())
+
+    # Code et indice du type de navire d'un résultat au format du moteur
+    def decoder(self, resultat):
+        code = self.codes.get(resultat)
+        if code is None:
+            nom = resultat.partition(": ")[2]
+            indice = TYPES_NAVIRES.index(nom) if nom in TYPES_NAVIRES else len(TYPES_NAVIRES) - 1
+            code = self.codes[resultat] = (COULE, indice)
+        return code
+
+    # Accumule un lot de tirs : tuples (tireur, x, y, résultat, rang, durée ou None)
+    def ajouter_tirs(self, tirs):
+        if not tirs:
+            return
+        tireurs, xs, ys, resultats, rangs, durees = zip(*tirs)
+        codes, types = zip(*map(self.decoder, resultats))
+        cases = np.array(xs) * self.taille + np.array(ys)
+        codes = np.array(codes)
+        cases_plateau = self.taille * self.taille
+        self.tirs += np.bincount(cases, minlength=cases_plateau)
+        self.touches += np.bincount(cases[codes != MANQUE], minlength=cases_plateau)
+
+        coule = codes == COULE
+        if coule.any():
+            rangs = np.minimum(np.array(rangs)[coule], RANG_MAX)
+            self.coules += np.bincount(np.array(types)[coule] * (RANG_MAX + 1) + rangs,
+                                       minlength=self.coules.size).reshape(self.coules.shape)
+
+        mesure = np.array([duree is not None for duree in durees])
+        if mesure.any():
+            tireurs = np.array(tireurs)[mesure]
+            durees = np.array([duree for duree in durees if duree is not None], dtype=float)
+            intervalles = np.searchsorted(BORNES_COUP, durees, side="left")
+            largeur = self.durees.shape[1]
+            self.durees += np.bincount(tireurs * largeur + intervalles,
+                                       minlength=self.durees.size).reshape(self.durees.shape)
+            self.somme_durees += np.bincount(tireurs, weights=durees, minlength=2)
+
+    # Accumule un lot de fins de partie : tuples (gagnant, (réussis, ratés) de chaque tireur)
+    def ajouter_fins(self, fins):
+        if not fins:
+            return
+        gagnants, scores = zip(*fins)
+        self.victoires += np.bincount(np.array(gagnants), minlength=2)
+        scores = np.array(scores).reshape(-1, 2, 2)  # Partie, tireur, (réussis, ratés)
+        tirs = scores.sum(axis=2)
+        joue = tirs > 0
+        taux = np.zeros(tirs.shape, dtype=np.int64)
+        taux[joue] = scores[..., 0][joue] * 100 // tirs[joue]
+        tireurs = np.broadcast_to(np.arange(2), tirs.shape)
+        self.taux += np.bincount((tireurs * 101 + taux)[joue], minlength=self.taux.size).reshape(self.taux.shape)
+
+    # Ajoute les agrégats d'une autre série de parties sur un plateau de même taille
+    def fusionner(self, autre):
+        if autre.taille != self.taille:
+            raise ValueError("Agrégats de plateaux de tailles différentes.")
+        for nom in CHAMPS:
+            setattr(self, nom, getattr(self, nom) + getattr(autre, nom))
+
+    # Histogramme des durées de coup d'un tireur (voir instrumentation.Histogramme)
+    def histogramme_durees(self, tireur):
+        histogramme = Histogramme("duree_coup", (("tireur", tireur),), "Durée d'un coup", BORNES_COUP)
+        histogramme.comptes = self.durees[tireur].tolist()
+        histogramme.somme = float(self.somme_durees[tireur])
+        histogramme.nombre = int(self.durees[tireur].sum())
+        return histogramme
+
+    # Résumé sérialisable en JSON ; avec cartes, les cartes de chaleur (lignes x, colonnes y)
+    def instantane(self, cartes=True):
+        n = self.taille
+        couler = {}
+        for indice, nom in enumerate(TYPES_NAVIRES):
+            comptes = self.coules[indice]
+            nombre = int(comptes.sum())
+            if nombre:
+                couler[nom] = {
+                    "nombre": nombre,
+                    "moyenne": float(comptes @ np.arange(RANG_MAX + 1)) / nombre,
+                    "p50": indice_quantile(comptes, 0.5),
+                    "p90": indice_quantile(comptes, 0.9),
+                }
+        resume = {
+            "taille": n,
+            "parties": self.parties,
+            "victoires": self.victoires.tolist(),
+            "tirs": int(self.tirs.sum()),
+            "touches": int(self.touches.sum()),
+            "tirs_pour_couler": couler,
+            "duree_coup": [{cle: valeur for cle, valeur in self.histogramme_durees(t).instantane().items()
+                            if cle != "intervalles"} for t in (0, 1)],
+            "taux_reussite": [{f"p{q}": indice_quantile(self.taux[t], q / 100) for q in (10, 50, 90)}
+                              for t in (0, 1)],
+        }
+        if cartes:
+            resume["carte_tirs"] = self.tirs.reshape(n, n).tolist()
+            resume["carte_touches"] = self.touches.reshape(n, n).tolist()
+        return resume
+
+    # Écrit les agrégats bruts (format .npz) ; le fichier est remplacé d'un coup, jamais à moitié écrit
+    def sauver(self, chemin):
+        temporaire = chemin + ".tmp"
+        with open(temporaire, "wb") as fichier:
+            np.savez(fichier, taille=self.taille, types=np.array(TYPES_NAVIRES),
+                     **{nom: getattr(self, nom) for nom in CHAMPS})
+        os.replace(temporaire, chemin)
+
+    # Agrégats relus depuis un fichier écrit par sauver
+    @classmethod
+    def charger(cls, chemin):
+        charger_numpy()
+        with np.load(chemin) as donnees:
+            agregats = cls(int(donnees["taille"]))
+            if donnees["types"].tolist() != TYPES_NAVIRES:
+                raise ValueError("Fichier d'agrégats d'une autre version (types de navires différents).")
+            for nom in CHAMPS:
+                valeur = donnees[nom]
+                if valeur.shape != getattr(agregats, nom).shape:
+                    raise ValueError(f"Fichier d'agrégats incohérent ({nom}).")
+                setattr(agregats, nom, valeur.astype(getattr(agregats, nom).dtype))
+        return agregats
+
+# Étage d'agrégation : les appels tir et fin_partie ne font que déposer un tuple dans une file (de
+# l'ordre de la microseconde) ; un fil d'arrière-plan accumule les événements par lots et, si un
+# chemin est fourni, reprend les agrégats de ce fichier et les y réécrit toutes les intervalle secondes
+class Analytique:
+    def __init__(self, taille=10, chemin=None, intervalle=INTERVALLE_VIDAGE, taille_lot=TAILLE_LOT):
+        self.taille = taille
+        self.chemin = chemin  # Fichier des agrégats (None : en mémoire seulement)
+        self.intervalle = intervalle
+        self.taille_lot = taille_lot
+        self.file = queue.SimpleQueue()  # Événements en attente d'agrégation
+        self.agregats = None  # Agrégats, créés par le fil d'agrégation
+        self.verrou = threading.Lock()  # Protège les agrégats pendant une accumulation
+        self.pret = threading.Event()  # Levé quand les agrégats sont créés
+        self.reveil = threading.Event()  # Demande une relève immédiate de la file
+        self.fil = threading.Thread(target=self.consommer, name="analytique", daemon=True)
+        self.fil.start()
+
+    # Tir de tireur (0 ou 1) ; rang : nombre de tirs de ce tireur dans la partie, celui-ci compris ;
+    # duree : temps du coup en secondes (None si inconnu)
+    def tir(self, tireur, coordonnees, resultat, rang, duree=None):
+        self.file.put((TIR, (tireur, coordonnees[0], coordonnees[1], resultat, rang, duree)))
+
+    # Fin d'une partie gagnée par gagnant, entre deux joueurs du moteur
+    def fin_partie(self, gagnant, joueurs):
+        self.file.put((FIN, (gagnant, tuple((j.tirs_reussis, j.tirs_rates) for j in joueurs))))
+
+    # Ajoute des agrégats calculés ailleurs (lots de simulation d'autres processus)
+    def fusionner(self, agregats):
+        self.file.put((FUSION, agregats))
+
+    # Attend (au plus delai secondes) que les agrégats soient créés ; renvoie False sinon
+    def attendre_pret(self, delai=DELAI_ATTENTE):
+        if self.pret.wait(delai):
+            return True
+        journal.warning("Fil d'agrégation toujours pas prêt après %.0f s", delai)
+        return False
+
+    # Attend (au plus delai secondes) que tous les événements déjà déposés soient accumulés ;
+    # renvoie False si le fil d'agrégation n'a pas répondu à temps
+    def synchroniser(self, delai=DELAI_ATTENTE):
+        fait = threading.Event()
+        self.file.put((SYNCHRO, fait))
+        self.reveil.set()
+        if fait.wait(delai):
+            return True
+        journal.warning("Fil d'agrégation sans réponse après %.0f s", delai)
+        return False
+
+    # Résumé à jour des agrégats (voir Agregats.instantane)
+    def instantane(self, cartes=True):
+        self.synchroniser()
+        with self.verrou:
+            return self.agregats.instantane(cartes)
+
+    # Accumule les derniers événements, écrit les agrégats et arrête le fil d'agrégation
+    def fermer(self):
+        self.file.put(None)
+        self.reveil.set()
+        self.fil.join()
+
+    # Agrégats de départ : ceux du fichier s'il existe et correspond à la taille du plateau
+    def agregats_initiaux(self):
+        if self.chemin is not None and os.path.exists(self.chemin):
+            try:
+                agregats = Agregats.charger(self.chemin)
+                if agregats.taille == self.taille:
+                    return agregats
+                journal.warning("Agrégats de %s ignorés : plateau %dx%d", self.chemin, agregats.taille, agregats.taille)
+            except Exception as e:  # Fichier corrompu : zipfile.BadZipFile, pickle.UnpicklingError, EOFError...
+                journal.warning("Agrégats de %s illisibles, repartis de zéro : %r", self.chemin, e)
+        return Agregats(self.taille)
+
+    # Écrit les agrégats sur disque (sans interrompre l'agrégation en cas d'échec)
+    def vider(self):
+        if self.chemin is None:
+            return
+        try:
+            with self.verrou:
+                self.agregats.sauver(self.chemin)
+        except OSError as e:
+            journal.warning("Écriture des agrégats impossible : %s", e)
+
+    # Accumule des tirs et des fins de partie ; renvoie True s'il y en avait
+    def accumuler(self, tirs, fins):
+        if not tirs and not fins:
+            return False
+        with self.verrou:
+            self.agregats.ajouter_tirs(tirs)
+            self.agregats.ajouter_fins(fins)
+        return True
+
+    # Boucle du fil d'agrégation : la file est relevée toutes les PAUSE secondes (ou à la demande)
+    # plutôt qu'à chaque événement, pour que la boucle de jeu ne réveille pas le fil à chaque tir
+    def consommer(self):
+        try:
+            self.agregats = self.agregats_initiaux()
+        finally:
+            self.pret.set()  # Ceux qui attendent le fil ne doivent jamais rester bloqués
+        echeance = time.monotonic() + self.intervalle
+        modifie, en_cours = False, True
+        while en_cours:
+            self.reveil.wait(PAUSE)
+            self.reveil.clear()
+            tirs, fins, attentes = [], [], []
+            while True:
+                try:
+                    evenement = self.file.get_nowait()
+                except queue.Empty:
+                    break
+                if evenement is None:
+                    en_cours = False
+                    break
+                genre, contenu = evenement
+                if genre == TIR:
+                    tirs.append(contenu)
+                    if len(tirs) >= self.taille_lot:
+                        modifie = self.accumuler(tirs, fins) or modifie
+                        tirs, fins = [], []
+                elif genre == FIN:
+                    fins.append(contenu)
+                elif genre == FUSION:
+                    with self.verrou:
+                        self.agregats.fusionner(contenu)
+                    modifie = True
+                else:
+                    attentes.append(contenu)
+            modifie = self.accumuler(tirs, fins) or modifie
+            for attente in attentes:
+                attente.set()
+            if not en_cours or time.monotonic() >= echeance:
+                if modifie:
+                    self.vider()
+                    modifie = False
+                echeance = time.monotonic() + self.intervalle
+
+# Affiche le résumé d'agrégats et, pour les petits plateaux, la carte des taux de touche par case
+def afficher(agregats):
+    resume = agregats.instantane(cartes=False)
+    print(f"{resume['parties']} parties, {resume['tirs']} tirs, {resume['touches']} touches "
+          f"(victoires {resume['victoires'][0]} / {resume['victoires'][1]})")
+    for nom, ligne in resume["tirs_pour_couler"].items():
+        print(f"{nom:13s} coulé en {ligne['moyenne']:.1f} tirs (médiane {ligne['p50']}, p90 {ligne['p90']}, "
+              f"{ligne['nombre']} navires)")
+    for tireur in (0, 1):
+        duree, taux = resume["duree_coup"][tireur], resume["taux_reussite"][tireur]
+        print(f"Tireur {tireur}: coup moyen {duree['moyenne'] * 1e3:.3f} ms (p50 ≤ {duree['p50'] * 1e3:g} ms, "
+              f"p99 ≤ {duree['p99'] * 1e3:g} ms), taux de réussite p10 {taux['p10']} %, "
+              f"médiane {taux['p50']} %, p90 {taux['p90']} %")
+    n = agregats.taille
+    if n <= 20 and resume["tirs"]:
+        print("Taux de touche par case (%) :")
+        tirs = agregats.tirs.reshape(n, n)
+        taux = np.divide(agregats.touches.reshape(n, n) * 100, tirs, out=np.zeros((n, n)), where=tirs > 0)
+        for ligne in taux:
+            print(" ".join(f"{valeur:3.0f}" for valeur in ligne))
+
+# Mesure le coût, pour la boucle de jeu, d'un événement de tir déposé dans la file
+def mesurer(evenements=200_000):
+    analytique = Analytique()
+    analytique.attendre_pret()
+    debut = time.perf_counter()
+    for i in range(evenements):
+        analytique.tir(i & 1, (i % 10, i // 10 % 10), "Touché" if i % 5 == 0 else "Manqué", i % 100 + 1, 1e-4)
+    depot = (time.perf_counter() - debut) / evenements
+    analytique.synchroniser()
+    total = (time.perf_counter() - debut) / evenements
+    analytique.fermer()
+    return depot, total
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Résumé des agrégats de parties (cartes de chaleur, statistiques)")
+    parser.add_argument("fichier", nargs="?", default=None, help="fichier d'agrégats (.npz)")
+    parser.add_argument("--json", action="store_true", help="affiche le résumé complet en JSON")
+    parser.add_argument("--mesurer", action="store_true", help="mesure le coût d'un événement pour la boucle de jeu")
+    args = parser.parse_args(arguments)
+
+    if args.mesurer:
+        depot, total = mesurer()
+        print(f"Dépôt d'un tir: {depot * 1e6:.2f} µs ; agrégation comprise: {total * 1e6:.2f} µs par tir")
+        return
+    if args.fichier is None:
+        parser.error("indiquez un fichier d'agrégats ou --mesurer")
+    agregats = Agregats.charger(args.fichier)
+    if args.json:
+        import json
+        print(json.dumps(agregats.instantane(), indent=2))
+    else:
+        afficher(agregats)
+
+# Point d'entrée pour consulter des agrégats
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Service audio de l'interface : initialisation du mixer et décodage des sons en arrière-plan,
+# un canal réservé par son, limitation de la fréquence de lecture et repli silencieux
+# lorsque pygame ou le périphérique audio est absent
+import logging
+import os
+import threading
+import time
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))  # Les sons sont cherchés à côté du module
+
+# Sons de l'interface : nom -> fichier
+SONS = {
+    "touche": "touche.mp3",
+    "manque": "manque.mp3",
+    "coule": "coule.mp3",
+}
+
+journal = logging.getLogger(__name__)
+
+INTERVALLE_MINIMUM = 0.08  # Délai minimal (s) entre deux lectures d'un même son
+DELAI_FERMETURE = 2.0  # Attente maximale (s) de la fin du décodage en cours à la fermeture
+
+# Service jouant les sons de l'interface sans jamais bloquer l'appelant
+class ServiceAudio:
+    def __init__(self, sons=SONS, dossier=DOSSIER, intervalle_minimum=INTERVALLE_MINIMUM, silencieux=None):
+        self.sons = dict(sons)
+        self.dossier = dossier
+        self.intervalle_minimum = intervalle_minimum
+        self.mixer = None  # Module pygame.mixer une fois initialisé, None tant qu'il n'est pas prêt
+        self.canaux = {}  # Canal réservé à chaque son
+        self.tampons = {}  # Sons décodés (None si le fichier est illisible)
+        self.dernieres_lectures = {}  # Instant de la dernière lecture de chaque son
+
+        # BATAILLE_NAVALE_SILENCE=1 force le mode silencieux (intégration continue, machines sans son)
+        if silencieux is None:
+            silencieux = bool(os.environ.get("BATAILLE_NAVALE_SILENCE"))
+        self.actif = not silencieux  # Devient False si l'audio est indisponible
+        self.arret = threading.Event()  # Demande au thread de chargement de s'arrêter
+        self.chargement = None
+        if self.actif:
+            self.chargement = threading.Thread(target=self.initialiser, name="audio", daemon=True)
+            self.chargement.start()
+
+    # Initialise le mixer et décode tous les sons (exécuté dans un thread d'arrière-plan)
+    def initialiser(self):
+        try:
+            import pygame
+            pygame.mixer.init()
+            pygame.mixer.set_num_channels(max(8, len(self.sons)))
+            pygame.mixer.set_reserved(len(self.sons))
+        except Exception as e:  # ImportError, ou pygame.error sans périphérique audio
+            self.desactiver(e)
+            return
+        for i, nom in enumerate(self.sons):
+            self.canaux[nom] = pygame.mixer.Channel(i)
+        self.mixer = pygame.mixer
+        for nom in self.sons:
+            if self.arret.is_set():
+                return  # Fermeture demandée : les sons restants ne sont pas décodés
+            self.tampon(nom)
+
+    # Passe en mode silencieux
+    def desactiver(self, raison):
+        self.actif = False
+        journal.info("Audio désactivé: %s", raison)
+
+    # Son décodé (mis en cache), ou None s'il est illisible ; décode le son s'il ne l'est pas encore,
+    # à n'appeler que depuis le thread de chargement
+    def tampon(self, nom):
+        if nom not in self.tampons:
+            chemin = os.path.join(self.dossier, self.sons[nom])
+            try:
+                self.tampons[nom] = self.mixer.Sound(chemin)
+            except Exception as e:  # Fichier absent ou format non pris en charge
+                journal.warning("Son %s illisible: %s", chemin, e)
+                self.tampons[nom] = None
+        return self.tampons[nom]
+
+    # Joue un son sur son canal réservé ; ignoré si l'audio n'est pas prêt, si le son n'est pas
+    # encore décodé (le décodage reste dans le thread de chargement, l'appelant n'attend jamais)
+    # ou si le même son vient d'être joué
+    def jouer(self, nom):
+        if not self.actif or self.mixer is None:
+            return
+        maintenant = time.monotonic()
+        if maintenant - self.dernieres_lectures.get(nom, float("-inf")) < self.intervalle_minimum:
+            return
+        son = self.tampons.get(nom)
+        if son is not None:
+            self.dernieres_lectures[nom] = maintenant
+            self.canaux[nom].play(son)
+
+    # Arrête les sons et libère le mixer, après avoir arrêté le thread de chargement : le mixer
+    # n'est jamais libéré pendant un décodage (s'il dure plus de DELAI_FERMETURE, il est laissé
+    # au système à la sortie du programme)
+    def fermer(self):
+        self.actif = False
+        self.arret.set()
+        if self.chargement is not None:
+            self.chargement.join(DELAI_FERMETURE)
+            if self.chargement.is_alive():
+                journal.warning("Décodage des sons toujours en cours, mixer laissé ouvert")
+                return
+        if self.mixer is not None:
+            self.mixer.quit()
+            self.mixer = None
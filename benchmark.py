@@ -0,0 +1,211 @@
+# Banc d'essai reproductible du moteur, des IA et du placement.
+#
+# Microbenchmarks (par moteur : liste, bitboard, compact) : placer_navire, generer_placement_aleatoire,
+# tirer, est_coule, jouer et a_perdu ; macrobenchmarks : parties complètes entre IA.
+# Tous les états de départ sont tirés d'une graine fixe : deux exécutions mesurent exactement le
+# même travail. Chaque banc est mesuré lors de plusieurs passes successives sur l'ensemble des bancs
+# et le temps médian est retenu, pour qu'un à-coup de la machine pendant une passe ne fausse pas le
+# résultat. Les résultats peuvent être sauvés en JSON puis comparés à une référence ; celle du
+# dépôt (benchmark_reference.json) s'obtient avec --sauver benchmark_reference.json.
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from moteur import creer_flotte
+from simulation import MOTEURS, jouer_partie, placer_flotte
+
+GRAINE = 20240601
+SEUIL = 0.25  # Ralentissement relatif au-delà duquel un banc est signalé comme régression
+PLANCHER = 0.1  # Ralentissement absolu (µs/op) toujours toléré : bruit des mesures sous la microseconde
+PASSES = 3  # Passes sur l'ensemble des bancs (temps médian retenu)
+RESERVE = 64  # États distincts préparés pour les bancs qui ne modifient pas leur état
+
+# Générateur aléatoire du i-ème état préparé d'un banc
+def rng_etat(nom, i):
+    return random.Random(f"{GRAINE}:{nom}:{i}")
+
+# Toutes les cases d'un plateau, dans un ordre aléatoire
+def cases_melangees(taille, rng):
+    cases = [(x, y) for x in range(taille) for y in range(taille)]
+    rng.shuffle(cases)
+    return cases
+
+# Bancs d'un moteur : nom -> (préparation d'un état, opération mesurée sur cet état, opérations par appel,
+# état réutilisable : l'opération ne le modifie pas)
+def bancs_moteur(moteur):
+    classe_plateau, classe_joueur = MOTEURS[moteur]
+
+    # Plateau avec sa flotte placée
+    def plateau_place(rng):
+        plateau = classe_plateau(rng=rng)
+        placer_flotte(plateau)
+        return plateau
+
+    def preparer_placement(rng):
+        modele = plateau_place(rng)
+        return classe_plateau(rng=rng), creer_flotte(), [list(n.positions) for n in modele.navires]
+
+    def placer(etat):
+        plateau, navires, dispositions = etat
+        for navire, positions in zip(navires, dispositions):
+            plateau.placer_navire(navire, positions)
+
+    def generer(etat):
+        plateau, navires = etat
+        for navire in navires:
+            plateau.generer_placement_aleatoire(navire)
+
+    def tirer(etat):
+        plateau, cases = etat
+        for coordonnees in cases:
+            plateau.tirer(coordonnees)
+
+    # Plateau dont la moitié des cases ont été visées
+    def preparer_mi_partie(rng):
+        plateau = plateau_place(rng)
+        for coordonnees in cases_melangees(plateau.taille, rng)[:50]:
+            plateau.tirer(coordonnees)
+        return plateau
+
+    def est_coule(plateau):
+        for navire in plateau.navires:
+            navire.est_coule()
+
+    def preparer_jouer(rng):
+        cible = plateau_place(rng)
+        return classe_joueur("A", classe_plateau(rng=rng)), cible, cases_melangees(cible.taille, rng)
+
+    def jouer(etat):
+        joueur, cible, cases = etat
+        for coordonnees in cases:
+            joueur.jouer(coordonnees, cible)
+
+    return {
+        "placer_navire": (preparer_placement, placer, 6, False),
+        "generer_placement_aleatoire": (lambda rng: (classe_plateau(rng=rng), creer_flotte()), generer, 6, False),
+        "tirer": (lambda rng: (plateau_place(rng), cases_melangees(10, rng)), tirer, 100, False),
+        "est_coule": (preparer_mi_partie, est_coule, 6, True),
+        "jouer": (preparer_jouer, jouer, 100, False),
+        "a_perdu": (lambda rng: classe_joueur("A", preparer_mi_partie(rng)), lambda joueur: joueur.a_perdu(), 1, True),
+    }
+
+# Bancs de parties complètes : chaque appel joue une partie avec sa propre graine
+def bancs_parties():
+    bancs = {}
+    for niveau_a, niveau_b in (("Facile", "Difficile"), ("Probabiliste", "Difficile")):
+        bancs[f"partie.{niveau_a}-{niveau_b}"] = (
+            lambda rng: rng,
+            lambda rng, a=niveau_a, b=niveau_b: jouer_partie(a, b, "bitboard", rng.randrange(2), rng),
+            1,
+            False,
+        )
+    return bancs
+
+# Tous les bancs, filtrés par moteur et par sous-chaîne du nom
+def tous_les_bancs(moteurs, filtre=None):
+    bancs = {}
+    for moteur in moteurs:
+        for nom, banc in bancs_moteur(moteur).items():
+            bancs[f"{moteur}.{nom}"] = banc
+    bancs.update(bancs_parties())
+    return {nom: banc for nom, banc in bancs.items() if filtre is None or filtre in nom}
+
+# Chronomètre une répétition de `nombre` appels ; les états sont préparés hors chronométrage
+def chronometrer(nom, banc, nombre):
+    preparer, operation, _, reutilisable = banc
+    if reutilisable:
+        reserve = [preparer(rng_etat(nom, i)) for i in range(min(nombre, RESERVE))]
+        etats = [reserve[i % len(reserve)] for i in range(nombre)]
+    else:
+        etats = [preparer(rng_etat(nom, i)) for i in range(nombre)]
+    debut = time.perf_counter()
+    for etat in etats:
+        operation(etat)
+    return time.perf_counter() - debut
+
+# Mesure un banc : meilleur temps par opération (en µs) sur plusieurs répétitions d'au moins
+# duree_min secondes
+def mesurer(nom, banc, repetitions=5, duree_min=0.2):
+    nombre = 1
+    duree = chronometrer(nom, banc, nombre)
+    while duree < duree_min and nombre < 1 << 20:
+        nombre *= 2 if duree == 0 else max(2, min(10, int(duree_min / duree * 1.2) + 1))
+        duree = chronometrer(nom, banc, nombre)
+
+    meilleur = duree
+    for _ in range(repetitions - 1):
+        meilleur = min(meilleur, chronometrer(nom, banc, nombre))
+    return meilleur / (nombre * banc[2]) * 1e6
+
+# Lance les bancs lors de passes passes successives et renvoie le document JSON des résultats
+# (temps médian de chaque banc)
+def executer(bancs, repetitions=5, duree_min=0.2, afficher=True, passes=PASSES):
+    mesures = {nom: [] for nom in bancs}
+    for _ in range(passes):
+        for nom, banc in bancs.items():
+            mesures[nom].append(mesurer(nom, banc, repetitions, duree_min))
+    resultats = {nom: statistics.median(durees) for nom, durees in mesures.items()}
+    if afficher:
+        for nom, duree in resultats.items():
+            print(f"{nom:45s} {duree:12.3f} µs/op")
+    return {
+        "graine": GRAINE,
+        "python": sys.version.split()[0],
+        "plateforme": platform.platform(),
+        "passes": passes,
+        "resultats": resultats,
+    }
+
+# Compare des résultats à une référence ; renvoie la liste des bancs ralentis au-delà du seuil
+# (et de plus de plancher µs/op, pour ne pas signaler le bruit des bancs de quelques centaines de ns)
+def comparer(resultats, reference, seuil=SEUIL, plancher=PLANCHER):
+    regressions = []
+    for nom, duree in resultats["resultats"].items():
+        ancienne = reference["resultats"].get(nom)
+        if ancienne is None:
+            print(f"{nom:45s} (absent de la référence)")
+            continue
+        rapport = duree / ancienne if ancienne else float("inf")
+        marque = ""
+        if rapport > 1 + seuil and duree - ancienne > plancher:
+            marque = "  RÉGRESSION"
+            regressions.append(nom)
+        print(f"{nom:45s} {ancienne:12.3f} -> {duree:12.3f} µs/op ({rapport - 1:+.1%}){marque}")
+    return regressions
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai du moteur, des IA et du placement")
+    parser.add_argument("-m", "--moteur", action="append", choices=sorted(MOTEURS),
+                        help="moteur à mesurer (répétable, tous par défaut)")
+    parser.add_argument("-f", "--filtre", default=None, help="ne mesure que les bancs dont le nom contient ce texte")
+    parser.add_argument("-r", "--repetitions", type=int, default=5, help="répétitions par banc (meilleur temps retenu)")
+    parser.add_argument("-p", "--passes", type=int, default=PASSES,
+                        help="passes sur l'ensemble des bancs (temps médian retenu)")
+    parser.add_argument("--duree-min", type=float, default=0.2, help="durée minimale d'une répétition (s)")
+    parser.add_argument("--sauver", default=None, help="fichier JSON où écrire les résultats")
+    parser.add_argument("--comparer", default=None, help="fichier JSON de référence")
+    parser.add_argument("--seuil", type=float, default=SEUIL, help="ralentissement toléré (0.25 = 25 %%)")
+    parser.add_argument("--plancher", type=float, default=PLANCHER, help="ralentissement toujours toléré (µs/op)")
+    args = parser.parse_args(arguments)
+
+    bancs = tous_les_bancs(args.moteur or sorted(MOTEURS), args.filtre)
+    resultats = executer(bancs, args.repetitions, args.duree_min, args.comparer is None, args.passes)
+    if args.sauver:
+        with open(args.sauver, "w") as fichier:
+            json.dump(resultats, fichier, indent=2, sort_keys=True)
+    if args.comparer:
+        with open(args.comparer) as fichier:
+            reference = json.load(fichier)
+        regressions = comparer(resultats, reference, args.seuil, args.plancher)
+        if regressions:
+            print(f"{len(regressions)} régression(s) au-delà de {args.seuil:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+# Point d'entrée pour lancer le banc d'essai (code de sortie 1 en cas de régression)
+if __name__ == "__main__":
+    sys.exit(main())
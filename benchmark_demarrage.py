@@ -0,0 +1,60 @@
+# Mesure du temps d'import du cœur du jeu avec `python -X importtime`, comparé à un budget.
+# Chaque mesure est faite dans un interpréteur neuf ; le minimum de plusieurs essais est retenu.
+import argparse
+import subprocess
+import sys
+
+MODULES_INTERDITS = ("tkinter", "pygame")  # Ne doivent pas être chargés par le cœur
+BUDGET_MS = 20.0  # Budget d'import de bataille_navale (cœur seul), en millisecondes
+
+# Lance un interpréteur qui importe le module et renvoie {module: temps cumulé en µs}
+def temps_import(module):
+    sortie = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    temps = {}
+    for ligne in sortie.splitlines():
+        if not ligne.startswith("import time:") or "|" not in ligne:
+            continue
+        _, cumule, nom = ligne[len("import time:"):].split("|")
+        if cumule.strip().isdigit():
+            temps[nom.strip()] = int(cumule)
+    return temps
+
+# Meilleur temps d'import (ms) sur plusieurs essais, et modules interdits chargés au passage
+def mesurer(module, essais=5):
+    meilleur = None
+    interdits = set()
+    for _ in range(essais):
+        temps = temps_import(module)
+        interdits.update(nom for nom in temps if nom.split(".")[0] in MODULES_INTERDITS)
+        if meilleur is None or temps[module] < meilleur:
+            meilleur = temps[module]
+    return meilleur / 1000, sorted(interdits)
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Temps d'import du cœur du jeu comparé à un budget")
+    parser.add_argument("modules", nargs="*", default=["bataille_navale", "moteur", "simulation"],
+                        help="modules à importer (le premier est soumis au budget)")
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, help="budget du premier module (ms)")
+    parser.add_argument("-e", "--essais", type=int, default=5, help="nombre d'interpréteurs lancés par module")
+    args = parser.parse_args(arguments)
+
+    echec = False
+    for i, module in enumerate(args.modules):
+        duree, interdits = mesurer(module, args.essais)
+        ligne = f"{module}: {duree:.1f}ms"
+        if i == 0:
+            ligne += f" (budget {args.budget:.1f}ms)"
+            echec = echec or duree > args.budget
+        if interdits:
+            ligne += f", charge {', '.join(interdits)}"
+            echec = echec or i == 0
+        print(ligne)
+    if echec:
+        print("Budget de démarrage dépassé.")
+        return 1
+    return 0
+
+# Point d'entrée pour lancer la mesure (code de sortie 1 si le budget est dépassé)
+if __name__ == "__main__":
+    sys.exit(main())
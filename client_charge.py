@@ -0,0 +1,99 @@
+# Générateur de charge pour le serveur : ouvre des connexions inactives et joue de nombreuses
+# parties simultanées contre l'ordinateur en mesurant la latence aller-retour de chaque tir
+import argparse
+import asyncio
+import random
+import time
+
+import protocole
+from serveur import NIVEAUX_RESEAU, augmenter_limite_fichiers
+
+# Quantile d'une liste de valeurs déjà triée (q entre 0 et 1)
+def quantile(valeurs_triees, q):
+    if not valeurs_triees:
+        return 0.0
+    return valeurs_triees[min(len(valeurs_triees) - 1, int(q * len(valeurs_triees)))]
+
+# Joue une partie contre l'ordinateur en tirant au hasard ; ajoute la latence de chaque tir à latences
+async def jouer_partie(hote, port, niveau, latences, rng):
+    reader, writer = await asyncio.open_connection(hote, port)
+    try:
+        writer.write(protocole.trame(protocole.REJOINDRE, bytes([protocole.CONTRE_ORDINATEUR, niveau])))
+        type_message, contenu = await protocole.lire_trame(reader)
+        if type_message != protocole.PARTIE:
+            raise ConnectionError(f"Réponse inattendue: {type_message}")
+        taille = int.from_bytes(contenu[:2], "big")
+
+        writer.write(protocole.trame(protocole.PLACER))  # Placement aléatoire par le serveur
+        type_message, _ = await protocole.lire_trame(reader)
+        if type_message != protocole.DEBUT:
+            raise ConnectionError(f"Réponse inattendue: {type_message}")
+
+        cases = [(x, y) for x in range(taille) for y in range(taille)]
+        rng.shuffle(cases)
+        for x, y in cases:
+            debut = time.perf_counter()
+            writer.write(protocole.trame(protocole.TIRER, protocole.COORDONNEES.pack(x, y)))
+            # Attend son propre résultat, puis le tir de l'ordinateur ou la fin de partie
+            while True:
+                type_message, contenu = await protocole.lire_trame(reader)
+                if type_message == protocole.FIN:
+                    return contenu[0]
+                if type_message == protocole.ERREUR:
+                    raise ConnectionError(contenu.decode())
+                tireur = contenu[0]
+                if tireur == 0:
+                    latences.append(time.perf_counter() - debut)
+                else:
+                    break
+    finally:
+        writer.close()
+
+# Joue un nombre total de parties avec au plus `simultanees` parties en même temps
+async def lancer_charge(hote, port, parties, simultanees, inactives, niveau, graine):
+    rng = random.Random(graine)
+    connexions_inactives = []
+    for _ in range(inactives):
+        connexions_inactives.append(await asyncio.open_connection(hote, port))
+
+    latences = []
+    restantes = parties
+
+    async def travailleur():
+        nonlocal restantes
+        while restantes > 0:
+            restantes -= 1
+            await jouer_partie(hote, port, niveau, latences, random.Random(rng.getrandbits(64)))
+
+    debut = time.perf_counter()
+    await asyncio.gather(*(travailleur() for _ in range(min(simultanees, parties))))
+    duree = time.perf_counter() - debut
+
+    for _, writer in connexions_inactives:
+        writer.close()
+    return latences, duree
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Générateur de charge pour le serveur de bataille navale")
+    parser.add_argument("--hote", default="127.0.0.1", help="adresse du serveur")
+    parser.add_argument("--port", type=int, default=8765, help="port du serveur")
+    parser.add_argument("-n", "--parties", type=int, default=1000, help="nombre total de parties")
+    parser.add_argument("-s", "--simultanees", type=int, default=200, help="parties jouées en même temps")
+    parser.add_argument("-i", "--inactives", type=int, default=1000, help="connexions ouvertes sans jouer")
+    parser.add_argument("--niveau", choices=NIVEAUX_RESEAU, default="Difficile", help="niveau de l'ordinateur")
+    parser.add_argument("--graine", type=int, default=None, help="graine des tirs")
+    args = parser.parse_args(arguments)
+
+    augmenter_limite_fichiers()
+    latences, duree = asyncio.run(lancer_charge(args.hote, args.port, args.parties, args.simultanees,
+                                                args.inactives, NIVEAUX_RESEAU.index(args.niveau), args.graine))
+    latences.sort()
+    print(f"{args.parties} parties, {len(latences)} tirs en {duree:.2f}s ({len(latences) / duree:.0f} tirs/s), "
+          f"{args.inactives} connexions inactives")
+    print("Latence aller-retour d'un tir: "
+          + ", ".join(f"p{int(q * 100)} {quantile(latences, q) * 1000:.2f}ms" for q in (0.5, 0.9, 0.99))
+          + f", max {latences[-1] * 1000 if latences else 0:.2f}ms")
+
+# Point d'entrée pour lancer le générateur de charge
+if __name__ == "__main__":
+    main()
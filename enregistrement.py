@@ -0,0 +1,219 @@
+# Enregistrement binaire compact des parties, avec lecture en flux et relecture.
+#
+# Un fichier commence par MAGIE puis contient une suite d'enregistrements [longueur:varint][corps].
+# Le corps d'une partie est composé d'entiers varint :
+#   graine, taille,
+#   pour chaque joueur : nombre de navires puis, par navire, nom (indice + 1 dans NOMS_NAVIRES,
+#   0 si inconnu), longueur et origine * 2 + vertical (origine = x * taille + y),
+#   nombre de tirs puis, par tir, case * 8 + tireur * 4 + code (MANQUE, TOUCHE, COULE).
+# Un tir occupe ainsi un ou deux octets sur un plateau 10x10.
+import argparse
+import mmap
+import os
+from collections import Counter
+
+from moteur import NOMS_NAVIRES, Navire, PlateauBitboard, JoueurBitboard
+
+MAGIE = b"BNAV\x01"
+
+# Codes de résultat d'un tir
+MANQUE = 0
+TOUCHE = 1
+COULE = 2
+
+# Ajoute un entier positif encodé en varint (7 bits par octet) à un bytearray
+def ecrire_varint(tampon, valeur):
+    while valeur >= 0x80:
+        tampon.append(valeur & 0x7F | 0x80)
+        valeur >>= 7
+    tampon.append(valeur)
+
+# Lit un varint à la position donnée et renvoie (valeur, position suivante) ; ValueError si les
+# données s'arrêtent au milieu du varint
+def lire_varint(donnees, position):
+    valeur = decalage = 0
+    while True:
+        try:
+            octet = donnees[position]
+        except IndexError:
+            raise ValueError("Enregistrement tronqué.") from None
+        position += 1
+        valeur |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return valeur, position
+        decalage += 7
+
+# Code d'un résultat du moteur ("Manqué", "Touché", "Coulé: nom")
+def coder_resultat(resultat):
+    if resultat == "Manqué":
+        return MANQUE
+    return TOUCHE if resultat == "Touché" else COULE
+
+# Partie enregistrée : flottes des deux joueurs et suite ordonnée des tirs
+class PartieEnregistree:
+    def __init__(self, graine, taille, flottes, tirs):
+        self.graine = graine  # Graine de la partie (0 si inconnue)
+        self.taille = taille  # Taille des plateaux
+        self.flottes = flottes  # Pour chaque joueur, liste de (nom, positions)
+        self.tirs = tirs  # Liste de (tireur, (x, y), code)
+
+    # Indice du joueur gagnant, None si la partie n'est pas terminée
+    def gagnant(self):
+        restantes = [sum(len(positions) for _, positions in flotte) for flotte in self.flottes]
+        for tireur, _, code in self.tirs:
+            if code != MANQUE:
+                restantes[1 - tireur] -= 1
+                if not restantes[1 - tireur]:
+                    return tireur
+        return None
+
+    # Nombre de tirs effectués par un joueur
+    def nb_tirs(self, tireur):
+        return sum(1 for t, _, _ in self.tirs if t == tireur)
+
+    # Reconstruit les deux joueurs après les nb_tirs premiers tirs (tous par défaut) ;
+    # lève ValueError si un tir rejoué ne donne pas le résultat enregistré
+    def reconstruire(self, nb_tirs=None):
+        joueurs = [JoueurBitboard(f"Joueur {i + 1}", PlateauBitboard(self.taille)) for i in range(2)]
+        for joueur, flotte in zip(joueurs, self.flottes):
+            for nom, positions in flotte:
+                joueur.plateau.placer_navire(Navire(nom, len(positions)), positions)
+        for tireur, coordonnees, code in self.tirs[:nb_tirs]:
+            resultat = joueurs[tireur].jouer(coordonnees, joueurs[1 - tireur].plateau)
+            if coder_resultat(resultat) != code:
+                raise ValueError(f"Relecture incohérente au tir {coordonnees}: {resultat}")
+        return joueurs
+
+    # Encode la partie (sans préfixe de longueur)
+    def encoder(self):
+        tampon = bytearray()
+        ecrire_varint(tampon, self.graine)
+        ecrire_varint(tampon, self.taille)
+        for flotte in self.flottes:
+            ecrire_varint(tampon, len(flotte))
+            for nom, positions in flotte:
+                (x, y) = positions[0]
+                vertical = len(positions) > 1 and positions[1][0] != x
+                ecrire_varint(tampon, NOMS_NAVIRES.index(nom) + 1 if nom in NOMS_NAVIRES else 0)
+                ecrire_varint(tampon, len(positions))
+                ecrire_varint(tampon, (x * self.taille + y) * 2 + vertical)
+        ecrire_varint(tampon, len(self.tirs))
+        for tireur, (x, y), code in self.tirs:
+            ecrire_varint(tampon, (x * self.taille + y) * 8 + tireur * 4 + code)
+        return bytes(tampon)
+
+    # Décode une partie à partir du corps d'un enregistrement
+    @classmethod
+    def decoder(cls, donnees):
+        graine, position = lire_varint(donnees, 0)
+        taille, position = lire_varint(donnees, position)
+        flottes = []
+        for _ in range(2):
+            nb_navires, position = lire_varint(donnees, position)
+            flotte = []
+            for _ in range(nb_navires):
+                nom, position = lire_varint(donnees, position)
+                longueur, position = lire_varint(donnees, position)
+                origine, position = lire_varint(donnees, position)
+                x, y = divmod(origine >> 1, taille)
+                if origine & 1:
+                    positions = [(x + i, y) for i in range(longueur)]
+                else:
+                    positions = [(x, y + i) for i in range(longueur)]
+                flotte.append((NOMS_NAVIRES[nom - 1] if nom else "Navire", positions))
+            flottes.append(flotte)
+        nb_tirs, position = lire_varint(donnees, position)
+        tirs = []
+        for _ in range(nb_tirs):
+            tir, position = lire_varint(donnees, position)
+            tirs.append(((tir >> 2) & 1, divmod(tir >> 3, taille), tir & 3))
+        return cls(graine, taille, flottes, tirs)
+
+# Suit une partie en cours et produit sa PartieEnregistree
+class EnregistreurPartie:
+    def __init__(self, graine, joueurs):
+        taille = joueurs[0].plateau.taille
+        flottes = [[(navire.nom, list(navire.positions)) for navire in joueur.plateau.navires] for joueur in joueurs]
+        self.partie = PartieEnregistree(graine, taille, flottes, [])
+
+    # Enregistre un tir et son résultat
+    def tir(self, tireur, coordonnees, resultat):
+        self.partie.tirs.append((tireur, coordonnees, coder_resultat(resultat)))
+
+# Écrit des parties à la suite dans un fichier binaire (ouvert en mode "ab" ou "wb")
+class EcrivainParties:
+    def __init__(self, fichier, entete=True):
+        self.fichier = fichier
+        if entete and fichier.tell() == 0:
+            fichier.write(MAGIE)
+
+    # Ajoute une partie au fichier
+    def ecrire(self, partie):
+        self.ecrire_brut(partie.encoder())
+
+    # Ajoute un corps d'enregistrement déjà encodé
+    def ecrire_brut(self, corps):
+        entete = bytearray()
+        ecrire_varint(entete, len(corps))
+        self.fichier.write(entete)
+        self.fichier.write(corps)
+
+    # Ajoute une suite d'enregistrements déjà encodés par un autre écrivain (sans en-tête de fichier)
+    def ecrire_enregistrements(self, octets):
+        self.fichier.write(octets)
+
+# Parcourt les enregistrements d'un fichier (projeté en mémoire) sans le charger entièrement ;
+# renvoie le corps brut de chaque partie, à décoder avec PartieEnregistree.decoder. ValueError si
+# le fichier n'est pas un fichier de parties ou s'arrête au milieu d'un enregistrement
+def lire_enregistrements(chemin):
+    if os.path.getsize(chemin) <= len(MAGIE):
+        return
+    with open(chemin, "rb") as fichier, mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as donnees:
+        if donnees[:len(MAGIE)] != MAGIE:
+            raise ValueError(f"{chemin} n'est pas un fichier de parties.")
+        position = len(MAGIE)
+        while position < len(donnees):
+            longueur, position = lire_varint(donnees, position)
+            if position + longueur > len(donnees):
+                raise ValueError("Enregistrement tronqué.")
+            yield donnees[position:position + longueur]
+            position += longueur
+
+# Parcourt les parties d'un fichier, éventuellement filtrées par une fonction
+def lire_parties(chemin, filtre=None):
+    for corps in lire_enregistrements(chemin):
+        partie = PartieEnregistree.decoder(corps)
+        if filtre is None or filtre(partie):
+            yield partie
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Lecture d'un fichier de parties enregistrées")
+    parser.add_argument("fichier", help="fichier de parties")
+    parser.add_argument("--rejouer", type=int, default=None, help="reconstruit la partie de ce numéro")
+    parser.add_argument("--tir", type=int, default=None, help="nombre de tirs à rejouer (tous par défaut)")
+    args = parser.parse_args(arguments)
+
+    if args.rejouer is not None:
+        for numero, partie in enumerate(lire_parties(args.fichier)):
+            if numero == args.rejouer:
+                joueurs = partie.reconstruire(args.tir)
+                for joueur in joueurs:
+                    print(f"{joueur.nom}: {len(joueur.tirs_effectues)} tirs, {joueur.tirs_reussis} réussis, "
+                          f"{sum(n.est_coule() for n in joueur.plateau.navires)} navires coulés")
+                return
+        print(f"Partie {args.rejouer} introuvable.")
+        return
+
+    parties = tirs = 0
+    victoires = Counter()
+    for partie in lire_parties(args.fichier):
+        parties += 1
+        tirs += len(partie.tirs)
+        victoires[partie.gagnant()] += 1
+    taille = os.path.getsize(args.fichier)
+    print(f"{parties} parties, {tirs} tirs, {taille} octets ({taille / max(tirs, 1):.2f} octets par tir)")
+    print(f"Victoires: joueur 1 {victoires[0]}, joueur 2 {victoires[1]}")
+
+# Point d'entrée pour inspecter un fichier de parties
+if __name__ == "__main__":
+    main()
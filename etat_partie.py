@@ -0,0 +1,248 @@
+# États de partie immuables à partage de structure. Les flottes, fixées une fois pour toutes, sont
+# partagées par tous les états d'une partie ; chaque tir crée un nouvel état qui pointe vers le
+# précédent et ne stocke que le tir et les masques des cases visées (bit x * taille + y).
+# Conserver un état (instantané, embranchement) coûte O(1), annuler un tir revient à suivre le
+# lien vers l'état parent, et un état se sérialise dans le format compact d'enregistrement.
+import argparse
+import copy
+import random
+import time
+
+from enregistrement import COULE, MANQUE, TOUCHE, PartieEnregistree
+from moteur import Navire, Joueur, Plateau
+
+MAGIE_SAUVEGARDE = b"BNSV\x01"  # En-tête d'une partie sauvegardée
+
+# Flottes des deux joueurs, jamais modifiées après création
+class Flottes:
+    __slots__ = ("taille", "navires", "navire_par_case")
+
+    def __init__(self, taille, flottes):
+        self.taille = taille  # Taille des plateaux
+        self.navires = []  # Pour chaque joueur, tuple de (nom, positions, masque) par navire
+        self.navire_par_case = []  # Pour chaque joueur, case packée -> indice du navire
+        for flotte in flottes:
+            navires, par_case = [], {}
+            for indice, (nom, positions) in enumerate(flotte):
+                masque = 0
+                for x, y in positions:
+                    case = x * taille + y
+                    if not (0 <= x < taille and 0 <= y < taille) or case in par_case:
+                        raise ValueError("Flotte invalide : case hors du plateau ou déjà occupée.")
+                    par_case[case] = indice
+                    masque |= 1 << case
+                navires.append((nom, tuple(positions), masque))
+            self.navires.append(tuple(navires))
+            self.navire_par_case.append(par_case)
+        self.navires = tuple(self.navires)
+        self.navire_par_case = tuple(self.navire_par_case)
+
+# Position d'une partie après une suite de tirs ; les attributs ne sont jamais modifiés
+class EtatPartie:
+    __slots__ = ("flottes", "parent", "tireur", "case", "code", "tirs", "coules", "profondeur")
+
+    def __init__(self, flottes, parent=None, tireur=None, case=None, code=None, tirs=(0, 0), coules=(0, 0)):
+        self.flottes = flottes  # Flottes partagées par tous les états de la partie
+        self.parent = parent  # État avant le dernier tir (None pour l'état initial)
+        self.tireur = tireur  # Joueur (0 ou 1) qui a effectué le dernier tir
+        self.case = case  # Case packée visée par le dernier tir
+        self.code = code  # Résultat du dernier tir (MANQUE, TOUCHE, COULE)
+        self.tirs = tirs  # Pour chaque joueur, masque des cases qu'il a visées
+        self.coules = coules  # Pour chaque joueur, nombre de ses navires coulés
+        self.profondeur = parent.profondeur + 1 if parent is not None else 0  # Nombre de tirs joués
+
+    # État initial d'une partie : flottes données sous forme de listes de (nom, positions)
+    @classmethod
+    def initial(cls, taille, flottes):
+        return cls(Flottes(taille, flottes))
+
+    # État initial reprenant les flottes placées sur les plateaux de deux joueurs
+    @classmethod
+    def depuis_joueurs(cls, joueurs):
+        flottes = [[(navire.nom, list(navire.positions)) for navire in joueur.plateau.navires] for joueur in joueurs]
+        return cls.initial(joueurs[0].plateau.taille, flottes)
+
+    # Vérifie si une case a déjà été visée par un joueur
+    def deja_vise(self, tireur, coordonnees):
+        x, y = coordonnees
+        n = self.flottes.taille
+        return 0 <= x < n and 0 <= y < n and bool(self.tirs[tireur] >> (x * n + y) & 1)
+
+    # Tir d'un joueur sur le plateau adverse : renvoie (nouvel état, résultat au format du moteur)
+    def jouer(self, tireur, coordonnees):
+        x, y = coordonnees
+        n = self.flottes.taille
+        if not (0 <= x < n and 0 <= y < n):
+            raise ValueError("Tir hors des limites de la grille.")
+        case = x * n + y
+        bit = 1 << case
+        if self.tirs[tireur] & bit:
+            raise ValueError("Case déjà visée.")
+        tirs = (self.tirs[0] | bit, self.tirs[1]) if tireur == 0 else (self.tirs[0], self.tirs[1] | bit)
+
+        cible = 1 - tireur
+        indice = self.flottes.navire_par_case[cible].get(case)
+        coules = self.coules
+        if indice is None:
+            code, resultat = MANQUE, "Manqué"
+        else:
+            nom, _, masque = self.flottes.navires[cible][indice]
+            if masque & tirs[tireur] == masque:
+                code, resultat = COULE, f"Coulé: {nom}"
+                coules = (coules[0] + 1, coules[1]) if cible == 0 else (coules[0], coules[1] + 1)
+            else:
+                code, resultat = TOUCHE, "Touché"
+        return EtatPartie(self.flottes, self, tireur, case, code, tirs, coules), resultat
+
+    # Indice du joueur gagnant, None si la partie n'est pas terminée
+    def gagnant(self):
+        for joueur in (0, 1):
+            if self.coules[1 - joueur] == len(self.flottes.navires[1 - joueur]):
+                return joueur
+        return None
+
+    # Résultat du dernier tir au format du moteur ("Manqué", "Touché", "Coulé: nom")
+    def resultat(self):
+        if self.code == MANQUE:
+            return "Manqué"
+        if self.code == TOUCHE:
+            return "Touché"
+        cible = 1 - self.tireur
+        nom = self.flottes.navires[cible][self.flottes.navire_par_case[cible][self.case]][0]
+        return f"Coulé: {nom}"
+
+    # Coordonnées (x, y) du dernier tir
+    def coordonnees(self):
+        return divmod(self.case, self.flottes.taille)
+
+    # États successifs depuis le premier tir jusqu'à celui-ci (état initial exclu)
+    def etats(self):
+        etats = []
+        etat = self
+        while etat.parent is not None:
+            etats.append(etat)
+            etat = etat.parent
+        etats.reverse()
+        return etats
+
+    # Suite des tirs depuis l'état initial : liste de (tireur, (x, y), code)
+    def historique(self):
+        return [(etat.tireur, etat.coordonnees(), etat.code) for etat in self.etats()]
+
+    # Partie au format d'enregistrement (flottes et tirs)
+    def partie(self, graine=0):
+        flottes = [[(nom, list(positions)) for nom, positions, _ in navires] for navires in self.flottes.navires]
+        return PartieEnregistree(graine, self.flottes.taille, flottes, self.historique())
+
+    # Reconstruit les deux joueurs (objets mutables du moteur) dans cet état
+    def reconstruire(self, noms=("Joueur 1", "Joueur 2"), classe_joueur=Joueur, classe_plateau=Plateau):
+        joueurs = [classe_joueur(nom, classe_plateau(self.flottes.taille)) for nom in noms]
+        for joueur, navires in zip(joueurs, self.flottes.navires):
+            for nom, positions, _ in navires:
+                joueur.plateau.placer_navire(Navire(nom, len(positions)), list(positions))
+        for tireur, coordonnees, _ in self.historique():
+            joueurs[tireur].jouer(coordonnees, joueurs[1 - tireur].plateau)
+        return joueurs
+
+    # Sauvegarde compacte de l'état (un à deux octets par tir sur un plateau 10x10)
+    def sauvegarder(self):
+        return MAGIE_SAUVEGARDE + self.partie().encoder()
+
+    # État relu depuis une sauvegarde ; les tirs sont rejoués et leurs résultats vérifiés
+    @classmethod
+    def charger(cls, donnees):
+        if not donnees.startswith(MAGIE_SAUVEGARDE):
+            raise ValueError("Ce fichier n'est pas une sauvegarde de bataille navale.")
+        partie = PartieEnregistree.decoder(donnees[len(MAGIE_SAUVEGARDE):])
+        etat = cls.initial(partie.taille, partie.flottes)
+        for tireur, coordonnees, code in partie.tirs:
+            etat, _ = etat.jouer(tireur, coordonnees)
+            if etat.code != code:
+                raise ValueError(f"Sauvegarde incohérente au tir {coordonnees}.")
+        return etat
+
+# Historique d'une partie avec annulation et rétablissement des tirs en O(1)
+class Historique:
+    def __init__(self, etat):
+        self.etat = etat  # État courant
+        self.a_retablir = []  # États annulés, le plus récent en dernier
+
+    # Joue un tir depuis l'état courant (les tirs annulés ne peuvent plus être rétablis)
+    def jouer(self, tireur, coordonnees):
+        self.etat, resultat = self.etat.jouer(tireur, coordonnees)
+        self.a_retablir = []
+        return resultat
+
+    # Revient à l'état précédent ; renvoie False s'il n'y a rien à annuler
+    def annuler(self):
+        if self.etat.parent is None:
+            return False
+        self.a_retablir.append(self.etat)
+        self.etat = self.etat.parent
+        return True
+
+    # Rejoue le dernier tir annulé ; renvoie False s'il n'y a rien à rétablir
+    def retablir(self):
+        if not self.a_retablir:
+            return False
+        self.etat = self.a_retablir.pop()
+        return True
+
+# Compare le coût d'un instantané (copie profonde de deux joueurs contre simple référence à un
+# EtatPartie) après tirs tirs, et le coût d'un tir et d'une annulation
+def mesurer(tirs=50, repetitions=2000, graine=0):
+    from simulation import placer_flotte
+    rng = random.Random(graine)
+    tirs = min(tirs, 99)  # Une case reste libre pour mesurer un tir
+    joueurs = [Joueur(nom, Plateau(rng=rng)) for nom in ("A", "B")]
+    for joueur in joueurs:
+        placer_flotte(joueur.plateau)
+    historique = Historique(EtatPartie.depuis_joueurs(joueurs))
+    cases = [(x, y) for x in range(10) for y in range(10)]
+    for i, coordonnees in enumerate(rng.sample(cases, tirs) * 2):
+        tireur = i // tirs
+        joueurs[tireur].jouer(coordonnees, joueurs[1 - tireur].plateau)
+        historique.jouer(tireur, coordonnees)
+
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        copy.deepcopy(joueurs)
+    copie = (time.perf_counter() - debut) / repetitions
+
+    etat = historique.etat
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        instantane = historique.etat
+    instantane_etat = (time.perf_counter() - debut) / repetitions
+
+    libre = next(c for c in cases if not etat.deja_vise(0, c))
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        etat.jouer(0, libre)  # L'état n'est pas modifié : chaque tir crée un nouvel état
+    tir = (time.perf_counter() - debut) / repetitions
+
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        historique.annuler()
+        historique.retablir()
+    annulation = (time.perf_counter() - debut) / repetitions / 2
+    return {
+        "copie_profonde_us": copie * 1e6,
+        "instantane_us": instantane_etat * 1e6,
+        "tir_us": tir * 1e6,
+        "annulation_us": annulation * 1e6,
+        "sauvegarde_octets": len(etat.sauvegarder()),
+    }
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Coût des instantanés, annulations et sauvegardes de partie")
+    parser.add_argument("--tirs", type=int, default=50, help="tirs joués par chaque joueur avant la mesure")
+    parser.add_argument("-r", "--repetitions", type=int, default=2000, help="répétitions de chaque opération")
+    args = parser.parse_args(arguments)
+
+    for nom, valeur in mesurer(args.tirs, args.repetitions).items():
+        print(f"{nom}: {valeur:.2f}" if isinstance(valeur, float) else f"{nom}: {valeur}")
+
+# Point d'entrée pour mesurer les instantanés
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,577 @@
+# Stratégies de tir de l'ordinateur, indépendantes de l'interface graphique
+import heapq
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from moteur import FLOTTE, flotte_plateau
+from moteur_creux import ParcoursCases
+from ouverture import symetrie, table_ouverture
+from placement import index_placements
+from transposition import MANQUEE, TOUCHEE, COULEE, zobrist
+
+# Interface commune des stratégies de tir : une stratégie choisit la prochaine case à viser,
+# prend connaissance du résultat de chaque tir de son joueur et peut être remise à zéro. Elle ne
+# touche à aucun widget : l'interface peut l'appeler depuis un thread de travail.
+class Strategie:
+    def __init__(self, joueur, rng=None, table=None):
+        self.joueur = joueur  # Joueur contrôlé par l'ordinateur
+        self.rng = rng if rng is not None else random  # Générateur aléatoire propre à l'IA
+        self.table = table  # Table de transposition partagée entre parties (facultative)
+        self.taille = joueur.plateau.taille  # Taille du plateau adverse
+
+    # Choisit la prochaine case à viser (x, y), parmi celles que le joueur n'a pas encore visées
+    def choisir_tir(self):
+        raise NotImplementedError
+
+    # Prend connaissance du résultat d'un tir
+    def observer(self, coordonnees, resultat):
+        pass
+
+    # Oublie tout ce qui a été appris pendant la partie
+    def reinitialiser(self):
+        pass
+
+# Tir aléatoire (mode facile)
+class IAFacile(Strategie):
+    # Choisit la prochaine case à viser
+    def choisir_tir(self):
+        while True:
+            x, y = self.rng.randint(0, self.taille - 1), self.rng.randint(0, self.taille - 1)
+            if not self.joueur.deja_vise((x, y)):
+                return x, y
+
+# Tir stratégique (mode difficile) : vise les cases voisines après un tir touché ; sans cible, suit
+# le livre d'ouverture (voir ouverture.py) s'il en existe un pour ce plateau, transformé par une
+# symétrie du plateau tirée à chaque partie, puis tire au hasard. Avec un modèle de l'adversaire
+# (voir modele_adversaire.py), les cases où il place habituellement ses navires passent avant le livre.
+class IADifficile(IAFacile):
+    def __init__(self, joueur, rng=None, table=None, ouverture=True, a_priori=None):
+        super().__init__(joueur, rng, table)
+        livre = table_ouverture(self.taille) if ouverture else None
+        self.ouverture = livre.ouverture if livre is not None else ()  # Cases packées du livre d'ouverture
+        habituelles = a_priori.cases_habituelles() if a_priori is not None and a_priori.taille == self.taille else []
+        self.habituelles = [divmod(case, self.taille) for case in habituelles]  # Cases visées avant le livre
+        self.reinitialiser()
+
+    # Choisit la prochaine case à viser
+    def choisir_tir(self):
+        while True:
+            if self.tirs_potentiels:
+                x, y = self.tirs_potentiels.pop(0)
+            elif self.rang_habituelles < len(self.habituelles):
+                x, y = self.habituelles[self.rang_habituelles]
+                self.rang_habituelles += 1
+            elif self.rang_ouverture < len(self.ouverture):
+                x, y = divmod(self.ouverture[self.rang_ouverture], self.taille)
+                x, y = symetrie(x, y, self.taille, self.symetrie)
+                self.rang_ouverture += 1
+            else:
+                x, y = self.rng.randint(0, self.taille - 1), self.rng.randint(0, self.taille - 1)
+
+            if not self.joueur.deja_vise((x, y)):
+                return x, y
+
+    # Ajoute les voisins d'une case touchée aux cibles potentielles
+    def observer(self, coordonnees, resultat):
+        if "Touché" in resultat:
+            x, y = coordonnees
+            self.tirs_potentiels.extend(
+                [(x + dx, y + dy) for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                 if 0 <= x + dx < self.taille and 0 <= y + dy < self.taille
+                 and not self.joueur.deja_vise((x + dx, y + dy))]
+            )
+
+    # Oublie tout ce qui a été appris pendant la partie
+    def reinitialiser(self):
+        self.tirs_potentiels = []  # Liste des cibles potentielles
+        self.rang_habituelles = 0  # Prochaine case habituelle de l'adversaire
+        self.rang_ouverture = 0  # Prochain tir du livre
+        self.symetrie = self.rng.randrange(8) if self.ouverture else 0  # Symétrie appliquée au livre
+
+# Tir par densité de probabilité : chaque case est notée par le nombre de placements des navires
+# encore à flot qui pourraient la couvrir. Les comptes sont mis à jour à chaque tir, seuls les
+# placements qui traversent la case visée sont retirés.
+# Le choix ne dépend que de la position observée : avec une table de transposition, il est
+# mémorisé sous l'empreinte de Zobrist de cette position et resservi aux parties suivantes.
+# Avec un modèle de l'adversaire (voir modele_adversaire.py), chaque placement compte pour son
+# poids a priori au lieu de 1 ; le choix dépend alors du modèle et la table n'est pas utilisée.
+class IAProbabiliste(IAFacile):
+    def __init__(self, joueur, rng=None, flotte=FLOTTE, table=None, a_priori=None):
+        super().__init__(joueur, rng, table)
+        self.flotte = flotte  # Liste (nom, taille) des navires adverses
+        self.taille_par_nom = {nom: taille for nom, taille in flotte}
+        self.longueurs = sorted({taille for _, taille in flotte}, reverse=True)
+        self.zobrist = zobrist(self.taille, tuple(taille for _, taille in flotte))
+
+        # Placements possibles pour chaque longueur, et placements couvrant chaque case (index partagé)
+        self.placements = {}
+        self.couvrant = {}
+        for longueur in self.longueurs:
+            index = index_placements(self.taille, longueur)
+            self.placements[longueur] = index.cases
+            self.couvrant[longueur] = index.couvrant
+        self.poids = None  # Poids a priori de chaque placement par longueur (None : tous égaux à 1)
+        if a_priori is not None and a_priori.taille == self.taille and a_priori.parties:
+            self.poids = {longueur: a_priori.poids_placements(longueur) for longueur in self.longueurs}
+            self.table = None
+        self.reinitialiser()
+
+    # Oublie tout ce qui a été appris pendant la partie
+    def reinitialiser(self):
+        n = self.taille
+        self.restants = {longueur: 0 for longueur in self.longueurs}  # Navires encore à flot par longueur
+        for _, taille in self.flotte:
+            self.restants[taille] += 1
+        self.tire = bytearray(n * n)  # Cases déjà visées
+        self.touches_non_resolues = set()  # Cases touchées n'appartenant à aucun navire coulé connu
+        self.etats = bytearray(n * n)  # État observé de chaque case (INCONNUE, MANQUEE, TOUCHEE, COULEE)
+        self.empreinte = self.zobrist.initiale  # Empreinte de Zobrist de la position observée
+        self.valides = {}  # Placements ne traversant ni un tir manqué ni un navire coulé
+        self.comptes = {}  # Nombre (ou poids) des placements valides couvrant chaque case, par longueur
+        self.densite = [0] * (n * n)  # Somme des comptes pondérée par les navires restants
+        for longueur in self.longueurs:
+            self.valides[longueur] = bytearray(b"\x01") * len(self.placements[longueur])
+            if self.poids is None:
+                compte = [len(couvrant) for couvrant in self.couvrant[longueur]]
+            else:
+                poids = self.poids[longueur]
+                compte = [sum(poids[indice] for indice in couvrant) for couvrant in self.couvrant[longueur]]
+            self.comptes[longueur] = compte
+            for case in range(n * n):
+                self.densite[case] += self.restants[longueur] * compte[case]
+        self.reconstruire_tas()
+
+    # Reconstruit le tas (max-tas par densité) des cases candidates en mode chasse
+    def reconstruire_tas(self):
+        self.tas = [(-d, case) for case, d in enumerate(self.densite) if not self.tire[case]]
+        heapq.heapify(self.tas)
+
+    # Retire tous les placements valides qui traversent une case (tir manqué ou navire coulé)
+    def bloquer(self, case):
+        densite, tire, tas = self.densite, self.tire, self.tas
+        for longueur in self.longueurs:
+            valides = self.valides[longueur]
+            compte = self.comptes[longueur]
+            poids = self.restants[longueur]
+            a_priori = self.poids[longueur] if self.poids is not None else None
+            placements = self.placements[longueur]
+            for indice in self.couvrant[longueur][case]:
+                if not valides[indice]:
+                    continue
+                valides[indice] = 0
+                w = a_priori[indice] if a_priori is not None else 1
+                for autre in placements[indice]:
+                    compte[autre] -= w
+                    if poids:
+                        densite[autre] -= poids * w
+                        if not tire[autre]:
+                            heapq.heappush(tas, (-densite[autre], autre))
+
+    # Change l'état observé d'une case et met à jour l'empreinte
+    def changer_etat(self, case, etat):
+        self.empreinte ^= self.zobrist.case(case, self.etats[case], etat)
+        self.etats[case] = etat
+
+    # Retire un navire de la liste des navires à flot
+    def retirer_navire(self, longueur):
+        self.empreinte ^= self.zobrist.restant(longueur, self.restants[longueur], self.restants[longueur] - 1)
+        self.restants[longueur] -= 1
+        compte = self.comptes[longueur]
+        for case in range(self.taille * self.taille):
+            self.densite[case] -= compte[case]
+        self.reconstruire_tas()
+
+    # Cases formant le navire coulé par le tir sur la case donnée
+    def cases_coulees(self, case, longueur):
+        n = self.taille
+        x, y = divmod(case, n)
+        touches = self.touches_non_resolues
+        for dx, dy in ((0, 1), (1, 0)):
+            for decalage in range(longueur):
+                x0, y0 = x - decalage * dx, y - decalage * dy
+                x1, y1 = x0 + (longueur - 1) * dx, y0 + (longueur - 1) * dy
+                if not (0 <= x0 and 0 <= y0 and x1 < n and y1 < n):
+                    continue
+                cases = [(x0 + i * dx) * n + y0 + i * dy for i in range(longueur)]
+                if all(c in touches for c in cases):
+                    return cases
+        return [case]
+
+    # Choisit la case candidate de plus forte densité (mode chasse)
+    def choisir_chasse(self):
+        tas, densite, tire = self.tas, self.densite, self.tire
+        while tas:
+            d, case = tas[0]
+            if not tire[case] and -d == densite[case]:
+                return case
+            heapq.heappop(tas)
+        return None
+
+    # Choisit la case la plus probable autour des touches non résolues (mode cible)
+    def choisir_cible(self):
+        scores = {}
+        tire = self.tire
+        for touche in self.touches_non_resolues:
+            for longueur in self.longueurs:
+                poids = self.restants[longueur]
+                if not poids:
+                    continue
+                valides = self.valides[longueur]
+                a_priori = self.poids[longueur] if self.poids is not None else None
+                placements = self.placements[longueur]
+                for indice in self.couvrant[longueur][touche]:
+                    if valides[indice]:
+                        w = poids * a_priori[indice] if a_priori is not None else poids
+                        for case in placements[indice]:
+                            if not tire[case]:
+                                scores[case] = scores.get(case, 0) + w
+        if not scores:
+            return None
+        densite = self.densite
+        return max(scores, key=lambda case: (scores[case], densite[case], -case))
+
+    # Choisit la prochaine case à viser
+    def choisir_tir(self):
+        cle = ("densite", self.empreinte)
+        if self.table is not None:
+            case = self.table.chercher(cle)
+            if case is not None:
+                return divmod(case, self.taille)
+        case = None
+        if self.touches_non_resolues:
+            case = self.choisir_cible()
+        if case is None:
+            case = self.choisir_chasse()
+        if case is None:
+            return super().choisir_tir()
+        if self.table is not None:
+            self.table.ranger(cle, case)
+        return divmod(case, self.taille)
+
+    # Met à jour les comptes de placements avec le résultat d'un tir
+    def observer(self, coordonnees, resultat):
+        x, y = coordonnees
+        case = x * self.taille + y
+        if self.tire[case]:
+            return
+        self.tire[case] = 1
+        if resultat == "Manqué":
+            self.changer_etat(case, MANQUEE)
+            self.bloquer(case)
+        elif resultat.startswith("Coulé"):
+            longueur = self.taille_par_nom.get(resultat.split(": ", 1)[1])
+            self.touches_non_resolues.add(case)
+            self.changer_etat(case, TOUCHEE)
+            if longueur is None or not self.restants.get(longueur):
+                return
+            cases = self.cases_coulees(case, longueur)
+            self.touches_non_resolues.difference_update(cases)
+            self.retirer_navire(longueur)
+            for coulee in cases:
+                self.changer_etat(coulee, COULEE)
+                self.bloquer(coulee)
+        else:
+            self.touches_non_resolues.add(case)
+            self.changer_etat(case, TOUCHEE)
+
+BUDGET_EXPERT = 0.005  # Temps de réflexion par tir de l'IA experte (s)
+ESSAIS_TIRAGE = 32  # Tirages d'un placement libre avant d'abandonner un échantillon
+MARGE_PROCESSUS = 0.001  # Temps (s) réservé à l'envoi et à la collecte des échantillons des autres processus
+POIDS_DENSITE = 200  # Poids (en échantillons) de la densité des placements en mode chasse
+
+# Tire des flottes compatibles avec les observations jusqu'à l'échéance (temps de perf_counter)
+# ou jusqu'à maximum échantillons. longueurs : navires à flot ; bloque : cases sans navire possible
+# (tirs manqués, navires coulés) ; touches : cases touchées qui doivent être couvertes.
+# Renvoie (nombre d'échantillons, {longueur: nombre de tirages de chaque placement}).
+def echantillonner(taille, longueurs, bloque, touches, echeance, graine, maximum=None):
+    rng = random.Random(graine)
+    index = {longueur: index_placements(taille, longueur) for longueur in set(longueurs)}
+    masques = {longueur: index[longueur].masques for longueur in index}
+    comptes = {longueur: [0] * len(index[longueur]) for longueur in index}
+    decroissantes = sorted(longueurs, reverse=True)
+    cases_touchees = [case for case in range(taille * taille) if touches >> case & 1]
+    n = 0
+    while (maximum is None or n < maximum) and time.perf_counter() < echeance:
+        occupe, a_couvrir, reste, choix = bloque, touches, list(decroissantes), []
+
+        # Chaque case touchée est d'abord couverte par un navire restant qui la traverse
+        for case in cases_touchees:
+            if not a_couvrir >> case & 1:
+                continue
+            options = [(longueur, indice) for longueur in set(reste) for indice in index[longueur].couvrant[case]
+                       if not masques[longueur][indice] & occupe]
+            if not options:
+                break
+            longueur, indice = rng.choice(options)
+            masque = masques[longueur][indice]
+            if masque & touches == masque:
+                break  # Navire entièrement touché : il aurait été annoncé coulé
+            reste.remove(longueur)
+            occupe |= masque
+            a_couvrir &= ~masque
+            choix.append((longueur, indice))
+        if a_couvrir:
+            continue
+
+        # Les autres navires sont placés au hasard sur les cases libres
+        for longueur in reste:
+            masques_longueur = masques[longueur]
+            for _ in range(ESSAIS_TIRAGE):
+                indice = rng.randrange(len(masques_longueur))
+                if not masques_longueur[indice] & occupe:
+                    break
+            else:
+                break
+            occupe |= masques_longueur[indice]
+            choix.append((longueur, indice))
+        else:
+            n += 1
+            for longueur, indice in choix:
+                comptes[longueur][indice] += 1
+    return n, comptes
+
+_executeurs = {}  # Groupes de processus de l'IA experte, par nombre de processus
+
+# Groupe de processus persistant (créé au premier usage)
+def executeur_expert(processus):
+    if processus not in _executeurs:
+        _executeurs[processus] = ProcessPoolExecutor(processus)
+    return _executeurs[processus]
+
+# Tir par échantillonnage de Monte-Carlo : tire autant de flottes compatibles avec les tirs
+# observés que le budget de temps le permet (algorithme « anytime ») et vise la case non encore
+# visée couverte par le plus de flottes. Avec processus > 1, d'autres processus échantillonnent
+# en parallèle pendant le même budget. La table de transposition conserve, pour une position, le
+# nombre d'échantillons couvrant chaque case : revenir sur une position déjà vue prolonge
+# l'échantillonnage au lieu de le reprendre.
+class IAExpert(IAProbabiliste):
+    def __init__(self, joueur, rng=None, flotte=FLOTTE, table=None, budget=BUDGET_EXPERT, processus=1,
+                 echantillons_max=None, poids_densite=POIDS_DENSITE, a_priori=None):
+        super().__init__(joueur, rng, flotte, table, a_priori)
+        self.poids_densite = poids_densite  # Poids de la densité en mode chasse (0 = échantillons seuls)
+        self.budget = budget  # Temps de réflexion par tir (s)
+        self.processus = processus  # Processus qui échantillonnent (1 = uniquement le processus courant)
+        self.echantillons_max = echantillons_max  # Limite d'échantillons par tir (reproductibilité)
+        self.echantillons = 0  # Échantillons tirés pour le dernier tir
+
+    # Masques des cases bloquées et des cases touchées non résolues, et longueurs des navires à flot
+    def observations(self):
+        bloque = touches = 0
+        for case, etat in enumerate(self.etats):
+            if etat == MANQUEE or etat == COULEE:
+                bloque |= 1 << case
+            elif etat == TOUCHEE:
+                touches |= 1 << case
+        longueurs = [longueur for longueur, nombre in self.restants.items() for _ in range(nombre)]
+        return bloque, touches, longueurs
+
+    # Échantillonne pendant le budget, dans ce processus et éventuellement dans d'autres
+    def echantillonner(self, bloque, touches, longueurs):
+        debut = time.perf_counter()
+        echeance = debut + self.budget
+        taches = []
+        if self.processus > 1 and self.budget > MARGE_PROCESSUS:
+            executeur = executeur_expert(self.processus - 1)
+            duree = self.budget - MARGE_PROCESSUS
+            maximum = self.echantillons_max // self.processus if self.echantillons_max else None
+            taches = [executeur.submit(_echantillonner_pendant, self.taille, longueurs, bloque, touches, duree,
+                                       self.rng.getrandbits(64), maximum)
+                      for _ in range(self.processus - 1)]
+        maximum = self.echantillons_max // max(1, len(taches) + 1) if self.echantillons_max else None
+        n, comptes = echantillonner(self.taille, longueurs, bloque, touches,
+                                    echeance - (MARGE_PROCESSUS if taches else 0), self.rng.getrandbits(64), maximum)
+        if taches:
+            faites, _ = wait(taches, timeout=max(0.0, echeance - time.perf_counter()))
+            for tache in taches:
+                if tache not in faites:
+                    tache.cancel()  # Résultat arrivé trop tard : ignoré
+                    continue
+                n_tache, comptes_tache = tache.result()
+                n += n_tache
+                for longueur, liste in comptes_tache.items():
+                    comptes[longueur] = [a + b for a, b in zip(comptes[longueur], liste)]
+        return n, comptes
+
+    # Nombre d'échantillons couvrant chaque case, à partir des tirages de chaque placement
+    def couverture(self, comptes):
+        couverture = array("I", bytes(4 * self.taille * self.taille))
+        for longueur, liste in comptes.items():
+            placements = self.placements[longueur]
+            for indice, compte in enumerate(liste):
+                if compte:
+                    for case in placements[indice]:
+                        couverture[case] += compte
+        return couverture
+
+    # Choisit la case couverte par le plus de flottes échantillonnées
+    def choisir_tir(self):
+        bloque, touches, longueurs = self.observations()
+        if not longueurs:
+            return super().choisir_tir()
+        n, comptes = self.echantillonner(bloque, touches, longueurs)
+        couverture = self.couverture(comptes)
+
+        cle = ("monte_carlo", self.empreinte)
+        if self.table is not None:
+            precedent = self.table.chercher(cle)
+            if precedent is not None:
+                n_precedent, couverture_precedente = precedent
+                n += n_precedent
+                couverture = array("I", [a + b for a, b in zip(couverture, couverture_precedente)])
+            if n:
+                self.table.ranger(cle, (n, couverture), sys.getsizeof(couverture))
+        self.echantillons = n
+        if not n:
+            return super().choisir_tir()  # Aucune flotte compatible trouvée à temps : densité seule
+
+        # En mode chasse, la densité des placements sert d'a priori pesant POIDS_DENSITE échantillons
+        scores = [0.0] * (self.taille * self.taille)
+        tire, densite = self.tire, self.densite
+        total = sum(densite)
+        if not touches and total > 0:
+            facteur = self.poids_densite * sum(longueurs) / total
+            scores = [d * facteur for d in densite]
+        for case, compte in enumerate(couverture):
+            scores[case] += compte
+        case = max((case for case in range(len(scores)) if not tire[case]),
+                   key=lambda case: (scores[case], densite[case], -case))
+        return divmod(case, self.taille)
+
+# Échantillonnage lancé dans un autre processus, pour une durée relative à son démarrage
+# (les horloges perf_counter des processus ne sont pas comparables)
+def _echantillonner_pendant(taille, longueurs, bloque, touches, duree, graine, maximum):
+    return echantillonner(taille, longueurs, bloque, touches, time.perf_counter() + duree, graine, maximum)
+
+CASES_INDEX_MAX = 128 * 128  # Surface au-delà de laquelle les IA n'indexent plus tous les placements
+
+# Variante creuse de l'IA probabiliste pour les très grands plateaux : rien n'est alloué par case.
+# En mode chasse, elle parcourt les cases dans un ordre pseudo-aléatoire en ne visant qu'une case
+# sur p (p = longueur du plus petit navire à flot, qui ne peut pas passer entre deux tirs) ; en mode
+# cible, elle compte les placements valides qui traversent chaque touche non résolue.
+class IAProbabilisteCreuse(IAFacile):
+    def __init__(self, joueur, rng=None, flotte=FLOTTE, table=None):
+        super().__init__(joueur, rng, table)
+        self.flotte = flotte  # Liste (nom, taille) des navires adverses
+        self.taille_par_nom = {nom: taille for nom, taille in flotte}
+        self.reinitialiser()
+
+    # Oublie tout ce qui a été appris pendant la partie
+    def reinitialiser(self):
+        self.restants = {}  # Navires encore à flot par longueur
+        for _, taille in self.flotte:
+            self.restants[taille] = self.restants.get(taille, 0) + 1
+        self.tire = set()  # Cases déjà visées
+        self.bloquees = set()  # Cases sans navire possible (tirs manqués, navires coulés)
+        self.touches_non_resolues = set()  # Cases touchées n'appartenant à aucun navire coulé connu
+        self.pas = min(self.restants, default=1)  # Espacement des cases visées en mode chasse
+        self.parcours = ParcoursCases(self.taille, self.rng)
+
+    cases_coulees = IAProbabiliste.cases_coulees
+
+    # Choisit la case la plus probable autour des touches non résolues (mode cible)
+    def choisir_cible(self):
+        n = self.taille
+        scores = {}
+        for touche in self.touches_non_resolues:
+            x, y = divmod(touche, n)
+            for longueur, poids in self.restants.items():
+                if not poids:
+                    continue
+                for dx, dy in ((0, 1), (1, 0)):
+                    for decalage in range(longueur):
+                        x0, y0 = x - decalage * dx, y - decalage * dy
+                        if not (0 <= x0 and 0 <= y0 and x0 + (longueur - 1) * dx < n and y0 + (longueur - 1) * dy < n):
+                            continue
+                        cases = [(x0 + i * dx) * n + y0 + i * dy for i in range(longueur)]
+                        if any(case in self.bloquees for case in cases):
+                            continue
+                        for case in cases:
+                            if case not in self.tire:
+                                scores[case] = scores.get(case, 0) + poids
+        if not scores:
+            return None
+        return max(scores, key=lambda case: (scores[case], -case))
+
+    # Prochaine case du parcours qui respecte l'espacement (mode chasse) ; une fois le parcours
+    # terminé, les cases restantes sont toutes candidates
+    def choisir_chasse(self):
+        n = self.taille
+        while True:
+            case = self.parcours.suivante()
+            if case is None:
+                if self.pas == 1:
+                    return None
+                self.pas = 1
+                self.parcours = ParcoursCases(n, self.rng)
+                continue
+            x, y = divmod(case, n)
+            if case not in self.tire and (x + y) % self.pas == 0:
+                return case
+
+    # Choisit la prochaine case à viser
+    def choisir_tir(self):
+        case = self.choisir_cible() if self.touches_non_resolues else None
+        if case is None:
+            case = self.choisir_chasse()
+        if case is None:
+            return super().choisir_tir()
+        return divmod(case, self.taille)
+
+    # Met à jour les cases bloquées et les navires à flot avec le résultat d'un tir
+    def observer(self, coordonnees, resultat):
+        x, y = coordonnees
+        case = x * self.taille + y
+        if case in self.tire:
+            return
+        self.tire.add(case)
+        if resultat == "Manqué":
+            self.bloquees.add(case)
+            return
+        self.touches_non_resolues.add(case)
+        if not resultat.startswith("Coulé"):
+            return
+        longueur = self.taille_par_nom.get(resultat.split(": ", 1)[1])
+        if longueur is None or not self.restants.get(longueur):
+            return
+        cases = self.cases_coulees(case, longueur)
+        self.touches_non_resolues.difference_update(cases)
+        self.bloquees.update(cases)
+        self.restants[longueur] -= 1
+        pas = min((longueur for longueur, nombre in self.restants.items() if nombre), default=1)
+        if pas != self.pas and self.pas != 1:
+            # Le parcours reprend du début avec le nouvel espacement (les cases visées sont sautées)
+            self.pas = pas
+            self.parcours = ParcoursCases(self.taille, self.rng)
+
+# Stratégies disponibles par niveau de difficulté
+NIVEAUX = {
+    "Facile": IAFacile,
+    "Difficile": IADifficile,
+    "Probabiliste": IAProbabiliste,
+    "Expert": IAExpert,
+}
+
+# Ajoute (ou remplace) une stratégie sous un nom de niveau : elle devient disponible pour la
+# simulation, le tournoi et l'interface
+def enregistrer_niveau(nom, classe):
+    if not (isinstance(classe, type) and issubclass(classe, Strategie)):
+        raise TypeError(f"{classe!r} n'est pas une sous-classe de Strategie.")
+    NIVEAUX[nom] = classe
+
+# Crée l'IA d'un niveau pour un joueur, avec la flotte de son plateau ; sur les très grands
+# plateaux, les niveaux qui indexent tous les placements sont remplacés par la variante creuse.
+# a_priori : modèle de l'adversaire (voir modele_adversaire.py), utilisé par les niveaux qui savent
+# s'en servir (difficile et probabilistes) et ignoré par les autres
+def creer_ia(niveau, joueur, rng=None, table=None, a_priori=None):
+    classe = NIVEAUX[niveau]
+    if issubclass(classe, IADifficile):
+        return classe(joueur, rng, table=table, a_priori=a_priori)
+    if not issubclass(classe, IAProbabiliste):
+        return classe(joueur, rng, table=table)
+    taille = joueur.plateau.taille
+    if taille * taille > CASES_INDEX_MAX:
+        return IAProbabilisteCreuse(joueur, rng, flotte=flotte_plateau(taille), table=table)
+    return classe(joueur, rng, flotte=flotte_plateau(taille), table=table, a_priori=a_priori)
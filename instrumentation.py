@@ -0,0 +1,282 @@
+# Instrumentation optionnelle du moteur, des IA, du placement et du rendu : compteurs et
+# histogrammes de latence, export JSON ou texte Prometheus, capture cProfile d'une partie.
+# Désactivée, elle ne coûte rien : les fonctions mesurées ne sont enveloppées qu'à l'activation
+# et retrouvent leur version d'origine à la désactivation.
+import argparse
+import bisect
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import sys
+import time
+from functools import wraps
+
+# Bornes supérieures (en secondes) des intervalles des histogrammes de latence
+BORNES = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+          1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+# Niveaux acceptés par configurer_journal ("aucun" coupe tous les messages)
+NIVEAUX_JOURNAL = {"debug": logging.DEBUG, "info": logging.INFO, "warning": logging.WARNING,
+                   "error": logging.ERROR, "aucun": logging.CRITICAL + 1}
+
+# Configure le journal du jeu (messages des modules, qui remplacent les print)
+def configurer_journal(niveau="info"):
+    logging.basicConfig(format="%(message)s", level=NIVEAUX_JOURNAL[niveau], force=True)
+
+# Compteur monotone
+class Compteur:
+    def __init__(self, nom, etiquettes, aide):
+        self.nom = nom
+        self.etiquettes = etiquettes  # Tuple de (clé, valeur)
+        self.aide = aide
+        self.valeur = 0
+
+    # Incrémente le compteur
+    def ajouter(self, n=1):
+        self.valeur += n
+
+    # Valeur exportée en JSON
+    def instantane(self):
+        return self.valeur
+
+# Histogramme de durées à intervalles fixes (mémoire constante)
+class Histogramme:
+    def __init__(self, nom, etiquettes, aide, bornes=BORNES):
+        self.nom = nom
+        self.etiquettes = etiquettes
+        self.aide = aide
+        self.bornes = bornes
+        self.comptes = [0] * (len(bornes) + 1)  # Le dernier intervalle est +Inf
+        self.somme = 0.0
+        self.nombre = 0
+
+    # Enregistre une durée en secondes
+    def observer(self, duree):
+        self.comptes[bisect.bisect_left(self.bornes, duree)] += 1
+        self.somme += duree
+        self.nombre += 1
+
+    # Estimation d'un quantile : borne supérieure de l'intervalle qui le contient
+    def quantile(self, q):
+        if not self.nombre:
+            return 0.0
+        rang, cumul = q * self.nombre, 0
+        for i, compte in enumerate(self.comptes):
+            cumul += compte
+            if cumul >= rang and compte:
+                return self.bornes[i] if i < len(self.bornes) else float("inf")
+        return float("inf")
+
+    # Ajoute les observations d'un autre histogramme de mêmes bornes
+    def fusionner(self, autre):
+        self.comptes = [a + b for a, b in zip(self.comptes, autre.comptes)]
+        self.somme += autre.somme
+        self.nombre += autre.nombre
+
+    # Résumé exporté en JSON
+    def instantane(self):
+        return {
+            "nombre": self.nombre,
+            "somme": self.somme,
+            "moyenne": self.somme / self.nombre if self.nombre else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "intervalles": {str(borne): compte for borne, compte in zip(self.bornes + ("+Inf",), self.comptes)},
+        }
+
+# Ensemble des métriques, identifiées par leur nom et leurs étiquettes
+class Registre:
+    def __init__(self):
+        self.metriques = {}
+
+    # Métrique (créée au premier appel) d'une classe donnée
+    def metrique(self, classe, nom, aide, etiquettes):
+        cle = (nom, tuple(sorted(etiquettes.items())))
+        if cle not in self.metriques:
+            self.metriques[cle] = classe(nom, cle[1], aide)
+        return self.metriques[cle]
+
+    # Compteur de ce nom et de ces étiquettes
+    def compteur(self, nom, aide="", **etiquettes):
+        return self.metrique(Compteur, nom, aide, etiquettes)
+
+    # Histogramme de ce nom et de ces étiquettes
+    def histogramme(self, nom, aide="", **etiquettes):
+        return self.metrique(Histogramme, nom, aide, etiquettes)
+
+    # Remet toutes les métriques à zéro
+    def reinitialiser(self):
+        self.metriques.clear()
+
+    # Instantané des métriques sous forme de dictionnaire sérialisable en JSON
+    def instantane(self):
+        resultat = {}
+        for (nom, etiquettes), metrique in sorted(self.metriques.items()):
+            cle = nom + "".join(f"[{cle}={valeur}]" for cle, valeur in etiquettes)
+            resultat[cle] = metrique.instantane()
+        return resultat
+
+    # Instantané au format texte d'exposition de Prometheus
+    def prometheus(self):
+        lignes = []
+        deja_decrits = set()
+        for (nom, etiquettes), metrique in sorted(self.metriques.items()):
+            if nom not in deja_decrits:
+                deja_decrits.add(nom)
+                lignes.append(f"# HELP {nom} {metrique.aide}")
+                lignes.append(f"# TYPE {nom} {'counter' if isinstance(metrique, Compteur) else 'histogram'}")
+            if isinstance(metrique, Compteur):
+                lignes.append(f"{nom}{_etiquettes(etiquettes)} {metrique.valeur}")
+                continue
+            cumul = 0
+            for borne, compte in zip(metrique.bornes + ("+Inf",), metrique.comptes):
+                cumul += compte
+                lignes.append(f"{nom}_bucket{_etiquettes(etiquettes + (('le', str(borne)),))} {cumul}")
+            lignes.append(f"{nom}_sum{_etiquettes(etiquettes)} {metrique.somme}")
+            lignes.append(f"{nom}_count{_etiquettes(etiquettes)} {metrique.nombre}")
+        return "\n".join(lignes) + "\n"
+
+# Étiquettes au format Prometheus
+def _etiquettes(etiquettes):
+    if not etiquettes:
+        return ""
+    return "{" + ",".join(f'{cle}="{valeur}"' for cle, valeur in etiquettes) + "}"
+
+REGISTRE = Registre()
+_originaux = []  # (objet, attribut, valeur d'origine) des fonctions enveloppées
+
+# Indique si l'instrumentation est active
+def est_active():
+    return bool(_originaux)
+
+# Remplace objet.attribut par une enveloppe qui chronomètre chaque appel ; apres(resultat, arguments)
+# est appelé avec le résultat si fourni
+def envelopper(objet, attribut, histogramme, apres=None):
+    fonction = getattr(objet, attribut)
+
+    @wraps(fonction)
+    def enveloppe(*arguments, **options):
+        debut = time.perf_counter()
+        resultat = fonction(*arguments, **options)
+        histogramme.observer(time.perf_counter() - debut)
+        if apres is not None:
+            apres(resultat, arguments)
+        return resultat
+
+    _originaux.append((objet, attribut, fonction))
+    setattr(objet, attribut, enveloppe)
+
+# Active l'instrumentation : résolution des tirs, décisions des IA, placement des flottes et,
+# si l'interface est chargée, mises à jour du rendu
+def activer(registre=REGISTRE):
+    if est_active():
+        return
+    import ia
+    import moteur
+    import moteur_compact
+    import moteur_creux
+    import placement
+
+    # Résolution des tirs, par moteur, et nombre de tirs par résultat
+    codes = {"Manqué": "manque", "Touché": "touche"}
+    for classe in (moteur.Plateau, moteur.PlateauBitboard, moteur_compact.PlateauCompact, moteur_creux.PlateauCreux):
+        compteurs = {code: registre.compteur("bn_tirs_total", "Tirs résolus par résultat", resultat=code)
+                     for code in ("manque", "touche", "coule")}
+        envelopper(classe, "tirer",
+                   registre.histogramme("bn_tir_secondes", "Durée de résolution d'un tir", plateau=classe.__name__),
+                   lambda resultat, _, compteurs=compteurs: compteurs[codes.get(resultat, "coule")].ajouter())
+
+    # Temps de décision de chaque IA
+    for classe in set(ia.NIVEAUX.values()):
+        if "choisir_tir" in vars(classe):
+            envelopper(classe, "choisir_tir",
+                       registre.histogramme("bn_ia_decision_secondes", "Durée de choix d'un tir", ia=classe.__name__))
+
+    # Placement : durée d'une flotte et recherches relancées faute de budget
+    redemarrages = registre.compteur("bn_placement_redemarrages_total", "Recherches de placement relancées")
+    recherches = registre.compteur("bn_placement_recherches_total", "Recherches de placement lancées")
+
+    def compter_recherche(resultat, _):
+        recherches.ajouter()
+        if resultat is None:
+            redemarrages.ajouter()
+
+    envelopper(placement, "_rechercher",
+               registre.histogramme("bn_placement_recherche_secondes", "Durée d'une recherche de placement"),
+               compter_recherche)
+    for module in (placement, moteur):
+        envelopper(module, "generer_flotte",
+                   registre.histogramme("bn_placement_flotte_secondes", "Durée de placement d'une flotte"))
+
+    # Mises à jour du rendu (uniquement si l'interface Tk est déjà chargée)
+    rendu = sys.modules.get("rendu")
+    if rendu is not None:
+        for methode in ("colorier", "marquer", "reinitialiser"):
+            envelopper(rendu.GrilleCanvas, methode,
+                       registre.histogramme("bn_rendu_secondes", "Durée d'une mise à jour du rendu", operation=methode))
+
+# Désactive l'instrumentation et restaure les fonctions d'origine
+def desactiver():
+    while _originaux:
+        objet, attribut, fonction = _originaux.pop()
+        setattr(objet, attribut, fonction)
+
+# Écrit un instantané des métriques en JSON ou au format Prometheus selon l'extension (.prom)
+def exporter(chemin, registre=REGISTRE):
+    with open(chemin, "w") as fichier:
+        if chemin.endswith(".prom"):
+            fichier.write(registre.prometheus())
+        else:
+            json.dump(registre.instantane(), fichier, indent=2)
+
+# Joue une partie sous cProfile ; écrit le profil brut dans sortie (lisible avec pstats ou
+# snakeviz) si fourni et renvoie le rapport des fonctions les plus coûteuses
+def profiler_partie(niveau_a="Facile", niveau_b="Difficile", moteur="bitboard", graine=0, sortie=None, lignes=25):
+    from simulation import jouer_partie
+    profil = cProfile.Profile()
+    rng = random.Random(graine)
+    profil.enable()
+    jouer_partie(niveau_a, niveau_b, moteur, rng.randrange(2), rng)
+    profil.disable()
+    if sortie:
+        profil.dump_stats(sortie)
+    rapport = io.StringIO()
+    pstats.Stats(profil, stream=rapport).sort_stats("cumulative").print_stats(lignes)
+    return rapport.getvalue()
+
+def main(arguments=None):
+    from ia import NIVEAUX
+    from simulation import MOTEURS, simuler
+
+    parser = argparse.ArgumentParser(description="Métriques et profil d'une série de parties simulées")
+    parser.add_argument("-n", "--parties", type=int, default=1000, help="nombre de parties instrumentées")
+    parser.add_argument("-a", "--ia-a", choices=sorted(NIVEAUX), default="Facile", help="IA du joueur A")
+    parser.add_argument("-b", "--ia-b", choices=sorted(NIVEAUX), default="Difficile", help="IA du joueur B")
+    parser.add_argument("--moteur", choices=sorted(MOTEURS), default="bitboard", help="représentation du plateau")
+    parser.add_argument("--graine", type=int, default=0, help="graine maîtresse")
+    parser.add_argument("--format", choices=("json", "prometheus"), default="json", help="format de l'instantané")
+    parser.add_argument("--profiler", action="store_true", help="profile une seule partie avec cProfile")
+    parser.add_argument("--sortie", default=None, help="fichier du profil brut (avec --profiler)")
+    args = parser.parse_args(arguments)
+
+    if args.profiler:
+        print(profiler_partie(args.ia_a, args.ia_b, args.moteur, args.graine, args.sortie))
+        return
+
+    activer()
+    try:
+        simuler(args.parties, args.ia_a, args.ia_b, args.moteur, args.graine)
+    finally:
+        desactiver()
+    if args.format == "prometheus":
+        print(REGISTRE.prometheus(), end="")
+    else:
+        print(json.dumps(REGISTRE.instantane(), indent=2))
+
+# Point d'entrée pour instrumenter une série de parties
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,539 @@
+# Interface Tk de la bataille navale (chargée uniquement au lancement de l'interface)
+import tkinter as tk
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from moteur import Joueur, creer_flotte
+from ia import NIVEAUX, creer_ia
+from rendu import GrilleCanvas, CROIX, CERCLE
+from audio import ServiceAudio
+from transposition import TableTransposition
+from etat_partie import EtatPartie, Historique
+from enregistrement import MANQUE, EcrivainParties
+from analytique import Analytique
+from ouverture import placer_flotte_ordinateur
+from modele_adversaire import ModeleAdversaire
+
+journal = logging.getLogger(__name__)
+
+INTERVALLE_SONDAGE = 15  # Délai (ms) entre deux vérifications du calcul de l'ordinateur
+
+# Classe représentant l'interface utilisateur pour le jeu de bataille navale
+class InterfaceBatailleNavale:
+    def __init__(self, root, latence_ordinateur=0.0, fichier_analytique=None, fichier_adversaire=None,
+                 fichier_parties=None):
+        self.root = root
+        self.root.title("Bataille Navale")
+
+        # Le tir de l'ordinateur est calculé dans un thread de travail ; seul le thread de
+        # l'interface touche aux widgets et applique les tirs
+        self.executeur = ThreadPoolExecutor(max_workers=1)
+        self.latence_ordinateur = latence_ordinateur  # Délai ajouté au calcul de l'ordinateur (s)
+        self.numero_partie = 0  # Incrémenté à chaque nouvelle partie pour ignorer les calculs périmés
+        self.calcul_ordinateur = None  # Calcul en cours du tir de l'ordinateur
+        self.sondage = None  # Rappel programmé qui attend la fin du calcul
+        self.horloge = None  # Rappel programmé de l'horloge de la partie
+
+        # Sons des actions, chargés en arrière-plan
+        self.audio = ServiceAudio()
+
+        # Initialisation des joueurs (humain et ordinateur)
+        self.joueur = Joueur("Joueur")
+        self.ordinateur = Joueur("Ordinateur")
+
+        # Création des grilles visuelles (un Canvas par plateau)
+        self.grille_joueur = self.creer_grille("Joueur", 0, 0)
+        self.grille_ordinateur = self.creer_grille("Ordinateur", 0, 15, joueur=False)
+
+        # Interface de contrôle (nouvelle partie, niveau de difficulté, etc.)
+        self.panneau_controle = tk.Frame(self.root)
+        self.panneau_controle.grid(row=1, column=0, columnspan=30)
+
+        self.bouton_nouvelle_partie = tk.Button(self.panneau_controle, text="Nouvelle Partie", command=self.nouvelle_partie)
+        self.bouton_nouvelle_partie.pack(side=tk.LEFT, padx=10)
+
+        # Annulation et rétablissement d'un tour, sauvegarde et chargement de la partie
+        self.bouton_annuler = tk.Button(self.panneau_controle, text="Annuler", command=self.annuler_tour)
+        self.bouton_annuler.pack(side=tk.LEFT)
+        self.bouton_retablir = tk.Button(self.panneau_controle, text="Rétablir", command=self.retablir_tour)
+        self.bouton_retablir.pack(side=tk.LEFT)
+        self.bouton_sauvegarder = tk.Button(self.panneau_controle, text="Sauvegarder", command=self.sauvegarder_partie)
+        self.bouton_sauvegarder.pack(side=tk.LEFT)
+        self.bouton_charger = tk.Button(self.panneau_controle, text="Charger", command=self.charger_partie)
+        self.bouton_charger.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.indicateur_tour = tk.Label(self.panneau_controle, text="Tour du joueur")
+        self.indicateur_tour.pack(side=tk.LEFT, padx=10)
+
+        # Niveau de difficulté
+        self.niveau_difficulte = tk.StringVar(value="Facile")
+        self.radios_niveau = {}  # Un bouton par stratégie enregistrée dans ia.NIVEAUX
+        for niveau in NIVEAUX:
+            self.radios_niveau[niveau] = tk.Radiobutton(self.panneau_controle, text=niveau, variable=self.niveau_difficulte, value=niveau)
+            self.radios_niveau[niveau].pack(side=tk.LEFT)
+
+        # Orientation des navires
+        self.orientation = "horizontal"
+        self.bouton_horizontal = tk.Button(self.panneau_controle, text="Horizontal", command=self.set_orientation_horizontal)
+        self.bouton_horizontal.pack(side=tk.LEFT, padx=10)
+
+        self.bouton_vertical = tk.Button(self.panneau_controle, text="Vertical", command=self.set_orientation_vertical)
+        self.bouton_vertical.pack(side=tk.LEFT, padx=10)
+
+        # Liste des navires à placer pour le joueur
+        self.navires_a_placer = creer_flotte(self.joueur.plateau.taille)
+        self.navire_courant = None  # Navire en cours de placement
+        self.mode_placement = True  # Mode de placement des navires
+        self.tour_joueur = True  # Indique si c'est le tour du joueur
+        self.table_transposition = TableTransposition()  # Positions déjà évaluées, conservée d'une partie à l'autre
+        # Habitudes de placement du joueur, apprises des flottes révélées en fin de partie et
+        # conservées dans fichier_adversaire s'il est fourni ; elles servent d'a priori à l'ordinateur
+        self.fichier_adversaire = fichier_adversaire
+        self.modele_adversaire = self.charger_modele_adversaire()
+        self.fichier_parties = fichier_parties  # Fichier où chaque partie terminée est ajoutée (voir enregistrement.py)
+        self.fin_enregistree = False  # Fin de la partie déjà prise en compte (modèle, fichier de parties)
+        self.strategies = self.creer_strategies()  # Stratégie de l'ordinateur pour chaque niveau
+        self.historique = None  # Historique des tirs (EtatPartie), créé au premier tir de la partie
+
+        # Statistiques cumulées de toutes les parties (cartes de chaleur, durée des coups, etc.),
+        # agrégées en arrière-plan et conservées dans fichier_analytique s'il est fourni
+        self.analytique = Analytique(self.joueur.plateau.taille, fichier_analytique)
+        self.debut_coup = time.perf_counter()  # Début du coup en cours (joueur ou ordinateur)
+
+        # Compteurs pour les statistiques de tirs
+        self.tirs_reussis_joueur = tk.IntVar(value=0)
+        self.tirs_rates_joueur = tk.IntVar(value=0)
+        self.tirs_reussis_ordinateur = tk.IntVar(value=0)
+        self.tirs_rates_ordinateur = tk.IntVar(value=0)
+        self.temps_debut = time.time()  # Temps de début de la partie
+
+        # Panneau pour les informations de tirs et le temps de jeu
+        self.panneau_stats = tk.Frame(self.root)
+        self.panneau_stats.grid(row=2, column=0, columnspan=30, pady=10)
+
+        # Étiquettes pour afficher les statistiques des tirs
+        self.label_tirs_reussis_joueur = tk.Label(self.panneau_stats, text="Tirs réussis (Joueur):")
+        self.label_tirs_reussis_joueur.pack(side=tk.LEFT, padx=10)
+        self.valeur_tirs_reussis_joueur = tk.Label(self.panneau_stats, textvariable=self.tirs_reussis_joueur)
+        self.valeur_tirs_reussis_joueur.pack(side=tk.LEFT, padx=10)
+
+        self.label_tirs_rates_joueur = tk.Label(self.panneau_stats, text="Tirs ratés (Joueur):")
+        self.label_tirs_rates_joueur.pack(side=tk.LEFT, padx=10)
+        self.valeur_tirs_rates_joueur = tk.Label(self.panneau_stats, textvariable=self.tirs_rates_joueur)
+        self.valeur_tirs_rates_joueur.pack(side=tk.LEFT, padx=10)
+
+        self.label_tirs_reussis_ordinateur = tk.Label(self.panneau_stats, text="Tirs réussis (Ordinateur):")
+        self.label_tirs_reussis_ordinateur.pack(side=tk.LEFT, padx=10)
+        self.valeur_tirs_reussis_ordinateur = tk.Label(self.panneau_stats, textvariable=self.tirs_reussis_ordinateur)
+        self.valeur_tirs_reussis_ordinateur.pack(side=tk.LEFT, padx=10)
+
+        self.label_tirs_rates_ordinateur = tk.Label(self.panneau_stats, text="Tirs ratés (Ordinateur):")
+        self.label_tirs_rates_ordinateur.pack(side=tk.LEFT, padx=10)
+        self.valeur_tirs_rates_ordinateur = tk.Label(self.panneau_stats, textvariable=self.tirs_rates_ordinateur)
+        self.valeur_tirs_rates_ordinateur.pack(side=tk.LEFT, padx=10)
+
+        self.label_temps_total = tk.Label(self.panneau_stats, text="Temps de jeu: 0s")
+        self.label_temps_total.pack(side=tk.LEFT, padx=10)
+
+        # Mise à jour régulière du temps de jeu
+        self.demarrer_horloge()
+
+    # (Re)démarre l'horloge de la partie : un seul rappel est programmé à la fois
+    def demarrer_horloge(self):
+        self.arreter_horloge()
+        self.temps_debut = time.time()
+        self.mettre_a_jour_temps()
+
+    # Arrête l'horloge de la partie
+    def arreter_horloge(self):
+        if self.horloge is not None:
+            self.root.after_cancel(self.horloge)
+            self.horloge = None
+
+    # Met à jour le temps de jeu toutes les secondes
+    def mettre_a_jour_temps(self):
+        temps_ecoule = int(time.time() - self.temps_debut)
+        self.label_temps_total.config(text=f"Temps de jeu: {temps_ecoule}s")
+        self.horloge = self.root.after(1000, self.mettre_a_jour_temps)
+
+    # Création d'une grille pour l'interface
+    def creer_grille(self, titre, row, col, joueur=True):
+        cadre = tk.Frame(self.root)
+        cadre.grid(row=row, column=col, padx=10, pady=10)
+
+        label = tk.Label(cadre, text=titre)
+        label.grid(row=0, column=0)
+
+        grille = GrilleCanvas(cadre, self.joueur.plateau.taille, lambda x, y: self.case_cliquee(x, y, joueur))
+        grille.grid(row=1, column=0)
+        return grille
+
+    # Gère les actions lors du clic sur une case
+    def case_cliquee(self, x, y, joueur):
+        if joueur and self.mode_placement:
+            self.placer_navire_joueur(x, y)
+        elif not joueur and not self.mode_placement and self.tour_joueur:
+            self.jouer_tour(x, y)
+
+    # Définit l'orientation des navires sur horizontal
+    def set_orientation_horizontal(self):
+        self.orientation = "horizontal"
+        journal.debug("Orientation définie sur Horizontal")
+
+    # Définit l'orientation des navires sur vertical
+    def set_orientation_vertical(self):
+        self.orientation = "vertical"
+        journal.debug("Orientation définie sur Vertical")
+
+    # Place un navire pour le joueur
+    def placer_navire_joueur(self, x, y):
+        if not self.navire_courant:
+            if self.navires_a_placer:
+                self.navire_courant = self.navires_a_placer.pop(0)
+                journal.info("Placement de: %s", self.navire_courant.nom)
+            else:
+                journal.info("Tous les navires ont été placés!")
+                self.mode_placement = False
+                self.debut_coup = time.perf_counter()
+                self.placer_navires_ordinateur()
+                return
+
+        try:
+            if self.orientation == "horizontal":
+                positions = [(x, y + i) for i in range(self.navire_courant.taille)]
+            else:
+                positions = [(x + i, y) for i in range(self.navire_courant.taille)]
+
+            self.joueur.plateau.placer_navire(self.navire_courant, positions)
+            for px, py in positions:
+                self.grille_joueur.colorier(px, py, "black")
+            self.navire_courant = None
+        except ValueError as e:
+            journal.warning("Erreur de placement: %s", e)
+
+    # Gère le tour du joueur
+    def jouer_tour(self, x, y):
+        try:
+            resultat = self.joueur.jouer((x, y), self.ordinateur.plateau)
+            if self.historique is None:
+                self.historique = Historique(EtatPartie.depuis_joueurs([self.joueur, self.ordinateur]))
+            self.historique.jouer(0, (x, y))
+            self.analytique.tir(0, (x, y), resultat, self.joueur.tirs_reussis + self.joueur.tirs_rates,
+                                time.perf_counter() - self.debut_coup)
+            if resultat != "Manqué":
+                self.dessiner_croix(self.grille_ordinateur, x, y)
+                journal.info("%s", resultat)
+                self.audio.jouer("touche")
+                if "Coulé" in resultat:
+                    self.audio.jouer("coule")
+                    journal.info("Navire coulé : %s", resultat.split(': ')[1])
+            else:
+                self.dessiner_cercle(self.grille_ordinateur, x, y)
+                journal.info("%s", resultat)
+                self.audio.jouer("manque")
+
+            self.tirs_reussis_joueur.set(self.joueur.tirs_reussis)
+            self.tirs_rates_joueur.set(self.joueur.tirs_rates)
+
+            if self.ordinateur.a_perdu():
+                journal.info("Vous avez gagné!")
+                self.indicateur_tour.config(text="Victoire du joueur!")
+                self.arreter_horloge()
+                self.terminer_partie(0)
+                return  # Arrêter le jeu si le joueur a gagné
+
+            self.tour_joueur = False
+            self.indicateur_tour.config(text="Tour de l'ordinateur")
+            self.tir_ordinateur()
+        except ValueError as e:
+            journal.warning("Erreur: %s", e)
+
+    # Dessine une croix rouge pour indiquer un tir réussi
+    def dessiner_croix(self, grille, x, y):
+        grille.marquer(x, y, CROIX)
+
+    # Dessine un cercle bleu pour indiquer un tir manqué
+    def dessiner_cercle(self, grille, x, y):
+        grille.marquer(x, y, CERCLE)
+
+    # Crée une stratégie par niveau pour l'ordinateur ; toutes observent chaque tir, ce qui permet
+    # de changer de niveau en cours de partie
+    def creer_strategies(self):
+        return {niveau: creer_ia(niveau, self.ordinateur, table=self.table_transposition, a_priori=self.modele_adversaire)
+                for niveau in NIVEAUX}
+
+    # Modèle des habitudes du joueur lu dans fichier_adversaire, ou modèle vide
+    def charger_modele_adversaire(self):
+        taille = self.joueur.plateau.taille
+        if self.fichier_adversaire:
+            try:
+                modele = ModeleAdversaire.charger(self.fichier_adversaire)
+                if modele.taille == taille:
+                    return modele
+                journal.warning("Modèle d'adversaire ignoré : plateau de taille %d.", modele.taille)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                journal.warning("Impossible de charger le modèle d'adversaire : %s", e)
+        return ModeleAdversaire(taille)
+
+    # Fin de partie : statistiques, puis flotte du joueur (révélée) ajoutée à son modèle et partie
+    # ajoutée au fichier de parties, une seule fois par partie même si la fin est annulée puis rejouée
+    def terminer_partie(self, gagnant):
+        self.analytique.fin_partie(gagnant, [self.joueur, self.ordinateur])
+        if self.fin_enregistree:
+            return
+        self.fin_enregistree = True
+        self.modele_adversaire.observer_flotte(self.joueur.plateau.navires)
+        if self.fichier_adversaire:
+            try:
+                self.modele_adversaire.sauver(self.fichier_adversaire)
+            except OSError as e:
+                journal.warning("Impossible d'enregistrer le modèle d'adversaire : %s", e)
+        if self.fichier_parties and self.historique is not None:
+            try:
+                with open(self.fichier_parties, "ab") as fichier:
+                    EcrivainParties(fichier).ecrire(self.historique.etat.partie())
+            except OSError as e:
+                journal.warning("Impossible d'enregistrer la partie : %s", e)
+
+    # Lance le calcul du tir de l'ordinateur dans le thread de travail, sans bloquer l'interface
+    def tir_ordinateur(self):
+        niveau = self.niveau_difficulte.get()
+        self.debut_coup = time.perf_counter()
+        self.calcul_ordinateur = self.executeur.submit(self.choisir_tir_ordinateur, niveau, self.numero_partie)
+        self.attendre_tir_ordinateur(self.calcul_ordinateur, self.numero_partie)
+
+    # Attend la fin du calcul en rendant la main à la boucle d'événements, puis applique le tir ;
+    # si la stratégie ou le tir échoue, l'erreur est journalisée et le joueur reprend la main
+    def attendre_tir_ordinateur(self, calcul, numero_partie):
+        self.sondage = None
+        if numero_partie != self.numero_partie:
+            return  # Partie abandonnée entre-temps : le résultat est ignoré
+        if not calcul.done():
+            self.sondage = self.root.after(INTERVALLE_SONDAGE, self.attendre_tir_ordinateur,
+                                           calcul, numero_partie)
+            return
+        self.calcul_ordinateur = None
+        try:
+            x, y = calcul.result()
+            self.tirer_ordinateur(x, y)
+        except Exception:
+            journal.exception("Tir de l'ordinateur impossible, le joueur reprend la main.")
+            self.tour_joueur = True
+            self.indicateur_tour.config(text="Tour du joueur")
+            self.debut_coup = time.perf_counter()
+
+    # Annule le tir de l'ordinateur en attente (le calcul déjà commencé se termine dans le vide)
+    def annuler_tir_ordinateur(self):
+        if self.sondage is not None:
+            self.root.after_cancel(self.sondage)
+            self.sondage = None
+        if self.calcul_ordinateur is not None:
+            self.calcul_ordinateur.cancel()
+            self.calcul_ordinateur = None
+
+    # Choisit le tir de l'ordinateur avec la stratégie du niveau (exécuté dans le thread de travail,
+    # ne doit toucher à aucun widget)
+    def choisir_tir_ordinateur(self, niveau, numero_partie):
+        if self.latence_ordinateur:
+            time.sleep(self.latence_ordinateur)
+        if numero_partie != self.numero_partie:
+            return None  # Partie abandonnée pendant l'attente
+        return self.strategies[niveau].choisir_tir()
+
+    # Effectue un tir pour l'ordinateur et gère le résultat
+    def tirer_ordinateur(self, x, y):
+        resultat = self.ordinateur.jouer((x, y), self.joueur.plateau)
+        self.historique.jouer(1, (x, y))
+        self.analytique.tir(1, (x, y), resultat, self.ordinateur.tirs_reussis + self.ordinateur.tirs_rates,
+                            time.perf_counter() - self.debut_coup)
+        for strategie in self.strategies.values():
+            strategie.observer((x, y), resultat)  # Toutes suivent la partie, quel que soit le niveau choisi
+
+        if "Touché" in resultat:
+            self.dessiner_croix(self.grille_joueur, x, y)
+            journal.info("Résultat du tir: %s", resultat)
+            self.audio.jouer("touche")
+        elif "Manqué" in resultat:
+            self.dessiner_cercle(self.grille_joueur, x, y)
+            journal.info("Résultat du tir: %s", resultat)
+            self.audio.jouer("manque")
+        elif "Coulé" in resultat:
+            self.dessiner_croix(self.grille_joueur, x, y)
+            journal.info("Résultat du tir: %s", resultat)
+            self.audio.jouer("coule")
+
+        self.tirs_reussis_ordinateur.set(self.ordinateur.tirs_reussis)
+        self.tirs_rates_ordinateur.set(self.ordinateur.tirs_rates)
+
+        if self.joueur.a_perdu():
+            journal.info("L'ordinateur a gagné!")
+            self.indicateur_tour.config(text="Défaite!")
+            self.arreter_horloge()
+            self.terminer_partie(1)
+        else:
+            self.tour_joueur = True
+            self.indicateur_tour.config(text="Tour du joueur")
+            self.debut_coup = time.perf_counter()
+
+    # Place les navires pour l'ordinateur (selon les tables de placement, voir ouverture.py)
+    def placer_navires_ordinateur(self):
+        try:
+            placer_flotte_ordinateur(self.ordinateur.plateau)
+        except ValueError as e:
+            journal.warning("Erreur lors du placement des navires de l'ordinateur : %s", e)
+
+    # Lance une nouvelle partie en réinitialisant toutes les variables
+    def nouvelle_partie(self):
+        journal.info("Nouvelle partie lancée.")
+        # Abandon du tir de l'ordinateur éventuellement en cours de calcul
+        self.numero_partie += 1
+        self.annuler_tir_ordinateur()
+
+        # Réinitialisation des variables de jeu
+        self.mode_placement = True
+        self.navires_a_placer = creer_flotte(self.joueur.plateau.taille)
+        self.navire_courant = None
+        self.joueur = Joueur("Joueur")
+        self.ordinateur = Joueur("Ordinateur")
+        self.strategies = self.creer_strategies()
+        self.fin_enregistree = False
+        self.historique = None
+        self.tour_joueur = True
+        self.indicateur_tour.config(text="Tour du joueur")
+
+        # Réinitialisation des compteurs de tirs
+        self.tirs_reussis_joueur.set(0)
+        self.tirs_rates_joueur.set(0)
+        self.tirs_reussis_ordinateur.set(0)
+        self.tirs_rates_ordinateur.set(0)
+
+        # Réinitialisation du temps de jeu
+        self.demarrer_horloge()
+
+        # Réinitialisation des grilles visuelles (seules les cases modifiées sont redessinées)
+        self.grille_joueur.reinitialiser()
+        self.grille_ordinateur.reinitialiser()
+
+        # Réinitialisation des navires de l'ordinateur
+        self.ordinateur.plateau.navires = []
+        taille = self.ordinateur.plateau.taille
+        self.ordinateur.plateau.grille = [[None for _ in range(taille)] for _ in range(taille)]
+
+        # Réinitialisation de l'orientation par défaut à "horizontal"
+        self.orientation = "horizontal"
+        self.bouton_horizontal.config(relief=tk.SUNKEN)
+        self.bouton_vertical.config(relief=tk.RAISED)
+
+        # Replacer les navires de l'ordinateur
+        self.placer_navires_ordinateur()
+
+    # Annule le dernier tour (tir du joueur et réponse de l'ordinateur)
+    def annuler_tour(self):
+        if self.historique is None or not self.historique.annuler():
+            return
+        while self.historique.etat.tireur == 0 and self.historique.annuler():
+            pass
+        self.restaurer(self.historique.etat)
+
+    # Rétablit le dernier tour annulé
+    def retablir_tour(self):
+        if self.historique is None or not self.historique.retablir():
+            return
+        if self.historique.etat.tireur == 0 and self.historique.etat.gagnant() is None:
+            self.historique.retablir()
+        self.restaurer(self.historique.etat)
+
+    # Enregistre la partie en cours dans un fichier choisi par le joueur
+    def sauvegarder_partie(self):
+        from tkinter import filedialog
+        if self.historique is None:
+            journal.warning("Aucun tir à sauvegarder.")
+            return
+        chemin = filedialog.asksaveasfilename(defaultextension=".bnsv", filetypes=[("Parties", "*.bnsv")])
+        if chemin:
+            with open(chemin, "wb") as fichier:
+                fichier.write(self.historique.etat.sauvegarder())
+            journal.info("Partie sauvegardée dans %s", chemin)
+
+    # Reprend une partie sauvegardée
+    def charger_partie(self):
+        from tkinter import filedialog
+        chemin = filedialog.askopenfilename(filetypes=[("Parties", "*.bnsv")])
+        if not chemin:
+            return
+        try:
+            with open(chemin, "rb") as fichier:
+                etat = EtatPartie.charger(fichier.read())
+        except (OSError, ValueError, IndexError) as e:
+            journal.warning("Impossible de charger la partie : %s", e)
+            return
+        self.historique = Historique(etat)
+        self.restaurer(etat)
+        journal.info("Partie chargée depuis %s", chemin)
+
+    # Remet l'interface dans l'état donné : joueurs, stratégies de l'ordinateur, compteurs et grilles
+    def restaurer(self, etat):
+        self.numero_partie += 1  # Un tir de l'ordinateur en cours de calcul est ignoré
+        self.annuler_tir_ordinateur()
+        self.joueur, self.ordinateur = etat.reconstruire(("Joueur", "Ordinateur"))
+        self.mode_placement = False
+        self.navires_a_placer = []
+        self.navire_courant = None
+
+        self.strategies = self.creer_strategies()
+        etats = etat.etats()
+        for tir in etats:
+            if tir.tireur == 1:
+                for strategie in self.strategies.values():
+                    strategie.observer(tir.coordonnees(), tir.resultat())
+
+        self.tirs_reussis_joueur.set(self.joueur.tirs_reussis)
+        self.tirs_rates_joueur.set(self.joueur.tirs_rates)
+        self.tirs_reussis_ordinateur.set(self.ordinateur.tirs_reussis)
+        self.tirs_rates_ordinateur.set(self.ordinateur.tirs_rates)
+
+        self.grille_joueur.reinitialiser()
+        self.grille_ordinateur.reinitialiser()
+        for navire in self.joueur.plateau.navires:
+            for x, y in navire.positions:
+                self.grille_joueur.colorier(x, y, "black")
+        for tir in etats:
+            x, y = tir.coordonnees()
+            grille = self.grille_ordinateur if tir.tireur == 0 else self.grille_joueur
+            grille.marquer(x, y, CERCLE if tir.code == MANQUE else CROIX)
+
+        gagnant = etat.gagnant()
+        # Si le joueur a tiré en dernier (état rétabli ou sauvegardé pendant que l'ordinateur
+        # réfléchissait), c'est à l'ordinateur de jouer
+        tour_ordinateur = gagnant is None and etat.tireur == 0
+        self.tour_joueur = gagnant is None and not tour_ordinateur
+        self.debut_coup = time.perf_counter()
+        if gagnant is None:
+            self.indicateur_tour.config(text="Tour de l'ordinateur" if tour_ordinateur else "Tour du joueur")
+            if self.horloge is None:
+                self.demarrer_horloge()
+            if tour_ordinateur:
+                self.tir_ordinateur()
+        else:
+            self.indicateur_tour.config(text="Victoire du joueur!" if gagnant == 0 else "Défaite!")
+            self.arreter_horloge()
+
+    # Arrête l'horloge, le thread de travail et l'audio à la fermeture de la fenêtre, et écrit les
+    # dernières statistiques
+    def arreter(self):
+        self.numero_partie += 1
+        self.annuler_tir_ordinateur()
+        self.arreter_horloge()
+        self.executeur.shutdown(wait=False, cancel_futures=True)
+        self.audio.fermer()
+        self.analytique.fermer()
+
+# Crée la fenêtre et lance la boucle d'événements jusqu'à sa fermeture
+def lancer(latence_ordinateur=0.0, fichier_analytique=None, fichier_adversaire=None, fichier_parties=None):
+    root = tk.Tk()
+    app = InterfaceBatailleNavale(root, latence_ordinateur, fichier_analytique, fichier_adversaire, fichier_parties)
+    root.mainloop()
+    app.arreter()
@@ -0,0 +1,224 @@
+# Modèle d'un adversaire humain : les flottes révélées en fin de partie nourrissent des fréquences
+# d'occupation par case et d'orientation par longueur de navire, amorties exponentiellement d'une
+# partie à l'autre (les habitudes récentes comptent davantage). Le modèle tient dans un tableau de
+# taille fixe, se met à jour en O(cases) et s'enregistre dans un petit fichier relu en quelques
+# microsecondes. L'ordinateur s'en sert comme a priori : l'IA probabiliste pondère chaque placement
+# par sa vraisemblance, l'IA difficile vise d'abord les cases habituellement occupées.
+import argparse
+import os
+import random
+import struct
+import time
+from array import array
+
+from moteur import flotte_plateau
+from placement import index_placements
+
+MAGIE = b"BNAD"  # En-tête du fichier d'un modèle
+VERSION = 1
+ENTETE = struct.Struct("<4sHHH")  # Magie, version, taille du plateau, nombre de longueurs de navires
+DECLIN = 0.8  # Poids conservé par les parties précédentes à chaque nouvelle flotte observée
+LISSAGE = 5.0  # Parties fictives à l'occupation moyenne ajoutées aux fréquences observées
+ECHELLE = 16  # Poids entier d'un placement sans a priori
+SEUIL_HABITUDE = 0.5  # Fréquence d'occupation à partir de laquelle une case est dite habituelle
+
+# Fréquences amorties d'occupation des cases et d'orientation des navires d'un adversaire
+class ModeleAdversaire:
+    def __init__(self, taille=10, longueurs=None):
+        self.taille = taille
+        if longueurs is None:
+            longueurs = [longueur for _, longueur in flotte_plateau(taille)]
+        self.longueurs = sorted(set(longueurs))  # Longueurs de navires suivies
+        # Valeurs : nombre amorti de flottes observées, occupation amortie de chaque case, puis
+        # nombres amortis de navires horizontaux et verticaux de chaque longueur
+        self.valeurs = array("d", bytes(8 * (1 + taille * taille + 2 * len(self.longueurs))))
+
+    # Nombre (amorti) de flottes observées
+    @property
+    def parties(self):
+        return self.valeurs[0]
+
+    # Indice de la première valeur d'orientation d'une longueur
+    def indice_orientation(self, longueur):
+        return 1 + self.taille * self.taille + 2 * self.longueurs.index(longueur)
+
+    # Ajoute la flotte révélée en fin de partie (navires ayant des positions (x, y))
+    def observer_flotte(self, navires):
+        valeurs, n = self.valeurs, self.taille
+        for i in range(len(valeurs)):
+            valeurs[i] *= DECLIN
+        valeurs[0] += 1
+        for navire in navires:
+            positions = list(navire.positions)
+            for x, y in positions:
+                valeurs[1 + x * n + y] += 1
+            if len(positions) > 1 and len(positions) in self.longueurs:
+                vertical = positions[0][0] != positions[-1][0]
+                valeurs[self.indice_orientation(len(positions)) + vertical] += 1
+
+    # Fréquence d'occupation de chaque case, lissée vers l'occupation moyenne de l'adversaire par
+    # lissage parties fictives
+    def frequences(self, lissage=LISSAGE):
+        n2 = self.taille * self.taille
+        occupation = self.valeurs[1:1 + n2]
+        if not self.parties:
+            return [0.0] * n2
+        moyenne = sum(occupation) / (n2 * self.parties)
+        return [(compte + lissage * moyenne) / (self.parties + lissage) for compte in occupation]
+
+    # Cases occupées dans au moins SEUIL_HABITUDE des flottes (amorties), les plus fréquentes d'abord
+    def cases_habituelles(self):
+        frequences = self.frequences(0)
+        cases = [case for case, frequence in enumerate(frequences) if frequence >= SEUIL_HABITUDE]
+        return sorted(cases, key=lambda case: -frequences[case])
+
+    # Poids entier de chaque placement d'un navire (ordre de placement.IndexPlacements) : ECHELLE
+    # fois la fréquence moyenne de ses cases rapportée à la moyenne, fois la préférence d'orientation
+    # de l'adversaire pour cette longueur ; None tant qu'aucune flotte n'a été observée
+    def poids_placements(self, longueur):
+        if not self.parties:
+            return None
+        frequences = self.frequences()
+        moyenne = sum(frequences) / len(frequences) or 1.0
+        index = index_placements(self.taille, longueur)
+        horizontaux = self.taille * (self.taille - longueur + 1)
+        orientations = (1.0, 1.0)
+        if longueur > 1 and longueur in self.longueurs:
+            debut = self.indice_orientation(longueur)
+            h, v = self.valeurs[debut], self.valeurs[debut + 1]
+            orientations = (2 * (h + 1) / (h + v + 2), 2 * (v + 1) / (h + v + 2))
+        poids = []
+        for indice, cases in enumerate(index.cases):
+            relative = sum(frequences[case] for case in cases) / (len(cases) * moyenne)
+            poids.append(max(1, round(ECHELLE * relative * orientations[indice >= horizontaux])))
+        return poids
+
+    # Modèle au format binaire du fichier
+    def encoder(self):
+        return (ENTETE.pack(MAGIE, VERSION, self.taille, len(self.longueurs))
+                + struct.pack(f"<{len(self.longueurs)}H", *self.longueurs) + self.valeurs.tobytes())
+
+    # Modèle relu depuis des données produites par encoder
+    @classmethod
+    def decoder(cls, donnees):
+        if len(donnees) < ENTETE.size:
+            raise ValueError("Modèle d'adversaire tronqué.")
+        magie, version, taille, nb_longueurs = ENTETE.unpack_from(donnees)
+        if magie != MAGIE or version != VERSION:
+            raise ValueError("Ce fichier n'est pas un modèle d'adversaire de bataille navale.")
+        debut = ENTETE.size + 2 * nb_longueurs
+        if len(donnees) < debut:
+            raise ValueError("Modèle d'adversaire tronqué.")
+        longueurs = struct.unpack_from(f"<{nb_longueurs}H", donnees, ENTETE.size)
+        modele = cls(taille, longueurs)
+        if len(donnees) - debut != 8 * len(modele.valeurs):
+            raise ValueError("Modèle d'adversaire tronqué.")
+        modele.valeurs = array("d", donnees[debut:])
+        return modele
+
+    # Enregistre le modèle (le fichier est remplacé d'un coup, jamais à moitié écrit)
+    def sauver(self, chemin):
+        temporaire = chemin + ".tmp"
+        with open(temporaire, "wb") as fichier:
+            fichier.write(self.encoder())
+        os.replace(temporaire, chemin)
+
+    # Modèle lu dans un fichier
+    @classmethod
+    def charger(cls, chemin):
+        with open(chemin, "rb") as fichier:
+            return cls.decoder(fichier.read())
+
+# Flotte d'un joueur « habitué » (liste de (nom, positions)) : chaque navire de la flotte de base
+# reprend sa position avec la probabilité fidelite (si elle est encore libre), sinon un placement
+# tiré uniformément parmi les libres
+def flotte_habituelle(base, taille, rng, fidelite=0.8):
+    occupation = 0
+    flotte = []
+    for nom, positions in sorted(base, key=lambda navire: -len(navire[1])):
+        index = index_placements(taille, len(positions))
+        masque = sum(1 << (x * taille + y) for x, y in positions)
+        if rng.random() >= fidelite or masque & occupation:
+            indice = rng.choice(index.legaux(occupation))
+            positions, masque = index.positions(indice), index.masques[indice]
+        occupation |= masque
+        flotte.append((nom, positions))
+    return flotte
+
+# Tirs de l'ordinateur pour couler la flotte d'un joueur habitué, avec et sans a priori : series
+# joueurs (chacun sa flotte de base) jouent parties parties chacun ; les premières parties de
+# chaque série (echauffement) ne sont pas comptées. Renvoie {niveau: (tirs sans, tirs avec)}
+def mesurer(niveaux=("Difficile", "Probabiliste"), series=20, parties=15, echauffement=3, fidelite=0.8, graine=0):
+    from ia import creer_ia
+    from moteur import JoueurBitboard, Navire, PlateauBitboard
+    from placement import generer_flotte
+
+    resultats = {}
+    for niveau in niveaux:
+        totaux = [0, 0]
+        comptees = 0
+        for serie in range(series):
+            rng = random.Random(f"{graine}:{serie}")
+            noms = [nom for nom, _ in flotte_plateau(10)]
+            base = list(zip(noms, generer_flotte(10, [longueur for _, longueur in flotte_plateau(10)], rng)))
+            modele = ModeleAdversaire()
+            for partie in range(parties):
+                flotte = flotte_habituelle(base, 10, rng, fidelite)
+                graine_partie = rng.getrandbits(64)
+                for avec, a_priori in enumerate((None, modele)):
+                    cible = PlateauBitboard(10)
+                    for nom, positions in flotte:
+                        cible.placer_navire(Navire(nom, len(positions)), positions)
+                    attaquant = JoueurBitboard("Ordinateur", PlateauBitboard(10))
+                    ia = creer_ia(niveau, attaquant, random.Random(graine_partie), a_priori=a_priori)
+                    while not cible.tous_coules():
+                        coordonnees = ia.choisir_tir()
+                        ia.observer(coordonnees, attaquant.jouer(coordonnees, cible))
+                    if partie >= echauffement:
+                        totaux[avec] += len(attaquant.tirs_effectues)
+                modele.observer_flotte(cible.navires)
+                comptees += partie >= echauffement
+        resultats[niveau] = (totaux[0] / comptees, totaux[1] / comptees)
+    return resultats
+
+# Coût d'une mise à jour du modèle, taille et temps de relecture de son fichier
+def mesurer_modele(repetitions=2000):
+    from moteur import Navire
+    from placement import generer_flotte
+
+    rng = random.Random(0)
+    navires = []
+    for positions in generer_flotte(10, [longueur for _, longueur in flotte_plateau(10)], rng):
+        navire = Navire("Navire", len(positions))
+        navire.positions = positions
+        navires.append(navire)
+    modele = ModeleAdversaire()
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        modele.observer_flotte(navires)
+    mise_a_jour = (time.perf_counter() - debut) / repetitions
+    donnees = modele.encoder()
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        ModeleAdversaire.decoder(donnees)
+    relecture = (time.perf_counter() - debut) / repetitions
+    return mise_a_jour, len(donnees), relecture
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Effet du modèle d'adversaire contre un joueur habitué simulé")
+    parser.add_argument("--series", type=int, default=20, help="joueurs habitués simulés")
+    parser.add_argument("--parties", type=int, default=15, help="parties par joueur")
+    parser.add_argument("--echauffement", type=int, default=3, help="premières parties non comptées")
+    parser.add_argument("--fidelite", type=float, default=0.8, help="probabilité qu'un navire reprenne sa position habituelle")
+    parser.add_argument("--graine", type=int, default=0, help="graine des joueurs simulés")
+    args = parser.parse_args(arguments)
+
+    mise_a_jour, octets, relecture = mesurer_modele()
+    print(f"Mise à jour: {mise_a_jour * 1e6:.1f} µs ; fichier: {octets} octets ; relecture: {relecture * 1e6:.1f} µs")
+    for niveau, (sans, avec) in mesurer(series=args.series, parties=args.parties, echauffement=args.echauffement,
+                                        fidelite=args.fidelite, graine=args.graine).items():
+        print(f"{niveau}: {sans:.1f} tirs sans modèle, {avec:.1f} avec ({(avec - sans) / sans:+.1%})")
+
+# Point d'entrée pour mesurer le modèle d'adversaire
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# Moteur du jeu de bataille navale (sans interface graphique ni son)
+import random
+
+from placement import generer_flotte, index_placements
+
+journal = None  # Journal du moteur, créé au premier message : importer logging coûte plus cher que le moteur
+
+# Journal du moteur (logging n'est importé qu'au premier message)
+def obtenir_journal():
+    global journal
+    if journal is None:
+        import logging
+        journal = logging.getLogger(__name__)
+    return journal
+
+# Flotte standard : (nom, taille) de chaque navire
+FLOTTE = [
+    ("Porte-avions", 5),
+    ("Croiseur", 4),
+    ("Destroyer", 3),
+    ("Destroyer", 3),
+    ("Sous-marin", 2),
+    ("Sous-marin", 2)
+]
+NOMS_NAVIRES = [nom for nom, _ in FLOTTE]  # Noms des navires, dans l'ordre de la flotte
+CASES_PAR_FLOTTE = 10_000  # Sur les grandes cartes, une flotte standard par tranche de 100x100 cases
+
+# Flotte (nom, taille) d'un plateau : la flotte standard, répétée sur les grandes cartes
+def flotte_plateau(taille=10):
+    return FLOTTE * max(1, taille * taille // CASES_PAR_FLOTTE)
+
+# Crée une nouvelle liste de navires pour la flotte d'un plateau (standard par défaut)
+def creer_flotte(taille=10):
+    return [Navire(nom, taille_navire) for nom, taille_navire in flotte_plateau(taille)]
+
+# Classe représentant un navire
+class Navire:
+    def __init__(self, nom, taille):
+        self.nom = nom  # Nom du navire
+        self.taille = taille  # Taille du navire (nombre de cases occupées)
+        self.positions = []  # Positions occupées par le navire
+        self.touches = []  # Positions touchées par l'adversaire
+
+    # Vérifie si le navire est entièrement coulé
+    def est_coule(self):
+        return set(self.positions) == set(self.touches)
+
+# Classe représentant le plateau de jeu
+class Plateau:
+    def __init__(self, taille=10, rng=None):
+        self.taille = taille  # Taille du plateau (par défaut 10x10)
+        self.rng = rng if rng is not None else random  # Générateur aléatoire (random.Random ou module random)
+        self.grille = [[None for _ in range(taille)] for _ in range(taille)]  # Grille initiale vide
+        self.navires = []  # Liste des navires placés sur le plateau
+
+    # Place un navire sur le plateau à des positions spécifiques
+    def placer_navire(self, navire, positions):
+        if len(positions) != navire.taille:
+            raise ValueError("Le nombre de positions ne correspond pas à la taille du navire.")
+
+        # Vérifie si toutes les positions sont valides
+        for x, y in positions:
+            if not (0 <= x < self.taille and 0 <= y < self.taille):
+                raise ValueError("Position hors des limites de la grille.")
+            if self.grille[x][y] is not None:
+                raise ValueError("Position déjà occupée.")
+
+        # Place le navire sur les positions spécifiées
+        for x, y in positions:
+            self.grille[x][y] = navire.nom
+        navire.positions = positions
+        self.navires.append(navire)
+
+    # Vérifie si les positions données sont libres
+    def verifier_positions_libres(self, positions):
+        for x, y in positions:
+            if not (0 <= x < self.taille and 0 <= y < self.taille):
+                return False
+            if self.grille[x][y] is not None:
+                return False
+        return True
+
+    # Masque binaire (bit x * taille + y) des cases occupées par un navire
+    def masque_occupation(self):
+        masque = 0
+        for x, ligne in enumerate(self.grille):
+            for y, case in enumerate(ligne):
+                if case is not None:
+                    masque |= 1 << (x * self.taille + y)
+        return masque
+
+    # Génère un placement aléatoire pour un navire, tiré uniformément parmi les positions libres
+    def generer_placement_aleatoire(self, navire):
+        index = index_placements(self.taille, navire.taille)
+        legaux = index.legaux(self.masque_occupation())
+        if not legaux:
+            raise ValueError(f"Impossible de placer le navire {navire.nom} : aucune position libre")
+        self.placer_navire(navire, index.positions(self.rng.choice(legaux)))
+        return True
+
+    # Place aléatoirement toute une flotte ; ne lève ValueError que si aucune disposition n'existe
+    def placer_flotte_aleatoire(self, navires, sans_contact=False):
+        dispositions = generer_flotte(self.taille, [navire.taille for navire in navires], self.rng,
+                                      sans_contact, self.masque_occupation())
+        for navire, positions in zip(navires, dispositions):
+            self.placer_navire(navire, positions)
+
+    # Gère un tir sur une position donnée
+    def tirer(self, coordonnees):
+        x, y = coordonnees
+        if not (0 <= x < self.taille and 0 <= y < self.taille):
+            raise ValueError("Tir hors des limites de la grille.")
+
+        for navire in self.navires:
+            if coordonnees in navire.positions:
+                navire.touches.append(coordonnees)
+                return "Touché" if not navire.est_coule() else f"Coulé: {navire.nom}"
+        return "Manqué"
+
+    # Vérifie si tous les navires du plateau sont coulés
+    def tous_coules(self):
+        return all(navire.est_coule() for navire in self.navires)
+
+# Plateau dont l'occupation, les touches et chaque navire sont stockés sous forme de masques binaires
+# (la case (x, y) correspond au bit x * taille + y), ce qui rend un tir, la détection d'un navire
+# coulé et la fin de partie en temps constant
+class PlateauBitboard(Plateau):
+    def __init__(self, taille=10, rng=None):
+        super().__init__(taille, rng)
+        self.occupation = 0  # Masque des cases occupées par un navire
+        self.masques_navires = []  # Masque des cases de chaque navire (même ordre que self.navires)
+        self.masques_touches = []  # Masque des cases touchées de chaque navire
+        self.navire_par_case = [-1] * (taille * taille)  # Indice du navire présent sur chaque case
+        self.navires_coules = 0  # Nombre de navires entièrement coulés
+
+    # Convertit des positions en masque binaire en vérifiant les limites
+    def masque_positions(self, positions):
+        masque = 0
+        for x, y in positions:
+            if not (0 <= x < self.taille and 0 <= y < self.taille):
+                raise ValueError("Position hors des limites de la grille.")
+            masque |= 1 << (x * self.taille + y)
+        return masque
+
+    # Place un navire sur le plateau à des positions spécifiques
+    def placer_navire(self, navire, positions):
+        if len(positions) != navire.taille:
+            raise ValueError("Le nombre de positions ne correspond pas à la taille du navire.")
+
+        masque = self.masque_positions(positions)
+        if masque & self.occupation:
+            raise ValueError("Position déjà occupée.")
+
+        indice = len(self.navires)
+        for x, y in positions:
+            self.grille[x][y] = navire.nom  # Conservé pour l'interface graphique
+            self.navire_par_case[x * self.taille + y] = indice
+        self.occupation |= masque
+        self.masques_navires.append(masque)
+        self.masques_touches.append(0)
+        navire.positions = positions
+        self.navires.append(navire)
+
+    # Vérifie si les positions données sont libres
+    def verifier_positions_libres(self, positions):
+        try:
+            return not self.masque_positions(positions) & self.occupation
+        except ValueError:
+            return False
+
+    # Gère un tir sur une position donnée
+    def tirer(self, coordonnees):
+        x, y = coordonnees
+        if not (0 <= x < self.taille and 0 <= y < self.taille):
+            raise ValueError("Tir hors des limites de la grille.")
+
+        case = x * self.taille + y
+        indice = self.navire_par_case[case]
+        if indice < 0:
+            return "Manqué"
+
+        navire = self.navires[indice]
+        navire.touches.append(coordonnees)
+        bit = 1 << case
+        masque = self.masques_navires[indice]
+        touches = self.masques_touches[indice]
+        if not touches & bit:
+            touches |= bit
+            self.masques_touches[indice] = touches
+            if touches == masque:
+                self.navires_coules += 1
+        return "Touché" if touches != masque else f"Coulé: {navire.nom}"
+
+    # Vérifie si tous les navires du plateau sont coulés
+    def tous_coules(self):
+        return self.navires_coules == len(self.navires)
+
+    # Masque binaire des cases occupées par un navire
+    def masque_occupation(self):
+        return self.occupation
+
+# Classe représentant un joueur (humain ou ordinateur)
+class Joueur:
+    def __init__(self, nom, plateau=None):
+        self.nom = nom  # Nom du joueur
+        self.plateau = plateau if plateau is not None else Plateau()  # Plateau du joueur
+        self.tirs_effectues = []  # Liste des tirs déjà effectués
+        self.tirs_reussis = 0  # Nombre de tirs réussis
+        self.tirs_rates = 0  # Nombre de tirs ratés
+
+    # Effectue un tir sur le plateau adverse
+    def jouer(self, coordonnees, plateau_adverse):
+        if coordonnees in self.tirs_effectues:
+            raise ValueError("Case déjà visée.")
+        self.tirs_effectues.append(coordonnees)
+        resultat = plateau_adverse.tirer(coordonnees)
+        if "Touché" in resultat or "Coulé" in resultat:
+            self.tirs_reussis += 1
+        else:
+            self.tirs_rates += 1
+        return resultat
+
+    # Vérifie si une case a déjà été visée par le joueur
+    def deja_vise(self, coordonnees):
+        return coordonnees in self.tirs_effectues
+
+    # Vérifie si le joueur a perdu (tous ses navires sont coulés)
+    def a_perdu(self):
+        perdu = self.plateau.tous_coules()
+        if perdu:
+            obtenir_journal().info("%s a perdu: tous les navires sont coulés.", self.nom)
+        return perdu
+
+# Joueur utilisant un PlateauBitboard et un masque binaire pour les tirs déjà effectués
+class JoueurBitboard(Joueur):
+    def __init__(self, nom, plateau=None):
+        super().__init__(nom, plateau if plateau is not None else PlateauBitboard())
+        self.masque_tirs = 0  # Masque des cases déjà visées
+        self.taille_tirs = self.plateau.taille  # Les deux plateaux d'une partie ont la même taille
+
+    # Vérifie si une case a déjà été visée par le joueur
+    def deja_vise(self, coordonnees):
+        x, y = coordonnees
+        if not (0 <= x < self.taille_tirs and 0 <= y < self.taille_tirs):
+            return False
+        return bool(self.masque_tirs >> (x * self.taille_tirs + y) & 1)
+
+    # Effectue un tir sur le plateau adverse
+    def jouer(self, coordonnees, plateau_adverse):
+        if self.deja_vise(coordonnees):
+            raise ValueError("Case déjà visée.")
+        resultat = plateau_adverse.tirer(coordonnees)
+        x, y = coordonnees
+        self.masque_tirs |= 1 << (x * self.taille_tirs + y)
+        self.tirs_effectues.append(coordonnees)
+        if resultat != "Manqué":
+            self.tirs_reussis += 1
+        else:
+            self.tirs_rates += 1
+        return resultat
@@ -0,0 +1,228 @@
+# Variantes économes en mémoire de Navire, Plateau et Joueur : __slots__, cases packées
+# (x * taille + y) et grilles stockées dans des bytearray / array. Les attributs lus par
+# l'interface (grille, navires, positions, touches, tirs_effectues, tirs_reussis, tirs_rates)
+# restent disponibles sous forme de propriétés.
+# Contrairement à Plateau, PlateauCompact ne garde pas le Navire qu'on lui confie (sauf s'il est déjà
+# un NavireCompact) : il en range une copie compacte, seule mise à jour par les tirs. Les touches et
+# l'état coulé se lisent donc dans plateau.navires, jamais dans l'objet passé à placer_navire.
+import argparse
+import gc
+import random
+import tracemalloc
+from array import array
+
+from moteur import Plateau, obtenir_journal
+
+# Navire stockant ses positions packées et ses touches sous forme de masque (bit i = i-ème case)
+class NavireCompact:
+    __slots__ = ("nom", "taille", "cases", "masque_touches")
+
+    def __init__(self, nom, taille):
+        self.nom = nom  # Nom du navire
+        self.taille = taille  # Taille du navire (nombre de cases occupées)
+        self.cases = b""  # Coordonnées x, y entrelacées (bytes, ou array("H") au-delà de 256 cases de côté)
+        self.masque_touches = 0  # Cases du navire touchées par l'adversaire
+
+    # Positions occupées par le navire
+    @property
+    def positions(self):
+        return list(zip(self.cases[0::2], self.cases[1::2]))
+
+    @positions.setter
+    def positions(self, positions):
+        coordonnees = [c for position in positions for c in position]
+        self.cases = bytes(coordonnees) if all(c < 256 for c in coordonnees) else array("H", coordonnees)
+
+    # Positions touchées par l'adversaire
+    @property
+    def touches(self):
+        return [position for i, position in enumerate(self.positions) if self.masque_touches >> i & 1]
+
+    # Marque une position du navire comme touchée
+    def toucher(self, coordonnees):
+        x, y = coordonnees
+        cases = self.cases
+        for i in range(self.taille):
+            if cases[2 * i] == x and cases[2 * i + 1] == y:
+                self.masque_touches |= 1 << i
+                return
+
+    # Vérifie si le navire est entièrement coulé
+    def est_coule(self):
+        return self.masque_touches == (1 << self.taille) - 1
+
+# Plateau dont la grille est un bytearray d'indices de navires (0 = eau, i + 1 = navire i)
+class PlateauCompact:
+    __slots__ = ("taille", "rng", "cases", "navires", "navires_coules")
+
+    def __init__(self, taille=10, rng=None):
+        self.taille = taille  # Taille du plateau (par défaut 10x10)
+        self.rng = rng if rng is not None else random  # Générateur aléatoire
+        self.cases = bytearray(taille * taille)  # Indice + 1 du navire présent sur chaque case
+        self.navires = []  # Liste des navires placés sur le plateau (au plus 255)
+        self.navires_coules = 0  # Nombre de navires entièrement coulés
+
+    # Grille sous forme de listes de listes (nom du navire ou None), comme Plateau.grille
+    @property
+    def grille(self):
+        n = self.taille
+        return [[self.navires[i - 1].nom if i else None for i in self.cases[x * n:(x + 1) * n]] for x in range(n)]
+
+    # Seule une grille vide peut être affectée : elle vide le plateau (navires compris)
+    @grille.setter
+    def grille(self, grille):
+        if any(case is not None for ligne in grille for case in ligne):
+            raise ValueError("Seule une grille vide peut être affectée à un PlateauCompact.")
+        self.cases = bytearray(self.taille * self.taille)
+        self.navires = []
+        self.navires_coules = 0
+
+    # Place un navire sur le plateau à des positions spécifiques ; un navire qui n'est pas un
+    # NavireCompact est remplacé dans plateau.navires par une copie compacte (il ne reçoit que ses
+    # positions, pas les touches des tirs suivants)
+    def placer_navire(self, navire, positions):
+        if len(positions) != navire.taille:
+            raise ValueError("Le nombre de positions ne correspond pas à la taille du navire.")
+        if len(self.navires) >= 255:
+            raise ValueError("Trop de navires pour un PlateauCompact.")
+
+        n = self.taille
+        for x, y in positions:
+            if not (0 <= x < n and 0 <= y < n):
+                raise ValueError("Position hors des limites de la grille.")
+            if self.cases[x * n + y]:
+                raise ValueError("Position déjà occupée.")
+
+        compact = navire if isinstance(navire, NavireCompact) else NavireCompact(navire.nom, navire.taille)
+        compact.positions = positions
+        navire.positions = positions
+        self.navires.append(compact)
+        indice = len(self.navires)
+        for x, y in positions:
+            self.cases[x * n + y] = indice
+
+    # Vérifie si les positions données sont libres
+    def verifier_positions_libres(self, positions):
+        n = self.taille
+        for x, y in positions:
+            if not (0 <= x < n and 0 <= y < n) or self.cases[x * n + y]:
+                return False
+        return True
+
+    # Masque binaire des cases occupées par un navire
+    def masque_occupation(self):
+        masque = 0
+        for case, indice in enumerate(self.cases):
+            if indice:
+                masque |= 1 << case
+        return masque
+
+    generer_placement_aleatoire = Plateau.generer_placement_aleatoire
+    placer_flotte_aleatoire = Plateau.placer_flotte_aleatoire
+
+    # Gère un tir sur une position donnée
+    def tirer(self, coordonnees):
+        x, y = coordonnees
+        if not (0 <= x < self.taille and 0 <= y < self.taille):
+            raise ValueError("Tir hors des limites de la grille.")
+
+        indice = self.cases[x * self.taille + y]
+        if not indice:
+            return "Manqué"
+        navire = self.navires[indice - 1]
+        deja_coule = navire.est_coule()
+        navire.toucher(coordonnees)
+        if not navire.est_coule():
+            return "Touché"
+        if not deja_coule:
+            self.navires_coules += 1
+        return f"Coulé: {navire.nom}"
+
+    # Vérifie si tous les navires du plateau sont coulés
+    def tous_coules(self):
+        return self.navires_coules >= len(self.navires)
+
+# Joueur gardant ses tirs sous forme de masque binaire et de cases packées dans un array
+class JoueurCompact:
+    __slots__ = ("nom", "plateau", "masque_tirs", "ordre_tirs", "tirs_reussis", "tirs_rates")
+
+    def __init__(self, nom, plateau=None):
+        self.nom = nom  # Nom du joueur
+        self.plateau = plateau if plateau is not None else PlateauCompact()  # Plateau du joueur
+        self.masque_tirs = 0  # Cases déjà visées
+        self.ordre_tirs = array("I")  # Cases visées, dans l'ordre des tirs
+        self.tirs_reussis = 0  # Nombre de tirs réussis
+        self.tirs_rates = 0  # Nombre de tirs ratés
+
+    # Liste des tirs déjà effectués
+    @property
+    def tirs_effectues(self):
+        return [divmod(case, self.plateau.taille) for case in self.ordre_tirs]
+
+    # Vérifie si une case a déjà été visée par le joueur
+    def deja_vise(self, coordonnees):
+        x, y = coordonnees
+        n = self.plateau.taille
+        if not (0 <= x < n and 0 <= y < n):
+            return False
+        return bool(self.masque_tirs >> (x * n + y) & 1)
+
+    # Effectue un tir sur le plateau adverse
+    def jouer(self, coordonnees, plateau_adverse):
+        if self.deja_vise(coordonnees):
+            raise ValueError("Case déjà visée.")
+        resultat = plateau_adverse.tirer(coordonnees)
+        x, y = coordonnees
+        case = x * self.plateau.taille + y
+        self.masque_tirs |= 1 << case
+        self.ordre_tirs.append(case)
+        if resultat != "Manqué":
+            self.tirs_reussis += 1
+        else:
+            self.tirs_rates += 1
+        return resultat
+
+    # Vérifie si le joueur a perdu (tous ses navires sont coulés)
+    def a_perdu(self):
+        perdu = self.plateau.tous_coules()
+        if perdu:
+            obtenir_journal().info("%s a perdu: tous les navires sont coulés.", self.nom)
+        return perdu
+
+# Mémoire occupée par partie (deux joueurs, flottes placées, tirs_par_joueur tirs chacun),
+# mesurée avec tracemalloc sur nb_parties parties conservées simultanément
+def mesurer_memoire(moteur, nb_parties=2000, tirs_par_joueur=50):
+    from simulation import MOTEURS, placer_flotte
+    classe_plateau, classe_joueur = MOTEURS[moteur]
+    rng = random.Random(0)
+    cases = [(x, y) for x in range(10) for y in range(10)]
+
+    gc.collect()
+    tracemalloc.start()
+    avant = tracemalloc.get_traced_memory()[0]
+    parties = []
+    for _ in range(nb_parties):
+        joueurs = [classe_joueur("A", classe_plateau(rng=rng)), classe_joueur("B", classe_plateau(rng=rng))]
+        for joueur in joueurs:
+            placer_flotte(joueur.plateau)
+        for i, joueur in enumerate(joueurs):
+            for coordonnees in rng.sample(cases, tirs_par_joueur):
+                joueur.jouer(coordonnees, joueurs[1 - i].plateau)
+        parties.append(joueurs)
+    gc.collect()
+    apres = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (apres - avant) / nb_parties
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Mémoire occupée par partie selon le moteur")
+    parser.add_argument("-n", "--parties", type=int, default=2000, help="nombre de parties conservées")
+    parser.add_argument("--tirs", type=int, default=50, help="tirs effectués par chaque joueur")
+    args = parser.parse_args(arguments)
+
+    for moteur in ("liste", "bitboard", "compact"):
+        print(f"{moteur}: {mesurer_memoire(moteur, args.parties, args.tirs):.0f} octets par partie")
+
+# Point d'entrée pour mesurer la mémoire de chaque moteur
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# Plateau creux pour les très grandes cartes (par exemple 1000x1000 avec des centaines de navires) :
+# seules les cases occupées et les cases visées sont stockées, dans des dictionnaires et ensembles
+# indexés par cases packées (x * taille + y). Un tir se résout en temps constant et la mémoire
+# dépend du nombre de navires et de tirs, pas de la surface du plateau.
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from math import gcd
+
+from moteur import Navire, Plateau, creer_flotte, obtenir_journal
+from placement import generer_flotte
+
+ESSAIS_PLACEMENT = 1000  # Tirages d'un placement avant de parcourir tout le plateau
+ESSAIS_FLOTTE = 100  # Dispositions de flotte tentées avant d'abandonner (grands plateaux)
+CASES_RECHERCHE_MAX = 32 * 32  # Surface jusqu'à laquelle la flotte est placée par recherche exhaustive
+
+# Plateau stockant l'indice du navire de chaque case occupée dans un dictionnaire
+class PlateauCreux:
+    def __init__(self, taille=10, rng=None):
+        self.taille = taille  # Taille du plateau
+        self.rng = rng if rng is not None else random  # Générateur aléatoire
+        self.navire_par_case = {}  # Case packée -> indice du navire qui l'occupe
+        self.cases_touchees = set()  # Cases occupées déjà touchées
+        self.touches_restantes = []  # Cases encore intactes de chaque navire
+        self.navires = []  # Liste des navires placés sur le plateau
+        self.navires_coules = 0  # Nombre de navires entièrement coulés
+
+    # Grille sous forme de listes de listes (nom du navire ou None), comme Plateau.grille ;
+    # construite à la demande, à réserver aux petits plateaux (interface graphique)
+    @property
+    def grille(self):
+        n = self.taille
+        grille = [[None] * n for _ in range(n)]
+        for case, indice in self.navire_par_case.items():
+            x, y = divmod(case, n)
+            grille[x][y] = self.navires[indice].nom
+        return grille
+
+    # Seule une grille vide peut être affectée : elle vide le plateau (navires compris)
+    @grille.setter
+    def grille(self, grille):
+        if any(case is not None for ligne in grille for case in ligne):
+            raise ValueError("Seule une grille vide peut être affectée à un PlateauCreux.")
+        self.navire_par_case.clear()
+        self.cases_touchees.clear()
+        self.touches_restantes = []
+        self.navires = []
+        self.navires_coules = 0
+
+    # Cases packées de positions, en vérifiant les limites
+    def cases_positions(self, positions):
+        n = self.taille
+        cases = []
+        for x, y in positions:
+            if not (0 <= x < n and 0 <= y < n):
+                raise ValueError("Position hors des limites de la grille.")
+            cases.append(x * n + y)
+        return cases
+
+    # Place un navire sur le plateau à des positions spécifiques
+    def placer_navire(self, navire, positions):
+        if len(positions) != navire.taille:
+            raise ValueError("Le nombre de positions ne correspond pas à la taille du navire.")
+        cases = self.cases_positions(positions)
+        if any(case in self.navire_par_case for case in cases):
+            raise ValueError("Position déjà occupée.")
+
+        indice = len(self.navires)
+        for case in cases:
+            self.navire_par_case[case] = indice
+        navire.positions = positions
+        self.navires.append(navire)
+        self.touches_restantes.append(navire.taille)
+
+    # Vérifie si les positions données sont libres
+    def verifier_positions_libres(self, positions):
+        try:
+            cases = self.cases_positions(positions)
+        except ValueError:
+            return False
+        return not any(case in self.navire_par_case for case in cases)
+
+    # Masque binaire des cases occupées par un navire
+    def masque_occupation(self):
+        masque = 0
+        for case in self.navire_par_case:
+            masque |= 1 << case
+        return masque
+
+    # Nombre de placements (horizontaux puis verticaux) d'un navire de longueur donnée
+    def nombre_placements(self, longueur):
+        horizontaux = self.taille * (self.taille - longueur + 1)
+        return horizontaux * 2 if longueur > 1 else horizontaux
+
+    # Positions du placement d'indice donné (même ordre que placement.IndexPlacements)
+    def positions_placement(self, longueur, indice):
+        largeur = self.taille - longueur + 1
+        horizontaux = self.taille * largeur
+        if indice < horizontaux:
+            x, y = divmod(indice, largeur)
+            return [(x, y + i) for i in range(longueur)]
+        x, y = divmod(indice - horizontaux, self.taille)
+        return [(x + i, y) for i in range(longueur)]
+
+    # Vérifie qu'un placement ne touche aucune case de occupees ni (avec sans_contact) leurs voisines
+    def placement_libre(self, positions, occupees, sans_contact=False):
+        n = self.taille
+        voisins = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 0), (0, 1), (1, -1), (1, 0), (1, 1)) \
+            if sans_contact else ((0, 0),)
+        for x, y in positions:
+            for dx, dy in voisins:
+                if 0 <= x + dx < n and 0 <= y + dy < n:
+                    case = (x + dx) * n + y + dy
+                    if case in occupees or case in self.navire_par_case:
+                        return False
+        return True
+
+    # Placement libre tiré uniformément : par rejet, puis en parcourant tous les placements
+    # (échantillonnage par réservoir, en mémoire constante) si le plateau est trop chargé
+    def tirer_placement(self, longueur, occupees=(), sans_contact=False):
+        nombre = self.nombre_placements(longueur)
+        if nombre <= 0:
+            return None
+        for _ in range(ESSAIS_PLACEMENT):
+            positions = self.positions_placement(longueur, self.rng.randrange(nombre))
+            if self.placement_libre(positions, occupees, sans_contact):
+                return positions
+        choisi, vus = None, 0
+        for indice in range(nombre):
+            positions = self.positions_placement(longueur, indice)
+            if self.placement_libre(positions, occupees, sans_contact):
+                vus += 1
+                if self.rng.randrange(vus) == 0:
+                    choisi = positions
+        return choisi
+
+    # Génère un placement aléatoire pour un navire, tiré uniformément parmi les positions libres
+    def generer_placement_aleatoire(self, navire):
+        positions = self.tirer_placement(navire.taille)
+        if positions is None:
+            raise ValueError(f"Impossible de placer le navire {navire.nom} : aucune position libre")
+        self.placer_navire(navire, positions)
+        return True
+
+    # Place aléatoirement toute une flotte. Jusqu'à CASES_RECHERCHE_MAX cases, comme les autres moteurs,
+    # avec placement.generer_flotte : ValueError seulement si aucune disposition n'existe. Au-delà (les
+    # index de placements ne tiendraient pas en mémoire), les plus grands navires sont tirés d'abord et
+    # une disposition qui bloque un navire est retirée, jusqu'à ESSAIS_FLOTTE fois avant ValueError
+    def placer_flotte_aleatoire(self, navires, sans_contact=False):
+        if self.taille * self.taille <= CASES_RECHERCHE_MAX:
+            dispositions = generer_flotte(self.taille, [navire.taille for navire in navires], self.rng,
+                                          sans_contact, self.masque_occupation())
+            for navire, positions in zip(navires, dispositions):
+                self.placer_navire(navire, positions)
+            return
+        ordre = sorted(navires, key=lambda navire: -navire.taille)
+        for _ in range(ESSAIS_FLOTTE):
+            occupees = set()
+            dispositions = {}  # id(navire) -> positions
+            for navire in ordre:
+                positions = self.tirer_placement(navire.taille, occupees, sans_contact)
+                if positions is None:
+                    break
+                occupees.update(self.cases_positions(positions))
+                dispositions[id(navire)] = positions
+            else:
+                for navire in navires:
+                    self.placer_navire(navire, dispositions[id(navire)])
+                return
+        raise ValueError(f"Aucune disposition trouvée en {ESSAIS_FLOTTE} essais (ESSAIS_FLOTTE) sur un plateau "
+                         f"de plus de {CASES_RECHERCHE_MAX} cases, où la recherche n'est pas exhaustive.")
+
+    # Gère un tir sur une position donnée
+    def tirer(self, coordonnees):
+        x, y = coordonnees
+        if not (0 <= x < self.taille and 0 <= y < self.taille):
+            raise ValueError("Tir hors des limites de la grille.")
+
+        case = x * self.taille + y
+        indice = self.navire_par_case.get(case)
+        if indice is None:
+            return "Manqué"
+        navire = self.navires[indice]
+        if case not in self.cases_touchees:
+            self.cases_touchees.add(case)
+            navire.touches.append(coordonnees)
+            self.touches_restantes[indice] -= 1
+            if not self.touches_restantes[indice]:
+                self.navires_coules += 1
+        return "Touché" if self.touches_restantes[indice] else f"Coulé: {navire.nom}"
+
+    # Vérifie si tous les navires du plateau sont coulés
+    def tous_coules(self):
+        return self.navires_coules == len(self.navires)
+
+# Joueur gardant ses tirs dans un ensemble de cases packées (recherche en temps constant)
+class JoueurCreux:
+    def __init__(self, nom, plateau=None):
+        self.nom = nom  # Nom du joueur
+        self.plateau = plateau if plateau is not None else PlateauCreux()  # Plateau du joueur
+        self.cases_visees = set()  # Cases packées déjà visées
+        self.tirs_effectues = []  # Liste des tirs déjà effectués, dans l'ordre
+        self.tirs_reussis = 0  # Nombre de tirs réussis
+        self.tirs_rates = 0  # Nombre de tirs ratés
+
+    # Vérifie si une case a déjà été visée par le joueur
+    def deja_vise(self, coordonnees):
+        x, y = coordonnees
+        n = self.plateau.taille
+        if not (0 <= x < n and 0 <= y < n):
+            return False
+        return x * n + y in self.cases_visees
+
+    # Effectue un tir sur le plateau adverse
+    def jouer(self, coordonnees, plateau_adverse):
+        if self.deja_vise(coordonnees):
+            raise ValueError("Case déjà visée.")
+        resultat = plateau_adverse.tirer(coordonnees)
+        x, y = coordonnees
+        self.cases_visees.add(x * self.plateau.taille + y)
+        self.tirs_effectues.append(coordonnees)
+        if resultat != "Manqué":
+            self.tirs_reussis += 1
+        else:
+            self.tirs_rates += 1
+        return resultat
+
+    # Vérifie si le joueur a perdu (tous ses navires sont coulés)
+    def a_perdu(self):
+        perdu = self.plateau.tous_coules()
+        if perdu:
+            obtenir_journal().info("%s a perdu: tous les navires sont coulés.", self.nom)
+        return perdu
+
+# Parcours pseudo-aléatoire de toutes les cases d'un plateau en mémoire constante : la i-ème case
+# visitée est (a * i + b) mod n², avec a premier avec n², ce qui forme une permutation
+class ParcoursCases:
+    def __init__(self, taille, rng):
+        self.nombre = taille * taille
+        self.a = 1
+        if self.nombre > 1:
+            self.a = rng.randrange(1, self.nombre)
+            while gcd(self.a, self.nombre) != 1:
+                self.a = rng.randrange(1, self.nombre)
+        self.b = rng.randrange(self.nombre)
+        self.i = 0  # Nombre de cases déjà parcourues
+
+    # Case suivante, ou None quand toutes les cases ont été parcourues
+    def suivante(self):
+        if self.i >= self.nombre:
+            return None
+        case = (self.a * self.i + self.b) % self.nombre
+        self.i += 1
+        return case
+
+# Mémoire (octets) d'un plateau de la classe donnée portant la flotte proportionnée à sa surface,
+# après tirs tirs aléatoires, et temps moyen d'un tir ; la flotte est tirée sur un plateau creux
+# (temps renvoyé) pour que les deux représentations reçoivent la même disposition
+def mesurer_plateau(classe_plateau, taille, tirs, graine=0):
+    rng = random.Random(graine)
+    chrono = time.perf_counter()
+    modele = PlateauCreux(taille, rng)
+    modele.placer_flotte_aleatoire(creer_flotte(taille))
+    duree_placement = time.perf_counter() - chrono
+    cases = [(rng.randrange(taille), rng.randrange(taille)) for _ in range(tirs)]
+
+    gc.collect()
+    tracemalloc.start()
+    plateau = classe_plateau(taille, rng)
+    for navire in modele.navires:
+        plateau.placer_navire(Navire(navire.nom, navire.taille), navire.positions)
+    chrono = time.perf_counter()
+    for coordonnees in cases:
+        plateau.tirer(coordonnees)
+    duree_tirs = time.perf_counter() - chrono
+    memoire = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memoire, duree_placement, duree_tirs / max(tirs, 1), len(plateau.navires)
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Mémoire et temps d'un grand plateau, creux ou dense")
+    parser.add_argument("--taille", type=int, default=1000, help="côté du plateau")
+    parser.add_argument("--tirs", type=int, default=100_000, help="tirs effectués sur le plateau")
+    parser.add_argument("--dense", action="store_true", help="mesure aussi le plateau dense (moteur.Plateau)")
+    args = parser.parse_args(arguments)
+
+    classes = [PlateauCreux] + ([Plateau] if args.dense else [])
+    for classe in classes:
+        memoire, placement, tir, navires = mesurer_plateau(classe, args.taille, args.tirs)
+        print(f"{classe.__name__}: {navires} navires, {memoire / 1e6:.1f} Mo, {tir * 1e6:.2f} µs par tir")
+    print(f"Placement creux de la flotte: {placement:.2f}s")
+
+# Point d'entrée pour mesurer un grand plateau
+if __name__ == "__main__":
+    main()
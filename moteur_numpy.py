@@ -0,0 +1,318 @@
+# Moteur vectorisé (NumPy) : simule des milliers de plateaux en parallèle, pas à pas
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from moteur import FLOTTE, Navire, PlateauBitboard, JoueurBitboard
+from ouverture import symetrie, table_ouverture
+from placement import index_placements
+from simulation import Statistiques, afficher
+import simulation
+
+# Codes de résultat d'un tir (INACTIF pour les plateaux dont la flotte est déjà coulée)
+INACTIF = -1
+MANQUE = 0
+TOUCHE = 1
+COULE = 2
+
+SANS_CIBLE = np.iinfo(np.int32).max  # Rang d'ajout d'une case qui n'est pas une cible
+SEUIL_KS = 1.95  # Coefficient du test de Kolmogorov-Smirnov à deux échantillons (risque 0,1 %)
+
+# Matrice booléenne (placements, taille * taille) de tous les placements d'un navire
+@lru_cache(maxsize=None)
+def matrice_placements(taille, longueur):
+    index = index_placements(taille, longueur)
+    matrice = np.zeros((len(index), taille * taille), dtype=bool)
+    for indice, cases in enumerate(index.cases):
+        matrice[indice, cases] = True
+    matrice.flags.writeable = False  # Partagée entre tous les lots
+    return matrice
+
+# Lot de plateaux de même taille et même flotte, chacun visé par son propre tireur
+class LotPlateaux:
+    def __init__(self, nb_plateaux, taille=10, flotte=FLOTTE, rng=None):
+        self.nb_plateaux = nb_plateaux
+        self.taille = taille
+        self.flotte = flotte
+        self.rng = rng if rng is not None else np.random.default_rng()
+        cases = taille * taille
+        self.navires = np.zeros((nb_plateaux, cases), dtype=np.int16)  # 0 = eau, i + 1 = navire i
+        self.tirs = np.zeros((nb_plateaux, cases), dtype=bool)  # Cases déjà visées
+        self.touches = np.zeros((nb_plateaux, cases), dtype=bool)  # Cases touchées
+        self.cases_restantes = np.zeros((nb_plateaux, len(flotte)), dtype=np.int16)  # Cases intactes par navire
+        self.navires_coules = np.zeros(nb_plateaux, dtype=np.int16)
+        self.nb_tirs = np.zeros(nb_plateaux, dtype=np.int32)
+        self.termine = np.zeros(nb_plateaux, dtype=bool)
+
+    # Vue (plateaux, taille, taille) des identifiants de navires
+    def grilles(self):
+        return self.navires.reshape(self.nb_plateaux, self.taille, self.taille)
+
+    # Place toute la flotte aléatoirement sur chaque plateau : pour chaque navire, un placement
+    # est tiré uniformément parmi ceux qui sont libres, pour tous les plateaux à la fois
+    def placer_flottes_aleatoires(self):
+        occupation = np.zeros(self.navires.shape, dtype=np.float32)
+        lignes = np.arange(self.nb_plateaux)
+        for indice, (nom, longueur) in enumerate(self.flotte):
+            placements = matrice_placements(self.taille, longueur)
+            conflits = occupation @ placements.T.astype(np.float32) > 0
+            scores = self.rng.random(conflits.shape)
+            scores[conflits] = -1.0
+            choix = scores.argmax(axis=1)
+            if (scores[lignes, choix] < 0).any():
+                raise ValueError(f"Impossible de placer le navire {nom} sur au moins un plateau")
+            masque = placements[choix]
+            self.navires[masque] = indice + 1
+            occupation[masque] = 1.0
+            self.cases_restantes[:, indice] = longueur
+
+    # Tire sur une case (indice x * taille + y) de chaque plateau et renvoie les codes de résultat
+    def tirer(self, cases):
+        resultats = np.full(self.nb_plateaux, INACTIF, dtype=np.int8)
+        actifs = np.flatnonzero(~self.termine)
+        cases = np.asarray(cases)[actifs]
+        if self.tirs[actifs, cases].any():
+            raise ValueError("Case déjà visée.")
+
+        self.tirs[actifs, cases] = True
+        self.nb_tirs[actifs] += 1
+        identifiants = self.navires[actifs, cases]
+        resultats[actifs] = MANQUE
+
+        touche = identifiants > 0
+        plateaux = actifs[touche]
+        navires = identifiants[touche] - 1
+        self.touches[plateaux, cases[touche]] = True
+        self.cases_restantes[plateaux, navires] -= 1
+        coule = self.cases_restantes[plateaux, navires] == 0
+        resultats[plateaux] = np.where(coule, COULE, TOUCHE)
+        self.navires_coules[plateaux[coule]] += 1
+        self.termine |= self.navires_coules == len(self.flotte)
+        return resultats
+
+# Tir aléatoire (mode facile) pour tous les plateaux du lot. Chaque plateau reçoit une fois pour
+# toutes un ordre aléatoire des cases : la première case libre dans cet ordre est uniforme parmi
+# les cases libres, sans tirer de nouveaux nombres aléatoires à chaque pas
+class StrategieFacileLot:
+    def __init__(self, lot, rng=None):
+        self.lot = lot
+        self.rng = rng if rng is not None else np.random.default_rng()
+        cases = np.broadcast_to(np.arange(lot.taille * lot.taille, dtype=np.int32), lot.tirs.shape)
+        self.ordre = self.rng.permuted(cases, axis=1)  # Ordre de tir aléatoire de chaque plateau
+        self.position = np.zeros(lot.nb_plateaux, dtype=np.intp)  # Avancement dans cet ordre
+
+    # Première case libre dans l'ordre aléatoire des plateaux donnés (encore en jeu)
+    def prochaines_libres(self, plateaux):
+        while True:
+            cases = self.ordre[plateaux, self.position[plateaux]]
+            deja = self.lot.tirs[plateaux, cases]
+            if not deja.any():
+                return cases
+            self.position[plateaux[deja]] += 1
+
+    # Choisit la prochaine case à viser sur chaque plateau
+    def choisir_tirs(self):
+        cases = np.zeros(self.lot.nb_plateaux, dtype=np.int32)
+        actifs = np.flatnonzero(~self.lot.termine)
+        cases[actifs] = self.prochaines_libres(actifs)
+        return cases
+
+    # Prend connaissance des résultats des tirs
+    def observer(self, cases, resultats):
+        pass
+
+# Tir stratégique (mode difficile), même règle que ia.IADifficile : vise les voisins des cases
+# touchées sans couler, dans l'ordre où ils ont été ajoutés (file), puis suit le livre d'ouverture
+# transformé par une symétrie tirée pour chaque plateau, puis tire au hasard
+class StrategieDifficileLot(StrategieFacileLot):
+    def __init__(self, lot, rng=None, ouverture=True):
+        super().__init__(lot, rng)
+        taille = lot.taille
+        self.rangs_cibles = np.full(lot.tirs.shape, SANS_CIBLE, dtype=np.int32)  # Rang d'ajout de chaque cible
+        self.ajouts = np.zeros(lot.nb_plateaux, dtype=np.int32)  # Tirs touchés ayant ajouté des cibles
+        table = table_ouverture(taille) if ouverture else None
+        livre = list(table.ouverture) if table is not None else []
+        self.livre = np.zeros((lot.nb_plateaux, 0), dtype=np.int32)  # Livre transformé de chaque plateau
+        if livre:
+            transformes = np.array([[x * taille + y for x, y in (symetrie(*divmod(case, taille), taille, numero)
+                                                                 for case in livre)]
+                                    for numero in range(8)], dtype=np.int32)
+            self.livre = transformes[self.rng.integers(8, size=lot.nb_plateaux)]
+        self.rang_livre = np.zeros(lot.nb_plateaux, dtype=np.intp)  # Prochain tir du livre
+
+    # Avance dans le livre des plateaux donnés jusqu'à une case libre ; renvoie le masque des
+    # plateaux dont le livre n'est pas épuisé
+    def avancer_livre(self, plateaux):
+        longueur = self.livre.shape[1]
+        while True:
+            dans_livre = self.rang_livre[plateaux] < longueur
+            suivis = plateaux[dans_livre]
+            deja = self.lot.tirs[suivis, self.livre[suivis, self.rang_livre[suivis]]]
+            if not deja.any():
+                return dans_livre
+            self.rang_livre[suivis[deja]] += 1
+
+    # Choisit la prochaine case à viser sur chaque plateau
+    def choisir_tirs(self):
+        lot = self.lot
+        cases = np.zeros(lot.nb_plateaux, dtype=np.int32)
+        actifs = np.flatnonzero(~lot.termine)
+        rangs = np.where(lot.tirs[actifs], SANS_CIBLE, self.rangs_cibles[actifs])
+        cible = rangs.min(axis=1) < SANS_CIBLE
+        cases[actifs[cible]] = rangs[cible].argmin(axis=1)
+
+        reste = actifs[~cible]
+        dans_livre = self.avancer_livre(reste)
+        suivis = reste[dans_livre]
+        cases[suivis] = self.livre[suivis, self.rang_livre[suivis]]
+        self.rang_livre[suivis] += 1
+        hasard = reste[~dans_livre]
+        cases[hasard] = self.prochaines_libres(hasard)
+        return cases
+
+    # Ajoute les voisins des cases touchées sans couler de navire à la file des cibles (un voisin
+    # déjà dans la file garde son rang, comme dans la liste de l'IA scalaire)
+    def observer(self, cases, resultats):
+        taille = self.lot.taille
+        plateaux = np.flatnonzero(resultats == TOUCHE)
+        x, y = np.divmod(cases[plateaux], taille)
+        for direction, (dx, dy) in enumerate(((-1, 0), (1, 0), (0, -1), (0, 1))):
+            vx, vy = x + dx, y + dy
+            dedans = (vx >= 0) & (vx < taille) & (vy >= 0) & (vy < taille)
+            cibles, voisins = plateaux[dedans], vx[dedans] * taille + vy[dedans]
+            rang = self.ajouts[cibles] * 4 + direction
+            self.rangs_cibles[cibles, voisins] = np.minimum(self.rangs_cibles[cibles, voisins], rang)
+        self.ajouts[plateaux] += 1
+
+# Stratégies vectorisées par niveau de difficulté
+STRATEGIES = {
+    "Facile": StrategieFacileLot,
+    "Difficile": StrategieDifficileLot,
+}
+
+# Attaque tous les plateaux d'un lot jusqu'à ce que chaque flotte soit coulée ;
+# renvoie le nombre de tirs par plateau et, sur demande, l'historique (cases, résultats) de chaque pas
+def couler_lot(lot, niveau, rng=None, historique=False):
+    strategie = STRATEGIES[niveau](lot, rng)
+    pas = []
+    while not lot.termine.all():
+        cases = strategie.choisir_tirs()
+        resultats = lot.tirer(cases)
+        strategie.observer(cases, resultats)
+        if historique:
+            pas.append((cases, resultats))
+    return lot.nb_tirs.copy(), pas
+
+# Simule n parties niveau_a contre niveau_b : chaque joueur coule la flotte adverse de son côté,
+# le gagnant est celui qui y parvient en moins de tirs (à égalité, celui qui a commencé)
+def simuler(n, niveau_a="Facile", niveau_b="Difficile", taille=10, flotte=FLOTTE, graine=None):
+    rng = np.random.default_rng(graine)
+    chrono = time.perf_counter()
+    flotte_b = LotPlateaux(n, taille, flotte, rng)  # Visée par le joueur A
+    flotte_a = LotPlateaux(n, taille, flotte, rng)  # Visée par le joueur B
+    flotte_b.placer_flottes_aleatoires()
+    flotte_a.placer_flottes_aleatoires()
+    tirs_a, _ = couler_lot(flotte_b, niveau_a, rng)
+    tirs_b, _ = couler_lot(flotte_a, niveau_b, rng)
+
+    premier = np.arange(n) % 2
+    victoire_a = np.where(premier == 0, tirs_a <= tirs_b, tirs_a < tirs_b)
+    stats = Statistiques()
+    for gagne, a, b in zip(victoire_a.tolist(), tirs_a.tolist(), tirs_b.tolist()):
+        stats.ajouter(0 if gagne else 1, a if gagne else b)
+    stats.duree = time.perf_counter() - chrono
+    return stats
+
+# Rejoue les plateaux d'un lot avec le moteur scalaire (mêmes flottes, mêmes tirs) et renvoie
+# la liste des écarts (plateau, numéro du tir, résultat vectorisé, résultat scalaire)
+def verifier_contre_moteur_scalaire(nb_plateaux=200, niveau="Difficile", taille=10, flotte=FLOTTE, graine=0):
+    rng = np.random.default_rng(graine)
+    lot = LotPlateaux(nb_plateaux, taille, flotte, rng)
+    lot.placer_flottes_aleatoires()
+    nb_tirs, pas = couler_lot(lot, niveau, rng, historique=True)
+    codes = {"Manqué": MANQUE, "Touché": TOUCHE}
+
+    ecarts = []
+    for indice in range(nb_plateaux):
+        plateau = PlateauBitboard(taille)
+        for numero, (nom, longueur) in enumerate(flotte):
+            cases = np.flatnonzero(lot.navires[indice] == numero + 1).tolist()
+            plateau.placer_navire(Navire(nom, longueur), [divmod(case, taille) for case in cases])
+        tireur = JoueurBitboard("Vérification", PlateauBitboard(taille))
+
+        for numero, (cases, resultats) in enumerate(pas):
+            attendu = int(resultats[indice])
+            if attendu == INACTIF:
+                break
+            resultat = tireur.jouer(divmod(int(cases[indice]), taille), plateau)
+            obtenu = codes.get(resultat, COULE)
+            if obtenu != attendu:
+                ecarts.append((indice, numero + 1, attendu, obtenu))
+        if not plateau.tous_coules() or len(tireur.tirs_effectues) != nb_tirs[indice]:
+            ecarts.append((indice, len(tireur.tirs_effectues), int(nb_tirs[indice]), "fin de partie"))
+    return ecarts
+
+# Distance de Kolmogorov-Smirnov entre deux distributions données sous forme de Counter
+def distance_ks(a, b):
+    total_a, total_b = sum(a.values()), sum(b.values())
+    cumul_a = cumul_b = distance = 0.0
+    for valeur in sorted(set(a) | set(b)):
+        cumul_a += a.get(valeur, 0) / total_a
+        cumul_b += b.get(valeur, 0) / total_b
+        distance = max(distance, abs(cumul_a - cumul_b))
+    return distance
+
+# Compare les résultats de n parties vectorisées à ceux de n parties du simulateur scalaire
+# (simulation.simuler) : les taux de victoire doivent différer de moins de quatre écarts-types et
+# les distributions des tirs pour gagner passer le test de Kolmogorov-Smirnov.
+# Renvoie (statistiques vectorisées, statistiques scalaires, liste des écarts constatés)
+def comparer_au_simulateur(n=2000, niveau_a="Facile", niveau_b="Difficile", taille=10, graine=0):
+    vectorise = simuler(n, niveau_a, niveau_b, taille, graine=graine)
+    scalaire = simulation.simuler(n, niveau_a, niveau_b, graine=graine, taille=taille)
+    ecarts = []
+    taux = (vectorise.taux_victoire()[0] + scalaire.taux_victoire()[0]) / 2
+    ecart_type = (2 * taux * (1 - taux) / n) ** 0.5
+    difference = abs(vectorise.taux_victoire()[0] - scalaire.taux_victoire()[0])
+    if difference > 4 * ecart_type + 1 / n:
+        ecarts.append(f"taux de victoire de A: {vectorise.taux_victoire()[0]:.1%} au lieu de {scalaire.taux_victoire()[0]:.1%}")
+    distance = distance_ks(vectorise.tirs_pour_gagner, scalaire.tirs_pour_gagner)
+    if distance > SEUIL_KS * (2 / n) ** 0.5:
+        ecarts.append(f"tirs pour gagner: moyenne {vectorise.tirs_moyens():.1f} au lieu de {scalaire.tirs_moyens():.1f} "
+                      f"(distance de Kolmogorov-Smirnov {distance:.3f})")
+    return vectorise, scalaire, ecarts
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Simulation vectorisée de parties ordinateur contre ordinateur")
+    parser.add_argument("-n", "--parties", type=int, default=10000, help="nombre de parties à simuler")
+    parser.add_argument("-a", "--ia-a", choices=sorted(STRATEGIES), default="Facile", help="niveau du joueur A")
+    parser.add_argument("-b", "--ia-b", choices=sorted(STRATEGIES), default="Difficile", help="niveau du joueur B")
+    parser.add_argument("--taille", type=int, default=10, help="taille des plateaux")
+    parser.add_argument("--graine", type=int, default=None, help="graine (résultats reproductibles)")
+    parser.add_argument("--verifier", action="store_true",
+                        help="rejoue les tirs avec le moteur scalaire et compare les résultats au simulateur scalaire")
+    args = parser.parse_args(arguments)
+
+    if args.verifier:
+        for niveau in sorted(STRATEGIES):
+            ecarts = verifier_contre_moteur_scalaire(niveau=niveau, taille=args.taille, graine=args.graine or 0)
+            print(f"{niveau}: {'identique au moteur scalaire' if not ecarts else f'{len(ecarts)} écarts'}")
+            for ecart in ecarts[:10]:
+                print(f"  plateau {ecart[0]}, tir {ecart[1]}: {ecart[2]} au lieu de {ecart[3]}")
+        for niveau_a, niveau_b in ((args.ia_a, args.ia_b), (args.ia_b, args.ia_a)):
+            vectorise, scalaire, ecarts = comparer_au_simulateur(min(args.parties, 2000), niveau_a, niveau_b,
+                                                                 args.taille, args.graine or 0)
+            print(f"{niveau_a} contre {niveau_b}: {'même distribution que simulation.py' if not ecarts else 'écart'} "
+                  f"(A gagne {vectorise.taux_victoire()[0]:.1%} contre {scalaire.taux_victoire()[0]:.1%}, "
+                  f"tirs moyens {vectorise.tirs_moyens():.1f} contre {scalaire.tirs_moyens():.1f})")
+            for ecart in ecarts:
+                print(f"  {ecart}")
+        return
+
+    stats = simuler(args.parties, args.ia_a, args.ia_b, args.taille, graine=args.graine)
+    afficher(stats, args.ia_a, args.ia_b)
+
+# Point d'entrée pour lancer une simulation vectorisée en ligne de commande
+if __name__ == "__main__":
+    main()
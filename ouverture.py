@@ -0,0 +1,277 @@
+# Livre d'ouverture et tables de placement de l'ordinateur, calculés hors ligne par auto-jeu :
+# - le livre est la suite des premiers tirs de chasse qui maximise, tir après tir, le nombre moyen
+#   de navires découverts (touchés pour la première fois) sur des flottes tirées comme en partie ;
+#   l'IA difficile le suit au lieu de tirer au hasard tant qu'elle n'a pas de cible ;
+# - les tables donnent, pour chaque placement d'un navire, un poids qui croît avec le nombre de
+#   tirs qu'il a fallu à l'ordinateur pour le couler en auto-jeu ; la flotte de l'ordinateur est
+#   tirée selon ces poids et évite ainsi les placements trouvés le plus vite.
+# Les deux sont stockés dans un petit fichier binaire projeté en mémoire (mmap) au premier usage :
+# un tir du livre ou un tirage de placement ne coûte qu'une lecture de tableau.
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from functools import lru_cache
+
+from moteur import creer_flotte
+from placement import index_placements
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))  # Le fichier est cherché à côté du module
+FICHIER = os.path.join(DOSSIER, "ouverture.bnov")  # Fichier livre et tables livré avec le jeu
+MAGIE = b"BNOV"  # En-tête du fichier
+VERSION = 1
+ENTETE = struct.Struct("<4sHHHH")  # Magie, version, taille du plateau, tirs du livre, longueurs de navires
+LONGUEUR = struct.Struct("<HH")  # Longueur d'un navire, nombre de ses placements
+POIDS_MAX = 65535  # Poids du meilleur placement (poids entiers sur 16 bits)
+OUVERTURE_MAX = 64  # Tirs du livre au plus
+DECOUVERTE_MIN = 0.01  # Navires découverts par tir (moyenne par flotte) en deçà desquels le livre s'arrête
+ESSAIS_PLACEMENT = 100  # Flottes tirées selon les tables avant de revenir au placement uniforme
+
+# Livre d'ouverture et tables de placement, lus dans un fichier projeté en mémoire
+class TableOuverture:
+    def __init__(self, donnees):
+        magie, version, self.taille, nb_tirs, nb_longueurs = ENTETE.unpack_from(donnees)
+        if magie != MAGIE or version != VERSION:
+            raise ValueError("Ce fichier n'est pas un livre d'ouverture de bataille navale.")
+        vue = memoryview(donnees)
+        position = ENTETE.size
+        longueurs = []
+        for _ in range(nb_longueurs):
+            longueurs.append(LONGUEUR.unpack_from(donnees, position))
+            position += LONGUEUR.size
+        self.ouverture = self.tableau(vue, position, nb_tirs)  # Cases packées du livre, dans l'ordre
+        position += 2 * nb_tirs
+        self.poids = {}  # Longueur -> poids de chaque placement (ordre de placement.IndexPlacements)
+        for longueur, nombre in longueurs:
+            if nombre != self.taille * (self.taille - longueur + 1) * (2 if longueur > 1 else 1):
+                raise ValueError(f"Table de placement incohérente (longueur {longueur}).")
+            self.poids[longueur] = self.tableau(vue, position, nombre)
+            position += 2 * nombre
+        if position != len(donnees):
+            raise ValueError("Livre d'ouverture tronqué.")
+
+    # Tableau de nombre entiers non signés de 16 bits (petit-boutistes) à partir de position
+    @staticmethod
+    def tableau(vue, position, nombre):
+        octets = vue[position:position + 2 * nombre]
+        if len(octets) != 2 * nombre:
+            raise ValueError("Livre d'ouverture tronqué.")
+        if sys.byteorder == "little":
+            return octets.cast("H")
+        return struct.unpack(f"<{nombre}H", octets)
+
+    # Encode un livre (liste de cases) et des tables (longueur -> poids) au format du fichier
+    @staticmethod
+    def encoder(taille, ouverture, poids):
+        morceaux = [ENTETE.pack(MAGIE, VERSION, taille, len(ouverture), len(poids))]
+        morceaux.extend(LONGUEUR.pack(longueur, len(valeurs)) for longueur, valeurs in sorted(poids.items()))
+        morceaux.append(struct.pack(f"<{len(ouverture)}H", *ouverture))
+        morceaux.extend(struct.pack(f"<{len(valeurs)}H", *valeurs) for _, valeurs in sorted(poids.items()))
+        return b"".join(morceaux)
+
+# Image de la case (x, y) par l'une des 8 symétries du plateau (rotations et réflexions) : les flottes
+# étant tirées sans direction privilégiée, le livre transformé reste aussi bon et devient moins prévisible
+def symetrie(x, y, taille, numero):
+    if numero & 1:
+        x, y = y, x
+    if numero & 2:
+        x = taille - 1 - x
+    if numero & 4:
+        y = taille - 1 - y
+    return x, y
+
+# Livre et tables du fichier, projeté en mémoire à la première demande ; None s'il est absent ou illisible
+@lru_cache(maxsize=None)
+def charger_table(chemin=FICHIER):
+    try:
+        with open(chemin, "rb") as fichier:
+            donnees = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        return TableOuverture(donnees)
+    except (OSError, ValueError, struct.error):
+        return None
+
+# Livre et tables d'un plateau de taille donnée, None s'il n'y en a pas pour cette taille
+def table_ouverture(taille, chemin=FICHIER):
+    table = charger_table(chemin)
+    return table if table is not None and table.taille == taille else None
+
+# Place la flotte de l'ordinateur en tirant chaque navire (les plus grands d'abord) selon les tables
+# de placement ; sans table pour ce plateau, le placement reste uniforme (placer_flotte_aleatoire)
+def placer_flotte_ordinateur(plateau, rng=None, chemin=FICHIER):
+    navires = creer_flotte(plateau.taille)
+    table = table_ouverture(plateau.taille, chemin)
+    if table is None or any(navire.taille not in table.poids for navire in navires):
+        plateau.placer_flotte_aleatoire(navires)
+        return
+    rng = rng if rng is not None else plateau.rng
+    ordre = sorted(navires, key=lambda navire: -navire.taille)
+    for _ in range(ESSAIS_PLACEMENT):
+        occupation = plateau.masque_occupation()
+        dispositions = []
+        for navire in ordre:
+            index = index_placements(plateau.taille, navire.taille)
+            libres = index.legaux(occupation)
+            if not libres:
+                break
+            poids = table.poids[navire.taille]
+            indice = rng.choices(libres, [poids[i] for i in libres])[0]
+            occupation |= index.masques[indice]
+            dispositions.append((navire, index.positions(indice)))
+        else:
+            for navire, positions in dispositions:
+                plateau.placer_navire(navire, positions)
+            return
+    plateau.placer_flotte_aleatoire(navires)
+
+# Livre d'ouverture glouton : occupation est une matrice booléenne (navire, case) des navires de
+# flottes flottes ; à chaque rang, le livre choisit la case occupée par le plus grand nombre de
+# navires qu'aucun tir précédent du livre n'a touchés
+def calculer_ouverture(occupation, flottes, ouverture_max=OUVERTURE_MAX, decouverte_min=DECOUVERTE_MIN):
+    import numpy as np
+    intacts = np.ones(len(occupation), dtype=bool)
+    ouverture = []
+    while len(ouverture) < ouverture_max:
+        comptes = occupation[intacts].sum(axis=0)
+        comptes[ouverture] = -1
+        case = int(comptes.argmax())
+        if comptes[case] < decouverte_min * flottes:
+            break
+        ouverture.append(case)
+        intacts &= ~occupation[:, case]
+    return ouverture
+
+# Joue parties parties d'auto-jeu où l'IA d'un niveau attaque une flotte tirée uniformément ;
+# renvoie, par longueur de navire, la somme et le nombre des rangs de tir auxquels chaque placement
+# a été coulé
+def mesurer_survie(taille, parties, niveaux, rng):
+    from ia import creer_ia
+    from moteur import JoueurBitboard, PlateauBitboard
+    from simulation import placer_flotte
+
+    sommes, nombres, indices = {}, {}, {}
+    for longueur in {navire.taille for navire in creer_flotte(taille)}:
+        index = index_placements(taille, longueur)
+        sommes[longueur], nombres[longueur] = [0] * len(index), [0] * len(index)
+        indices[longueur] = {cases: i for i, cases in enumerate(index.cases)}
+    for partie in range(parties):
+        cible = PlateauBitboard(taille, rng)
+        placer_flotte(cible)
+        attaquant = JoueurBitboard("A", PlateauBitboard(taille, rng))
+        ia = creer_ia(niveaux[partie % len(niveaux)], attaquant, rng)
+        rang = 0
+        while not cible.tous_coules():
+            coordonnees = ia.choisir_tir()
+            resultat = attaquant.jouer(coordonnees, cible)
+            ia.observer(coordonnees, resultat)
+            rang += 1
+            if resultat.startswith("Coulé"):
+                navire = next(n for n in cible.navires if coordonnees in n.positions)
+                cases = tuple(sorted(x * taille + y for x, y in navire.positions))
+                indice = indices[navire.taille][cases]
+                sommes[navire.taille][indice] += rang
+                nombres[navire.taille][indice] += 1
+    return sommes, nombres
+
+# Poids des placements : exp((survie moyenne du placement - survie moyenne) / écart type), ramenés
+# à des entiers de 1 à POIDS_MAX ; un placement jamais observé reçoit le poids de la survie moyenne
+def calculer_poids(sommes, nombres):
+    import numpy as np
+    poids = {}
+    for longueur in sommes:
+        somme, nombre = np.array(sommes[longueur], dtype=float), np.array(nombres[longueur])
+        observe = nombre > 0
+        survie = np.full(len(somme), somme[observe].sum() / max(nombre[observe].sum(), 1))
+        survie[observe] = somme[observe] / nombre[observe]
+        ecart = survie[observe].std() or 1.0
+        valeurs = np.exp((survie - survie.mean()) / ecart)
+        poids[longueur] = np.clip(np.rint(valeurs / valeurs.max() * POIDS_MAX), 1, POIDS_MAX).astype(int).tolist()
+    return poids
+
+# Construit le livre et les tables d'un plateau par auto-jeu et les écrit dans chemin
+def construire(chemin=FICHIER, taille=10, flottes=50_000, parties=20_000, niveaux=("Probabiliste",), graine=0):
+    import numpy as np
+    from placement import generer_flottes
+
+    rng = random.Random(graine)
+    longueurs = [navire.taille for navire in creer_flotte(taille)]
+    cases = [x * taille + y for flotte in generer_flottes(flottes, taille, longueurs, rng)
+             for positions in flotte for x, y in positions]
+    occupation = np.zeros((flottes * len(longueurs), taille * taille), dtype=bool)
+    occupation[np.repeat(np.arange(len(occupation)), longueurs * flottes), cases] = True
+    ouverture = calculer_ouverture(occupation, flottes)
+
+    poids = calculer_poids(*mesurer_survie(taille, parties, niveaux, rng))
+    temporaire = chemin + ".tmp"
+    with open(temporaire, "wb") as fichier:
+        fichier.write(TableOuverture.encoder(taille, ouverture, poids))
+    os.replace(temporaire, chemin)
+    charger_table.cache_clear()
+    return ouverture, poids
+
+# Tirs nécessaires à l'IA d'un niveau pour couler des flottes placées uniformément ou selon les
+# tables du fichier livré, et à l'IA difficile avec et sans livre, sur des parties indépendantes de
+# la construction (graine différente)
+def evaluer(parties=2000, niveaux=("Difficile", "Probabiliste"), graine=1):
+    from ia import IADifficile, creer_ia
+    from moteur import JoueurBitboard, PlateauBitboard
+    from simulation import graine_partie, placer_flotte
+
+    resultats = {}
+    for placement in ("uniforme", "tables"):
+        for niveau in niveaux:
+            total = 0
+            for i in range(parties):
+                rng = random.Random(graine_partie(graine, i))
+                cible = PlateauBitboard(10, rng)
+                if placement == "tables":
+                    placer_flotte_ordinateur(cible, rng)
+                else:
+                    placer_flotte(cible)
+                attaquant = JoueurBitboard("A", PlateauBitboard(10, rng))
+                ia = creer_ia(niveau, attaquant, rng)
+                while not cible.tous_coules():
+                    coordonnees = ia.choisir_tir()
+                    ia.observer(coordonnees, attaquant.jouer(coordonnees, cible))
+                total += len(attaquant.tirs_effectues)
+            resultats[f"{niveau} contre placement {placement}"] = total / parties
+    for livre in (False, True):
+        total = 0
+        for i in range(parties):
+            rng = random.Random(graine_partie(graine, i))
+            cible = PlateauBitboard(10, rng)
+            placer_flotte(cible)
+            attaquant = JoueurBitboard("A", PlateauBitboard(10, rng))
+            ia = IADifficile(attaquant, rng, ouverture=livre)
+            while not cible.tous_coules():
+                coordonnees = ia.choisir_tir()
+                ia.observer(coordonnees, attaquant.jouer(coordonnees, cible))
+            total += len(attaquant.tirs_effectues)
+        resultats[f"Difficile {'avec' if livre else 'sans'} livre"] = total / parties
+    return resultats
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Construction du livre d'ouverture et des tables de placement")
+    parser.add_argument("--flottes", type=int, default=50_000, help="flottes tirées pour calculer le livre")
+    parser.add_argument("--parties", type=int, default=20_000, help="parties d'auto-jeu pour les tables de placement")
+    parser.add_argument("--graine", type=int, default=0, help="graine de la construction")
+    parser.add_argument("--evaluer", type=int, default=0, metavar="PARTIES",
+                        help="mesure ensuite l'effet du livre et des tables sur ce nombre de parties")
+    parser.add_argument("--sans-construire", action="store_true", help="évalue le fichier existant sans le reconstruire")
+    args = parser.parse_args(arguments)
+
+    if not args.sans_construire:
+        chrono = time.perf_counter()
+        ouverture, poids = construire(flottes=args.flottes, parties=args.parties, graine=args.graine)
+        print(f"Livre de {len(ouverture)} tirs et tables de {sum(map(len, poids.values()))} placements "
+              f"en {time.perf_counter() - chrono:.1f}s ({os.path.getsize(FICHIER)} octets)")
+        print("Ouverture:", " ".join(f"{x}{y}" for x, y in (divmod(case, 10) for case in ouverture)))
+    if args.evaluer:
+        for nom, tirs in evaluer(args.evaluer).items():
+            print(f"{nom}: {tirs:.2f} tirs")
+
+# Point d'entrée pour construire le livre d'ouverture
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Placement des flottes par contraintes : les positions légales de chaque navire sont calculées
+# à l'avance puis tirées uniformément, avec retour arrière lorsqu'un navire ne peut plus être placé
+import random
+from functools import lru_cache
+
+# Masque binaire (bit x * taille + y) d'une liste de positions
+def masque_positions(positions, taille):
+    masque = 0
+    for x, y in positions:
+        masque |= 1 << (x * taille + y)
+    return masque
+
+# Masque des positions et de toutes leurs cases voisines (diagonales comprises)
+def masque_halo(positions, taille):
+    masque = 0
+    for x, y in positions:
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if 0 <= x + dx < taille and 0 <= y + dy < taille:
+                    masque |= 1 << ((x + dx) * taille + y + dy)
+    return masque
+
+# Index de tous les placements d'un navire de longueur donnée sur un plateau taille x taille.
+# Chaque placement est désigné par son indice ; ses cases sont des entiers packés x * taille + y,
+# et son occupation (avec ou sans les cases voisines) est un masque binaire.
+class IndexPlacements:
+    def __init__(self, taille, longueur):
+        self.taille = taille
+        self.longueur = longueur
+        cases = []
+        for x in range(taille):
+            for y in range(taille - longueur + 1):
+                cases.append(tuple(x * taille + y + i for i in range(longueur)))
+        if longueur > 1:
+            for x in range(taille - longueur + 1):
+                for y in range(taille):
+                    cases.append(tuple((x + i) * taille + y for i in range(longueur)))
+        self.cases = tuple(cases)  # Cases de chaque placement
+        self.masques = tuple(sum(1 << case for case in p) for p in cases)  # Masque de chaque placement
+        self.coordonnees = tuple(tuple(divmod(case, taille) for case in p) for p in cases)  # Positions (x, y)
+        self.halos = tuple(masque_halo(p, taille) for p in self.coordonnees)
+
+        couvrant = [[] for _ in range(taille * taille)]
+        for indice, p in enumerate(cases):
+            for case in p:
+                couvrant[case].append(indice)
+        self.couvrant = tuple(tuple(indices) for indices in couvrant)  # Placements couvrant chaque case
+
+    def __len__(self):
+        return len(self.cases)
+
+    # Positions (x, y) d'un placement
+    def positions(self, indice):
+        return list(self.coordonnees[indice])
+
+    # Indices des placements qui ne touchent aucune case du masque bloque
+    def legaux(self, bloque=0):
+        return [indice for indice, masque in enumerate(self.masques) if not masque & bloque]
+
+# Index des placements pour une taille de plateau et une longueur de navire, construit à la
+# première demande puis partagé par le placement, le plateau et l'ordinateur
+@lru_cache(maxsize=None)
+def index_placements(taille, longueur):
+    return IndexPlacements(taille, longueur)
+
+# Recherche en profondeur d'une disposition, limitée à budget retours arrière. Renvoie les positions
+# de chaque navire, None si le budget est épuisé, et lève ValueError si l'espace a été entièrement
+# exploré sans succès. Les états (niveau, cases bloquées) connus pour échouer sont mémorisés dans
+# echecs : ils ne sont jamais réexplorés, ni dans cette recherche ni dans les suivantes.
+def _rechercher(placements, longueurs, ordre, rng, sans_contact, occupation, echecs, budget):
+    choix = [None] * len(longueurs)
+    restantes = [set(longueurs[i] for i in ordre[k:]) for k in range(len(ordre) + 1)]  # Longueurs encore à placer
+
+    # Pile de recherche : pour chaque niveau, cases bloquées et placements légaux non encore essayés
+    bloques = [occupation]
+    candidats = [placements[longueurs[ordre[0]]].legaux(occupation)] if ordre else []
+    while len(bloques) <= len(ordre):
+        niveau = len(bloques) - 1
+        restants = candidats[niveau]
+        if not restants:
+            if niveau == 0:
+                raise ValueError("Aucune disposition valide pour cette flotte.")
+            echecs.add((niveau, bloques.pop()))
+            candidats.pop()
+            budget -= 1
+            if budget < 0:
+                return None
+            continue
+
+        # Tire un candidat uniformément et le retire de la liste (échange avec le dernier)
+        j = rng.randrange(len(restants))
+        restants[j], restants[-1] = restants[-1], restants[j]
+        index = placements[longueurs[ordre[niveau]]]
+        indice = restants.pop()
+
+        bloque = bloques[niveau] | (index.halos[indice] if sans_contact else index.masques[indice])
+        if (niveau + 1, bloque) in echecs:
+            continue
+        # Vérification en avant : chaque longueur restante doit encore avoir au moins un placement
+        if any(all(m & bloque for m in placements[longueur].masques) for longueur in restantes[niveau + 1]):
+            echecs.add((niveau + 1, bloque))
+            continue
+        choix[ordre[niveau]] = index.positions(indice)
+        bloques.append(bloque)
+        if len(bloques) <= len(ordre):
+            candidats.append(placements[longueurs[ordre[niveau + 1]]].legaux(bloque))
+    return choix
+
+# Génère une flotte complète : renvoie la liste des positions de chaque navire (dans l'ordre des
+# longueurs données). Lève ValueError uniquement s'il n'existe aucune disposition valide.
+# Avec sans_contact, deux navires ne peuvent pas se toucher, même en diagonale.
+# Sur les plateaux très chargés, la recherche repart de zéro avec un budget de retours arrière
+# qui double à chaque fois : les mauvais premiers choix ne bloquent pas la recherche, et le
+# budget finit par couvrir tout l'espace, donc une disposition existante est toujours trouvée.
+def generer_flotte(taille, longueurs, rng=None, sans_contact=False, occupation=0):
+    rng = rng if rng is not None else random
+    if sum(longueurs) > taille * taille - bin(occupation).count("1"):
+        raise ValueError("La flotte ne tient pas sur le plateau.")
+
+    placements = {longueur: index_placements(taille, longueur) for longueur in set(longueurs)}
+    ordre = sorted(range(len(longueurs)), key=lambda i: -longueurs[i])  # Les plus grands d'abord
+    echecs = set()
+    budget = 64
+    while True:
+        choix = _rechercher(placements, longueurs, ordre, rng, sans_contact, occupation, echecs, budget)
+        if choix is not None:
+            return choix
+        budget *= 2
+
+# Génère n flottes valides à la suite
+def generer_flottes(n, taille=10, longueurs=(5, 4, 3, 3, 2, 2), rng=None, sans_contact=False):
+    for _ in range(n):
+        yield generer_flotte(taille, longueurs, rng, sans_contact)
@@ -0,0 +1,86 @@
+# Protocole réseau compact de la bataille navale : chaque message est une trame
+# [longueur:u16][type:u8][contenu], où longueur compte le type et le contenu (entiers big-endian)
+import struct
+
+from moteur import FLOTTE, NOMS_NAVIRES
+
+# Messages du client vers le serveur
+REJOINDRE = 0x01  # mode:u8 (0 = contre l'ordinateur, 1 = contre un joueur), niveau:u8
+PLACER = 0x02  # (x:u16, y:u16, vertical:u8) par navire de la flotte, ou vide pour un placement aléatoire
+TIRER = 0x03  # x:u16, y:u16
+
+# Messages du serveur vers le client
+PARTIE = 0x81  # taille:u16, nombre de navires:u8 — la phase de placement commence
+DEBUT = 0x82  # a_vous:u8 — tous les navires sont placés, la partie commence
+RESULTAT = 0x83  # tireur:u8 (0 = vous, 1 = adversaire), x:u16, y:u16, code:u8, navire:u8
+FIN = 0x84  # gagne:u8
+ERREUR = 0x85  # message en UTF-8
+
+# Modes de jeu
+CONTRE_ORDINATEUR = 0
+CONTRE_JOUEUR = 1
+
+# Codes de résultat d'un tir
+MANQUE = 0
+TOUCHE = 1
+COULE = 2
+
+ENTETE = struct.Struct(">HB")
+COORDONNEES = struct.Struct(">HH")
+NAVIRE = struct.Struct(">HHB")
+RESULTAT_TIR = struct.Struct(">BHHBB")
+
+# Construit une trame
+def trame(type_message, contenu=b""):
+    return ENTETE.pack(len(contenu) + 1, type_message) + contenu
+
+# Lit une trame complète sur un flux asyncio et renvoie (type, contenu) ; ValueError si la trame
+# annonce une longueur nulle (le type en fait toujours partie)
+async def lire_trame(reader):
+    longueur, type_message = ENTETE.unpack(await reader.readexactly(ENTETE.size))
+    if longueur < 1:
+        raise ValueError("Trame de longueur nulle.")
+    contenu = await reader.readexactly(longueur - 1) if longueur > 1 else b""
+    return type_message, contenu
+
+# Convertit un résultat du moteur ("Manqué", "Touché", "Coulé: nom") en (code, indice du navire)
+def coder_resultat(resultat):
+    if resultat == "Manqué":
+        return MANQUE, 0
+    if resultat == "Touché":
+        return TOUCHE, 0
+    nom = resultat.split(": ", 1)[1]
+    return COULE, NOMS_NAVIRES.index(nom) if nom in NOMS_NAVIRES else 0
+
+# Convertit (code, indice du navire) en résultat du moteur
+def decoder_resultat(code, navire):
+    if code == MANQUE:
+        return "Manqué"
+    if code == TOUCHE:
+        return "Touché"
+    return f"Coulé: {NOMS_NAVIRES[navire]}"
+
+# Trame RESULTAT pour un tir
+def trame_resultat(tireur, coordonnees, resultat):
+    code, navire = coder_resultat(resultat)
+    return trame(RESULTAT, RESULTAT_TIR.pack(tireur, coordonnees[0], coordonnees[1], code, navire))
+
+# Contenu d'un message PLACER à partir des positions de chaque navire
+def coder_placement(dispositions):
+    contenu = b""
+    for positions in dispositions:
+        (x, y), vertical = positions[0], len(positions) > 1 and positions[1][0] != positions[0][0]
+        contenu += NAVIRE.pack(x, y, vertical)
+    return contenu
+
+# Positions de chaque navire à partir d'un message PLACER
+def decoder_placement(contenu, flotte=FLOTTE):
+    if len(contenu) != NAVIRE.size * len(flotte):
+        raise ValueError("Placement incomplet.")
+    dispositions = []
+    for (_, taille), (x, y, vertical) in zip(flotte, NAVIRE.iter_unpack(contenu)):
+        if vertical:
+            dispositions.append([(x + i, y) for i in range(taille)])
+        else:
+            dispositions.append([(x, y + i) for i in range(taille)])
+    return dispositions
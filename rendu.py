@@ -0,0 +1,182 @@
+# Rendu d'une grille de bataille navale sur un seul Canvas : chaque case possède des éléments
+# graphiques créés une fois pour toutes (fond, croix, cercle) dont seuls les attributs changent
+import argparse
+import time
+import tkinter as tk
+
+# Marques pouvant être affichées sur une case
+AUCUNE = 0
+CROIX = 1  # Tir réussi
+CERCLE = 2  # Tir manqué
+
+COULEUR_EAU = "lightblue"
+
+# Grille de taille x taille cases dessinée sur un Canvas ; au_clic(x, y) est appelé lors d'un clic
+class GrilleCanvas:
+    def __init__(self, parent, taille, au_clic=None, cote=None):
+        self.taille = taille
+        self.cote = cote if cote is not None else max(12, min(36, 400 // taille))  # Côté d'une case en pixels
+        self.au_clic = au_clic
+        self.canvas = tk.Canvas(parent, width=taille * self.cote, height=taille * self.cote,
+                                bg="white", highlightthickness=0)
+
+        # Éléments de chaque case, indexés par case = x * taille + y (x = ligne, y = colonne)
+        self.fonds = []
+        self.croix = []
+        self.cercles = []
+        c, m = self.cote, max(2, self.cote // 5)
+        for x in range(taille):
+            for y in range(taille):
+                gauche, haut = y * c, x * c
+                self.fonds.append(self.canvas.create_rectangle(gauche, haut, gauche + c, haut + c,
+                                                               fill=COULEUR_EAU, outline="gray"))
+                self.croix.append((
+                    self.canvas.create_line(gauche + m, haut + m, gauche + c - m, haut + c - m,
+                                            fill="red", width=2, state=tk.HIDDEN),
+                    self.canvas.create_line(gauche + m, haut + c - m, gauche + c - m, haut + m,
+                                            fill="red", width=2, state=tk.HIDDEN)))
+                self.cercles.append(self.canvas.create_oval(gauche + m, haut + m, gauche + c - m, haut + c - m,
+                                                            outline="blue", width=2, state=tk.HIDDEN))
+
+        # État affiché de chaque case, pour ne toucher qu'aux éléments qui changent
+        self.couleurs = [COULEUR_EAU] * (taille * taille)
+        self.marques = bytearray(taille * taille)
+        self.modifiees = set()  # Cases différentes de l'état initial
+
+        self.canvas.bind("<Button-1>", self.clic)
+
+    # Place le Canvas dans son parent avec le gestionnaire grid
+    def grid(self, **options):
+        self.canvas.grid(**options)
+
+    # Convertit un clic en case par simple division
+    def clic(self, evenement):
+        x, y = evenement.y // self.cote, evenement.x // self.cote
+        if self.au_clic is not None and 0 <= x < self.taille and 0 <= y < self.taille:
+            self.au_clic(x, y)
+
+    # Change la couleur de fond d'une case
+    def colorier(self, x, y, couleur):
+        case = x * self.taille + y
+        if self.couleurs[case] != couleur:
+            self.couleurs[case] = couleur
+            self.canvas.itemconfigure(self.fonds[case], fill=couleur)
+            self.modifiees.add(case)
+
+    # Affiche une marque (AUCUNE, CROIX ou CERCLE) sur une case
+    def marquer(self, x, y, marque):
+        case = x * self.taille + y
+        ancienne = self.marques[case]
+        if ancienne == marque:
+            return
+        self.marques[case] = marque
+        for element in self.elements_marque(case, ancienne):
+            self.canvas.itemconfigure(element, state=tk.HIDDEN)
+        for element in self.elements_marque(case, marque):
+            self.canvas.itemconfigure(element, state=tk.NORMAL)
+        self.modifiees.add(case)
+
+    # Éléments graphiques d'une marque sur une case
+    def elements_marque(self, case, marque):
+        if marque == CROIX:
+            return self.croix[case]
+        if marque == CERCLE:
+            return (self.cercles[case],)
+        return ()
+
+    # Remet à l'état initial les seules cases modifiées depuis la dernière réinitialisation
+    def reinitialiser(self):
+        for case in self.modifiees:
+            if self.couleurs[case] != COULEUR_EAU:
+                self.couleurs[case] = COULEUR_EAU
+                self.canvas.itemconfigure(self.fonds[case], fill=COULEUR_EAU)
+            for element in self.elements_marque(case, self.marques[case]):
+                self.canvas.itemconfigure(element, state=tk.HIDDEN)
+            self.marques[case] = AUCUNE
+        self.modifiees.clear()
+
+# Ancien rendu (un Button par case, un Canvas créé dans le bouton à chaque tir), conservé pour la mesure
+def _creer_grille_boutons(parent, taille):
+    cadre = tk.Frame(parent)
+    boutons = [[None] * taille for _ in range(taille)]
+    for i in range(taille):
+        for j in range(taille):
+            bouton = tk.Button(cadre, width=3, height=2, bg=COULEUR_EAU)
+            bouton.grid(row=i + 1, column=j)
+            boutons[i][j] = bouton
+    return cadre, boutons
+
+# Ancien rendu d'un tir : un nouveau Canvas dans le bouton
+def _tirer_boutons(boutons, cases):
+    for x, y in cases:
+        canvas = tk.Canvas(boutons[x][y], width=20, height=20, bg="white", highlightthickness=0)
+        canvas.create_oval(2, 2, 18, 18, outline="blue", width=2)
+        canvas.pack()
+
+# Ancienne réinitialisation : parcours de tous les boutons et destruction de leurs enfants
+def _reinitialiser_boutons(boutons):
+    for ligne in boutons:
+        for bouton in ligne:
+            bouton.config(bg=COULEUR_EAU, state=tk.NORMAL)
+            for child in bouton.winfo_children():
+                child.destroy()
+
+# Durées (en secondes) de création, de tirs sur la moitié des cases puis de réinitialisation,
+# pour l'ancien rendu à boutons et pour GrilleCanvas
+def mesurer_rendu(taille=10, repetitions=5):
+    root = tk.Tk()
+    root.withdraw()
+    cases = [(x, y) for x in range(taille) for y in range(taille) if (x + y) % 2 == 0]
+    mesures = {}
+    try:
+        debut = time.perf_counter()
+        cadre, boutons = _creer_grille_boutons(root, taille)
+        root.update()
+        creation = time.perf_counter() - debut
+        tirs = reinitialisation = 0.0
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            _tirer_boutons(boutons, cases)
+            root.update()
+            tirs += time.perf_counter() - debut
+            debut = time.perf_counter()
+            _reinitialiser_boutons(boutons)
+            root.update()
+            reinitialisation += time.perf_counter() - debut
+        cadre.destroy()
+        mesures["boutons"] = (creation, tirs / repetitions, reinitialisation / repetitions)
+
+        debut = time.perf_counter()
+        grille = GrilleCanvas(root, taille)
+        grille.grid(row=0, column=0)
+        root.update()
+        creation = time.perf_counter() - debut
+        tirs = reinitialisation = 0.0
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            for x, y in cases:
+                grille.marquer(x, y, CERCLE)
+            root.update()
+            tirs += time.perf_counter() - debut
+            debut = time.perf_counter()
+            grille.reinitialiser()
+            root.update()
+            reinitialisation += time.perf_counter() - debut
+        mesures["canvas"] = (creation, tirs / repetitions, reinitialisation / repetitions)
+    finally:
+        root.destroy()
+    return mesures
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Mesure du rendu d'une grille (boutons ou Canvas)")
+    parser.add_argument("--taille", type=int, default=10, help="côté de la grille")
+    parser.add_argument("-r", "--repetitions", type=int, default=5, help="nombre de tirs/réinitialisations mesurés")
+    args = parser.parse_args(arguments)
+
+    for rendu, (creation, tirs, reinitialisation) in mesurer_rendu(args.taille, args.repetitions).items():
+        print(f"{rendu}: création {creation * 1000:.1f}ms, tirs {tirs * 1000:.1f}ms, "
+              f"réinitialisation {reinitialisation * 1000:.1f}ms")
+
+# Point d'entrée pour mesurer le rendu
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# Serveur asyncio de parties de bataille navale (contre l'ordinateur ou entre deux joueurs)
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+import protocole
+from enregistrement import EcrivainParties, EnregistreurPartie
+from moteur import creer_flotte
+from moteur_compact import PlateauCompact, JoueurCompact
+from ia import creer_ia
+from ouverture import placer_flotte_ordinateur
+from transposition import TableTransposition
+
+journal = logging.getLogger(__name__)
+
+# Niveaux de l'ordinateur, désignés par leur indice dans les messages REJOINDRE
+# (liste explicite : un nouveau niveau s'ajoute à la fin pour ne pas décaler les indices existants).
+# L'IA experte n'y figure pas : son budget de réflexion par tir serait pris sur la boucle
+# d'événements commune à toutes les parties.
+NIVEAUX_RESEAU = ["Difficile", "Facile", "Probabiliste"]
+
+# États d'une partie
+ATTENTE = "attente"  # En attente d'un adversaire
+PLACEMENT = "placement"  # Les joueurs placent leurs navires
+EN_COURS = "en_cours"  # Les joueurs tirent chacun leur tour
+TERMINEE = "terminee"  # Un joueur a gagné ou s'est déconnecté
+
+# Connexion d'un client et place qu'il occupe dans une partie
+class Connexion:
+    def __init__(self, writer):
+        self.writer = writer
+        self.partie = None  # Partie rejointe
+        self.indice = 0  # Indice du joueur dans la partie
+
+    # Envoie une trame (mise en tampon, vidée par le serveur après chaque message traité)
+    def envoyer(self, donnees):
+        self.writer.write(donnees)
+
+# Machine à états d'une partie : remplace les indicateurs mode_placement / tour_joueur de l'interface
+class Partie:
+    def __init__(self, rng, table=None, analytique=None, ecrivain=None):
+        self.etat = ATTENTE
+        self.rng = rng
+        self.table = table  # Table de transposition partagée par les IA du serveur
+        self.analytique = analytique  # Étage d'agrégation des tirs (voir analytique.Analytique), ou None
+        self.ecrivain = ecrivain  # Fichier où la partie est ajoutée à sa fin (voir enregistrement.py), ou None
+        self.enregistreur = None  # Tirs de la partie en cours d'enregistrement
+        self.debut_coup = 0.0  # Début du coup en cours (s, horloge monotone)
+        self.joueurs = [JoueurCompact("Joueur 1", PlateauCompact(rng=rng)),
+                        JoueurCompact("Joueur 2", PlateauCompact(rng=rng))]
+        self.connexions = [None, None]  # None pour l'ordinateur
+        self.ia = None  # IA de l'ordinateur (joueur 2) en mode contre l'ordinateur
+        self.places = [False, False]  # Flotte placée par chaque joueur
+        self.tour = 0  # Indice du joueur qui doit tirer
+
+    # Ajoute un joueur humain et renvoie son indice
+    def ajouter(self, connexion):
+        indice = self.connexions.index(None)
+        self.connexions[indice] = connexion
+        connexion.partie, connexion.indice = self, indice
+        return indice
+
+    # Remplace le joueur 2 par l'ordinateur, qui place sa flotte immédiatement (selon les tables de
+    # placement, voir ouverture.py)
+    def ajouter_ordinateur(self, niveau):
+        self.ia = creer_ia(niveau, self.joueurs[1], self.rng, self.table)
+        placer_flotte_ordinateur(self.joueurs[1].plateau, self.rng)
+        self.places[1] = True
+
+    # Passe en phase de placement et prévient les joueurs humains
+    def commencer_placement(self):
+        self.etat = PLACEMENT
+        message = protocole.trame(protocole.PARTIE, self.joueurs[0].plateau.taille.to_bytes(2, "big")
+                                  + bytes([len(creer_flotte())]))
+        for connexion in self.connexions:
+            if connexion is not None:
+                connexion.envoyer(message)
+
+    # Place la flotte d'un joueur (aléatoirement si le contenu est vide)
+    def placer(self, indice, contenu):
+        if self.etat != PLACEMENT or self.places[indice]:
+            raise ValueError("Placement impossible dans l'état actuel de la partie.")
+        plateau = self.joueurs[indice].plateau
+        if contenu:
+            dispositions = protocole.decoder_placement(contenu)
+            nouveau = type(plateau)(plateau.taille, self.rng)
+            for navire, positions in zip(creer_flotte(), dispositions):
+                nouveau.placer_navire(navire, positions)
+            self.joueurs[indice].plateau = nouveau
+        else:
+            plateau.placer_flotte_aleatoire(creer_flotte())
+        self.places[indice] = True
+
+        if all(self.places):
+            self.etat = EN_COURS
+            self.debut_coup = time.monotonic()
+            if self.ecrivain is not None:
+                self.enregistreur = EnregistreurPartie(0, self.joueurs)
+            for i, connexion in enumerate(self.connexions):
+                if connexion is not None:
+                    connexion.envoyer(protocole.trame(protocole.DEBUT, bytes([self.tour == i])))
+
+    # Résout le tir d'un joueur, puis celui de l'ordinateur le cas échéant
+    def tirer(self, indice, coordonnees):
+        if self.etat != EN_COURS or self.tour != indice:
+            raise ValueError("Ce n'est pas votre tour.")
+        self.resoudre_tir(indice, coordonnees)
+        if self.etat == EN_COURS and self.ia is not None:
+            coordonnees = self.ia.choisir_tir()
+            self.ia.observer(coordonnees, self.resoudre_tir(1, coordonnees))
+
+    # Applique un tir, prévient les joueurs humains et passe la main
+    def resoudre_tir(self, indice, coordonnees):
+        adversaire = 1 - indice
+        tireur = self.joueurs[indice]
+        resultat = tireur.jouer(coordonnees, self.joueurs[adversaire].plateau)
+        if self.analytique is not None:
+            maintenant = time.monotonic()
+            self.analytique.tir(indice, coordonnees, resultat, tireur.tirs_reussis + tireur.tirs_rates,
+                                maintenant - self.debut_coup)
+            self.debut_coup = maintenant
+        if self.enregistreur is not None:
+            self.enregistreur.tir(indice, coordonnees, resultat)
+        for i, connexion in enumerate(self.connexions):
+            if connexion is not None:
+                connexion.envoyer(protocole.trame_resultat(0 if i == indice else 1, coordonnees, resultat))
+
+        if self.joueurs[adversaire].plateau.tous_coules():
+            self.terminer(gagnant=indice)
+        else:
+            self.tour = adversaire
+        return resultat
+
+    # Termine la partie, l'enregistre (même abandonnée en cours de route) et annonce le résultat
+    # aux joueurs humains
+    def terminer(self, gagnant):
+        if self.analytique is not None and self.etat == EN_COURS:
+            self.analytique.fin_partie(gagnant, self.joueurs)
+        if self.enregistreur is not None and self.etat == EN_COURS:
+            self.ecrivain.ecrire(self.enregistreur.partie)
+            self.ecrivain.fichier.flush()  # Partie lisible dans le fichier sans attendre l'arrêt du serveur
+        self.etat = TERMINEE
+        for i, connexion in enumerate(self.connexions):
+            if connexion is not None:
+                connexion.envoyer(protocole.trame(protocole.FIN, bytes([i == gagnant])))
+                connexion.partie = None
+
+# Serveur hébergeant de nombreuses parties simultanées sur une seule boucle d'événements
+class Serveur:
+    def __init__(self, graine=None, analytique=None, ecrivain=None):
+        self.rng = random.Random(graine)
+        self.table = TableTransposition()  # Positions déjà évaluées par l'ordinateur, toutes parties confondues
+        self.analytique = analytique  # Étage d'agrégation des tirs de toutes les parties, ou None
+        self.ecrivain = ecrivain  # Fichier où chaque partie est ajoutée à sa fin (EcrivainParties), ou None
+        self.en_attente = None  # Partie entre joueurs qui attend son deuxième joueur
+        self.connexions = 0  # Nombre de connexions ouvertes
+
+    # Boucle de lecture d'une connexion
+    async def gerer_connexion(self, reader, writer):
+        connexion = Connexion(writer)
+        self.connexions += 1
+        try:
+            while True:
+                try:
+                    type_message, contenu = await protocole.lire_trame(reader)
+                except ValueError as e:
+                    # Trame invalide : la suite du flux ne peut plus être découpée, la connexion est fermée
+                    connexion.envoyer(protocole.trame(protocole.ERREUR, str(e).encode()))
+                    await writer.drain()
+                    break
+                ouverte = self.traiter(connexion, type_message, contenu)
+                await writer.drain()
+                if not ouverte:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connexions -= 1
+            self.deconnecter(connexion)
+            writer.close()
+
+    # Traite un message reçu d'un client ; renvoie False si la connexion doit être fermée (erreur
+    # inattendue, la partie du client est alors abandonnée)
+    def traiter(self, connexion, type_message, contenu):
+        try:
+            if type_message == protocole.REJOINDRE:
+                self.rejoindre(connexion, contenu)
+            elif connexion.partie is None:
+                raise ValueError("Aucune partie en cours.")
+            elif type_message == protocole.PLACER:
+                connexion.partie.placer(connexion.indice, contenu)
+            elif type_message == protocole.TIRER:
+                if len(contenu) != protocole.COORDONNEES.size:
+                    raise ValueError("Tir mal formé.")
+                connexion.partie.tirer(connexion.indice, protocole.COORDONNEES.unpack(contenu))
+            else:
+                raise ValueError(f"Message inconnu: {type_message}")
+        except ValueError as e:
+            connexion.envoyer(protocole.trame(protocole.ERREUR, str(e).encode()))
+        except Exception as e:
+            journal.warning("Message %d rejeté, connexion fermée: %r", type_message, e)
+            connexion.envoyer(protocole.trame(protocole.ERREUR, b"Message invalide."))
+            return False
+        return True
+
+    # Crée ou rejoint une partie
+    def rejoindre(self, connexion, contenu):
+        if connexion.partie is not None:
+            raise ValueError("Partie déjà en cours.")
+        if len(contenu) != 2:
+            raise ValueError("Message REJOINDRE mal formé.")
+        mode, niveau = contenu
+        if mode == protocole.CONTRE_ORDINATEUR:
+            if niveau >= len(NIVEAUX_RESEAU):
+                raise ValueError("Niveau inconnu.")
+            partie = Partie(self.rng, self.table, self.analytique, self.ecrivain)
+            partie.ajouter(connexion)
+            partie.ajouter_ordinateur(NIVEAUX_RESEAU[niveau])
+            partie.commencer_placement()
+        elif mode != protocole.CONTRE_JOUEUR:
+            raise ValueError("Mode inconnu.")
+        elif self.en_attente is not None:
+            partie, self.en_attente = self.en_attente, None
+            partie.ajouter(connexion)
+            partie.commencer_placement()
+        else:
+            self.en_attente = Partie(self.rng, analytique=self.analytique, ecrivain=self.ecrivain)
+            self.en_attente.ajouter(connexion)
+
+    # Libère la partie d'un client déconnecté ; l'adversaire gagne par forfait
+    def deconnecter(self, connexion):
+        partie = connexion.partie
+        if partie is None:
+            return
+        if partie is self.en_attente:
+            self.en_attente = None
+        partie.connexions[connexion.indice] = None
+        connexion.partie = None
+        if partie.etat != TERMINEE:
+            partie.terminer(gagnant=1 - connexion.indice)
+
+    # Démarre le serveur et le fait tourner jusqu'à son arrêt
+    async def servir(self, hote="127.0.0.1", port=8765):
+        serveur = await asyncio.start_server(self.gerer_connexion, hote, port, backlog=4096)
+        async with serveur:
+            await serveur.serve_forever()
+
+# Relève la limite de fichiers ouverts au maximum autorisé (milliers de connexions simultanées)
+def augmenter_limite_fichiers():
+    try:
+        import resource
+    except ImportError:
+        return
+    _, maximum = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (maximum, maximum))
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Serveur de parties de bataille navale")
+    parser.add_argument("--hote", default="127.0.0.1", help="adresse d'écoute")
+    parser.add_argument("--port", type=int, default=8765, help="port d'écoute")
+    parser.add_argument("--graine", type=int, default=None, help="graine du placement et de l'ordinateur")
+    parser.add_argument("--analytique", metavar="FICHIER", default=None,
+                        help="cumule cartes de chaleur et statistiques de tirs de toutes les parties dans ce fichier (.npz)")
+    parser.add_argument("--enregistrer", metavar="FICHIER", default=None,
+                        help="ajoute chaque partie terminée ou abandonnée à ce fichier")
+    args = parser.parse_args(arguments)
+
+    augmenter_limite_fichiers()
+    analytique = None
+    if args.analytique:
+        from analytique import Analytique
+        analytique = Analytique(chemin=args.analytique)
+    fichier = open(args.enregistrer, "ab") if args.enregistrer else None
+    ecrivain = EcrivainParties(fichier) if fichier is not None else None
+    print(f"Serveur à l'écoute sur {args.hote}:{args.port}")
+    try:
+        asyncio.run(Serveur(args.graine, analytique, ecrivain).servir(args.hote, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if analytique is not None:
+            analytique.fermer()
+        if fichier is not None:
+            fichier.close()
+
+# Point d'entrée pour lancer le serveur
+if __name__ == "__main__":
+    main()
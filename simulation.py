@@ -0,0 +1,269 @@
+# Simulation sans interface de parties ordinateur contre ordinateur
+import argparse
+import contextlib
+import hashlib
+import io
+import multiprocessing
+import random
+import time
+from collections import Counter
+
+from moteur import Plateau, PlateauBitboard, Joueur, JoueurBitboard, creer_flotte
+from ia import NIVEAUX, creer_ia
+from enregistrement import EcrivainParties, EnregistreurPartie
+from moteur_compact import PlateauCompact, JoueurCompact
+from moteur_creux import PlateauCreux, JoueurCreux
+from transposition import TableTransposition
+
+# Moteurs disponibles pour la simulation : (classe du plateau, classe du joueur)
+MOTEURS = {
+    "liste": (Plateau, Joueur),
+    "bitboard": (PlateauBitboard, JoueurBitboard),
+    "compact": (PlateauCompact, JoueurCompact),
+    "creux": (PlateauCreux, JoueurCreux),
+}
+
+# Place aléatoirement la flotte d'un plateau (standard, ou proportionnée à sa surface)
+def placer_flotte(plateau):
+    plateau.placer_flotte_aleatoire(creer_flotte(plateau.taille))
+
+# Graine d'une partie, déduite de la graine maîtresse et de l'indice de la partie
+# (indépendante du découpage en lots et du nombre de processus)
+def graine_partie(graine, indice):
+    empreinte = hashlib.blake2b(f"{graine}:{indice}".encode(), digest_size=8).digest()
+    return int.from_bytes(empreinte, "big")
+
+# Joue une partie complète et renvoie (indice du gagnant, nombre de tirs du gagnant) ;
+# si un écrivain est fourni, la partie y est enregistrée avec sa graine. Les IA partagent la
+# table de transposition fournie, qui peut servir d'une partie à l'autre. Si chronos (un histogramme
+# par joueur, voir instrumentation.Histogramme) est fourni, la durée de chaque choix de tir y est notée ;
+# si analytique (voir analytique.Analytique) est fourni, chaque tir et la fin de partie lui sont transmis
+def jouer_partie(niveau_a, niveau_b, moteur="bitboard", premier=0, rng=None, ecrivain=None, graine=0, table=None,
+                 taille=10, chronos=None, analytique=None):
+    classe_plateau, classe_joueur = MOTEURS[moteur]
+    joueurs = [classe_joueur("A", classe_plateau(taille, rng)), classe_joueur("B", classe_plateau(taille, rng))]
+    for joueur in joueurs:
+        placer_flotte(joueur.plateau)
+    ias = [creer_ia(niveau_a, joueurs[0], rng, table), creer_ia(niveau_b, joueurs[1], rng, table)]
+    enregistreur = EnregistreurPartie(graine, joueurs) if ecrivain is not None else None
+
+    tour = premier
+    while True:
+        tireur, cible, ia = joueurs[tour], joueurs[1 - tour], ias[tour]
+        if chronos is None and analytique is None:
+            coordonnees = ia.choisir_tir()
+        else:
+            debut = time.perf_counter()
+            coordonnees = ia.choisir_tir()
+            duree = time.perf_counter() - debut
+            if chronos is not None:
+                chronos[tour].observer(duree)
+        resultat = tireur.jouer(coordonnees, cible.plateau)
+        ia.observer(coordonnees, resultat)
+        if enregistreur is not None:
+            enregistreur.tir(tour, coordonnees, resultat)
+        if analytique is not None:
+            analytique.tir(tour, coordonnees, resultat, tireur.tirs_reussis + tireur.tirs_rates, duree)
+        if cible.plateau.tous_coules():
+            if enregistreur is not None:
+                ecrivain.ecrire(enregistreur.partie)
+            if analytique is not None:
+                analytique.fin_partie(tour, joueurs)
+            return tour, len(tireur.tirs_effectues)
+        tour = 1 - tour
+
+# Statistiques agrégées d'une série de parties
+class Statistiques:
+    def __init__(self):
+        self.parties = 0  # Nombre de parties jouées
+        self.victoires = [0, 0]  # Victoires de chaque joueur
+        self.tirs_pour_gagner = Counter()  # Distribution du nombre de tirs du gagnant
+        self.duree = 0.0  # Temps total de simulation en secondes
+        self.transposition = Counter()  # Succès et échecs de la table de transposition
+
+    # Enregistre le résultat d'une partie
+    def ajouter(self, gagnant, tirs):
+        self.parties += 1
+        self.victoires[gagnant] += 1
+        self.tirs_pour_gagner[tirs] += 1
+
+    # Ajoute les résultats d'une autre série de parties
+    def fusionner(self, autre):
+        self.parties += autre.parties
+        self.victoires[0] += autre.victoires[0]
+        self.victoires[1] += autre.victoires[1]
+        self.tirs_pour_gagner.update(autre.tirs_pour_gagner)
+        self.duree += autre.duree
+        self.transposition.update(autre.transposition)
+
+    # Nombre de parties simulées par seconde
+    def parties_par_seconde(self):
+        return self.parties / self.duree if self.duree else 0.0
+
+    # Taux de victoire de chaque joueur
+    def taux_victoire(self):
+        if not self.parties:
+            return [0.0, 0.0]
+        return [v / self.parties for v in self.victoires]
+
+    # Nombre moyen de tirs nécessaires pour gagner
+    def tirs_moyens(self):
+        if not self.parties:
+            return 0.0
+        return sum(tirs * n for tirs, n in self.tirs_pour_gagner.items()) / self.parties
+
+    # Quantile de la distribution des tirs pour gagner (q entre 0 et 1)
+    def quantile_tirs(self, q):
+        if not self.parties:
+            return 0
+        rang = q * (self.parties - 1)
+        cumul = 0
+        for tirs in sorted(self.tirs_pour_gagner):
+            cumul += self.tirs_pour_gagner[tirs]
+            if cumul > rang:
+                return tirs
+        return max(self.tirs_pour_gagner)
+
+    # Résumé des statistiques sous forme de dictionnaire
+    def resume(self):
+        return {
+            "parties": self.parties,
+            "parties_par_seconde": self.parties_par_seconde(),
+            "taux_victoire": self.taux_victoire(),
+            "tirs_moyens": self.tirs_moyens(),
+            "tirs_mediane": self.quantile_tirs(0.5),
+            "tirs_p10": self.quantile_tirs(0.1),
+            "tirs_p90": self.quantile_tirs(0.9),
+            "tirs_pour_gagner": dict(sorted(self.tirs_pour_gagner.items())),
+        }
+
+# Simule les parties d'indices debut à fin - 1, chacune avec son propre random.Random ; avec
+# transposition > 0, les parties du lot partagent une table de transposition de cette capacité
+def simuler_lot(niveau_a, niveau_b, moteur, graine, debut, fin, ecrivain=None, transposition=0, taille=10,
+                analytique=None):
+    stats = Statistiques()
+    table = TableTransposition(transposition) if transposition else None
+    chrono = time.perf_counter()
+    for i in range(debut, fin):
+        graine_i = graine_partie(graine, i)
+        gagnant, tirs = jouer_partie(niveau_a, niveau_b, moteur, premier=i % 2, rng=random.Random(graine_i),
+                                     ecrivain=ecrivain, graine=graine_i, table=table, taille=taille,
+                                     analytique=analytique)
+        stats.ajouter(gagnant, tirs)
+    stats.duree = time.perf_counter() - chrono
+    if table is not None:
+        stats.transposition.update(succes=table.succes, echecs=table.echecs)
+    return stats
+
+# Point d'entrée des processus de travail (les arguments arrivent sous forme de tuple) ; renvoie
+# les statistiques du lot, ses parties encodées (sans en-tête de fichier) si demandé et ses agrégats
+# (voir analytique.Agregats) si demandé
+def _simuler_lot(arguments):
+    *arguments, transposition, taille, enregistrer, analyser = arguments
+    analytique = None
+    if analyser:
+        from analytique import Analytique
+        analytique = Analytique(taille)
+    tampon = io.BytesIO() if enregistrer else None
+    ecrivain = EcrivainParties(tampon, entete=False) if enregistrer else None
+    stats = simuler_lot(*arguments, ecrivain=ecrivain, transposition=transposition, taille=taille,
+                        analytique=analytique)
+    if analytique is not None:
+        analytique.fermer()
+    return stats, tampon.getvalue() if enregistrer else b"", analytique.agregats if analyser else None
+
+# Simule n parties en alternant le joueur qui commence ; les parties sont ajoutées au fichier
+# binaire sortie s'il est fourni, les tirs transmis à analytique s'il est fourni. Les parties sont
+# jouées par lots de taille_lot comme dans simuler_parallele (une table de transposition par lot) :
+# pour une graine donnée, résultats et statistiques de la table ne dépendent pas du nombre de processus
+def simuler(n, niveau_a="Facile", niveau_b="Difficile", moteur="bitboard", graine=None, sortie=None,
+            transposition=0, taille=10, analytique=None, taille_lot=500):
+    if graine is None:
+        graine = random.getrandbits(64)
+    stats = Statistiques()
+    with contextlib.ExitStack() as fichiers:
+        ecrivain = EcrivainParties(fichiers.enter_context(open(sortie, "ab"))) if sortie is not None else None
+        for debut in range(0, n, taille_lot):
+            stats.fusionner(simuler_lot(niveau_a, niveau_b, moteur, graine, debut, min(debut + taille_lot, n),
+                                        ecrivain, transposition, taille, analytique))
+    return stats
+
+# Simule n parties réparties par lots sur un groupe de processus ; les résultats sont fusionnés
+# au fil de l'eau et, pour une graine donnée, ne dépendent pas du nombre de processus ; chaque lot
+# agrège ses tirs de son côté et ses agrégats sont fusionnés dans analytique s'il est fourni
+def simuler_parallele(n, niveau_a="Facile", niveau_b="Difficile", moteur="bitboard", graine=None,
+                      processus=None, taille_lot=500, sortie=None, transposition=0, taille=10, analytique=None):
+    if graine is None:
+        graine = random.getrandbits(64)
+    lots = [(niveau_a, niveau_b, moteur, graine, debut, min(debut + taille_lot, n), transposition, taille,
+             sortie is not None, analytique is not None)
+            for debut in range(0, n, taille_lot)]
+
+    stats = Statistiques()
+    chrono = time.perf_counter()
+    if analytique is not None:
+        analytique.attendre_pret()  # NumPy ne doit pas être en cours d'import quand les processus sont créés
+    with multiprocessing.Pool(processus) as pool, contextlib.ExitStack() as fichiers:
+        ecrivain = EcrivainParties(fichiers.enter_context(open(sortie, "ab"))) if sortie is not None else None
+        for resultat, parties, agregats in pool.imap_unordered(_simuler_lot, lots):
+            stats.fusionner(resultat)
+            if ecrivain is not None:
+                ecrivain.ecrire_enregistrements(parties)
+            if analytique is not None:
+                analytique.fusionner(agregats)
+    stats.duree = time.perf_counter() - chrono  # Temps réel écoulé, pas la somme des temps des lots
+    return stats
+
+# Affiche un résumé lisible des statistiques
+def afficher(stats, niveau_a, niveau_b):
+    resume = stats.resume()
+    print(f"{resume['parties']} parties en {stats.duree:.2f}s ({resume['parties_par_seconde']:.0f} parties/s)")
+    print(f"Victoires {niveau_a} (A): {resume['taux_victoire'][0]:.1%}")
+    print(f"Victoires {niveau_b} (B): {resume['taux_victoire'][1]:.1%}")
+    print(f"Tirs pour gagner: moyenne {resume['tirs_moyens']:.1f}, "
+          f"p10 {resume['tirs_p10']}, médiane {resume['tirs_mediane']}, p90 {resume['tirs_p90']}")
+    recherches = stats.transposition["succes"] + stats.transposition["echecs"]
+    if recherches:
+        print(f"Table de transposition: {stats.transposition['succes'] / recherches:.1%} de succès "
+              f"sur {recherches} recherches")
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Simulation de parties ordinateur contre ordinateur")
+    parser.add_argument("-n", "--parties", type=int, default=1000, help="nombre de parties à simuler")
+    parser.add_argument("-a", "--ia-a", choices=sorted(NIVEAUX), default="Facile", help="niveau du joueur A")
+    parser.add_argument("-b", "--ia-b", choices=sorted(NIVEAUX), default="Difficile", help="niveau du joueur B")
+    parser.add_argument("--moteur", choices=sorted(MOTEURS), default="bitboard", help="représentation du plateau")
+    parser.add_argument("--graine", type=int, default=None, help="graine maîtresse (résultats reproductibles)")
+    parser.add_argument("-p", "--processus", type=int, default=1,
+                        help="nombre de processus (0 = tous les cœurs, 1 = sans parallélisme)")
+    parser.add_argument("--taille-lot", type=int, default=500,
+                        help="nombre de parties par lot (chaque lot a sa table de transposition)")
+    parser.add_argument("--enregistrer", metavar="FICHIER", default=None, help="ajoute les parties à ce fichier")
+    parser.add_argument("--transposition", type=int, default=0, metavar="CAPACITE",
+                        help="table de transposition partagée par les parties d'un lot (0 = aucune)")
+    parser.add_argument("--taille", type=int, default=10,
+                        help="côté du plateau (flotte répétée au-delà de 100x100, moteur creux conseillé)")
+    parser.add_argument("--analytique", metavar="FICHIER", default=None,
+                        help="cumule cartes de chaleur et statistiques de tirs dans ce fichier (.npz)")
+    args = parser.parse_args(arguments)
+
+    analytique = None
+    if args.analytique:
+        from analytique import Analytique
+        analytique = Analytique(args.taille, args.analytique)
+    try:
+        if args.processus == 1:
+            stats = simuler(args.parties, args.ia_a, args.ia_b, args.moteur, args.graine, args.enregistrer,
+                            args.transposition, args.taille, analytique, args.taille_lot)
+        else:
+            stats = simuler_parallele(args.parties, args.ia_a, args.ia_b, args.moteur, args.graine,
+                                      args.processus or None, args.taille_lot, args.enregistrer, args.transposition,
+                                      args.taille, analytique)
+    finally:
+        if analytique is not None:
+            analytique.fermer()
+    afficher(stats, args.ia_a, args.ia_b)
+
+# Point d'entrée pour lancer une simulation en ligne de commande
+if __name__ == "__main__":
+    main()
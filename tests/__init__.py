@@ -0,0 +1 @@
+# Tests de la bataille navale (lancés avec python -m pytest depuis la racine du dépôt)
@@ -0,0 +1,92 @@
+# Agrégats de parties : accumulation par le fil d'arrière-plan, fusion, sauvegarde sur disque et
+# mêmes totaux qu'on simule dans un seul processus ou par lots répartis
+import numpy as np
+import pytest
+
+from analytique import RANG_MAX, TYPES_NAVIRES, Agregats, Analytique
+from moteur import Joueur
+from simulation import simuler, simuler_parallele
+
+# Joueur réduit à ses compteurs de tirs, seuls lus par fin_partie
+def joueur(reussis, rates):
+    resultat = Joueur("J")
+    resultat.tirs_reussis, resultat.tirs_rates = reussis, rates
+    return resultat
+
+# Deux tirs, un coulé et une fin de partie, relus dans l'instantané
+def alimenter(analytique):
+    analytique.tir(0, (1, 2), "Manqué", 1, 0.5)
+    analytique.tir(1, (1, 2), "Touché", 1)
+    analytique.tir(1, (1, 3), "Coulé: Destroyer", 2, 3.0)
+    analytique.fin_partie(1, [joueur(0, 1), joueur(2, 0)])
+
+# Les événements déposés se retrouvent dans les agrégats
+def test_instantane():
+    analytique = Analytique(taille=5)
+    alimenter(analytique)
+    resume = analytique.instantane()
+    analytique.fermer()
+    assert resume["parties"] == 1 and resume["victoires"] == [0, 1]
+    assert resume["tirs"] == 3 and resume["touches"] == 2
+    assert resume["carte_tirs"][1][2] == 2 and resume["carte_touches"][1][3] == 1
+    assert resume["tirs_pour_couler"]["Destroyer"]["nombre"] == 1
+    assert [duree["nombre"] for duree in resume["duree_coup"]] == [1, 1]
+    assert resume["taux_reussite"][1]["p50"] == 100 and resume["taux_reussite"][0]["p90"] == 0
+
+# fusionner additionne tous les tableaux, directement ou à travers le fil d'agrégation
+def test_fusionner():
+    source = Analytique(taille=5)
+    alimenter(source)
+    source.fermer()
+    analytique = Analytique(taille=5)
+    alimenter(analytique)
+    analytique.fusionner(source.agregats)
+    double = analytique.instantane()
+    analytique.fermer()
+    assert double["parties"] == 2 and double["tirs"] == 6
+    assert double["carte_tirs"][1][2] == 4
+
+    agregats = Agregats(5)
+    agregats.fusionner(source.agregats)
+    agregats.fusionner(source.agregats)
+    assert (agregats.coules == 2 * source.agregats.coules).all()
+    assert agregats.coules[TYPES_NAVIRES.index("Destroyer"), 2] == 2
+    with pytest.raises(ValueError):
+        agregats.fusionner(Agregats(10))
+
+# Les agrégats écrits à la fermeture sont repris par l'instance suivante ; un fichier illisible
+# donne des agrégats vides
+def test_fichier(tmp_path):
+    chemin = str(tmp_path / "agregats.npz")
+    analytique = Analytique(taille=5, chemin=chemin)
+    alimenter(analytique)
+    analytique.fermer()
+    relu = Agregats.charger(chemin)
+    assert relu.parties == 1 and int(relu.tirs.sum()) == 3
+    assert relu.coules.shape == (len(TYPES_NAVIRES), RANG_MAX + 1)
+
+    reprise = Analytique(taille=5, chemin=chemin)
+    alimenter(reprise)
+    assert reprise.instantane()["parties"] == 2
+    reprise.fermer()
+
+    with open(chemin, "wb") as fichier:
+        fichier.write(b"pas un fichier npz")
+    corrompu = Analytique(taille=5, chemin=chemin)
+    assert corrompu.attendre_pret(5)
+    assert corrompu.instantane()["parties"] == 0
+    corrompu.fermer()
+
+# Les agrégats fusionnés des lots parallèles sont ceux d'une simulation dans un seul processus
+def test_simulation_parallele():
+    totaux = []
+    for simulateur, options in ((simuler, {}), (simuler_parallele, {"processus": 2})):
+        analytique = Analytique()
+        simulateur(40, "Facile", "Difficile", graine=5, analytique=analytique, taille_lot=15, **options)
+        analytique.synchroniser()
+        analytique.fermer()
+        totaux.append(analytique.agregats)
+    sequentiel, parallele = totaux
+    assert sequentiel.parties == parallele.parties == 40
+    for nom in ("tirs", "touches", "coules", "taux", "victoires"):
+        assert np.array_equal(getattr(sequentiel, nom), getattr(parallele, nom)), nom
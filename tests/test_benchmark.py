@@ -0,0 +1,50 @@
+# Banc d'essai : la référence JSON enregistrée couvre tous les bancs, le temps médian des passes est
+# retenu, et un ralentissement au-delà du seuil et du plancher est signalé comme régression
+import json
+import os
+
+import benchmark
+from simulation import MOTEURS
+
+REFERENCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmark_reference.json")
+
+# La référence du dépôt a un temps pour chaque banc
+def test_reference_complete():
+    with open(REFERENCE) as fichier:
+        reference = json.load(fichier)
+    assert reference["graine"] == benchmark.GRAINE and reference["passes"] > 1
+    assert set(reference["resultats"]) == set(benchmark.tous_les_bancs(sorted(MOTEURS)))
+    assert all(duree > 0 for duree in reference["resultats"].values())
+
+# Seuls les bancs ralentis au-delà du seuil sont signalés
+def test_comparer():
+    reference = {"resultats": {"a": 1.0, "b": 1.0, "c": 1.0}}
+    resultats = {"resultats": {"a": 1.2, "b": 1.3, "c": 0.5, "d": 9.0}}
+    assert benchmark.comparer(resultats, reference, seuil=0.25, plancher=0) == ["b"]
+
+# Sous la microseconde, un écart inférieur au plancher n'est pas une régression
+def test_comparer_plancher():
+    reference = {"resultats": {"court": 0.2, "long": 10.0}}
+    resultats = {"resultats": {"court": 0.28, "long": 13.0}}
+    assert benchmark.comparer(resultats, reference, seuil=0.25, plancher=0.1) == ["long"]
+    resultats["resultats"]["court"] = 0.35
+    assert benchmark.comparer(resultats, reference, seuil=0.25, plancher=0.1) == ["court", "long"]
+
+# Chaque banc garde la médiane de ses passes : une passe perturbée ne compte pas
+def test_executer_mediane(monkeypatch):
+    mesures = iter([5.0, 1.0, 1.2, 9.0, 1.1, 1.3])
+    monkeypatch.setattr(benchmark, "mesurer", lambda *arguments: next(mesures))
+    resultats = benchmark.executer({"a": None, "b": None}, afficher=False, passes=3)
+    assert resultats["passes"] == 3
+    assert resultats["resultats"] == {"a": 1.2, "b": 1.3}
+
+# Le code de sortie vaut 1 en cas de régression par rapport au fichier de référence
+def test_main_regression(tmp_path):
+    chemin = tmp_path / "reference.json"
+    resultats = {"graine": benchmark.GRAINE, "resultats": {"bitboard.a_perdu": 1e-6}}
+    chemin.write_text(json.dumps(resultats))
+    arguments = ["-m", "bitboard", "-f", "a_perdu", "-r", "1", "-p", "1", "--duree-min", "0.001", "--plancher", "0"]
+    assert benchmark.main(arguments + ["--comparer", str(chemin)]) == 1
+    resultats["resultats"]["bitboard.a_perdu"] = 1e6
+    chemin.write_text(json.dumps(resultats))
+    assert benchmark.main(arguments + ["--comparer", str(chemin)]) == 0
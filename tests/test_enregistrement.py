@@ -0,0 +1,118 @@
+# Enregistrement des parties : écriture, relecture du fichier et reconstruction à l'identique
+import random
+
+import pytest
+
+from enregistrement import (MAGIE, EcrivainParties, PartieEnregistree, ecrire_varint, lire_enregistrements,
+                            lire_parties, lire_varint)
+from simulation import graine_partie, jouer_partie, simuler
+
+# Écrivain qui garde en mémoire les parties qu'on lui confie
+class Collecteur:
+    def __init__(self):
+        self.parties = []
+
+    # Garde une partie
+    def ecrire(self, partie):
+        self.parties.append(partie)
+
+# Les varints relisent exactement les entiers écrits
+def test_varint():
+    tampon = bytearray()
+    valeurs = [0, 1, 127, 128, 300, 2**32, 2**64 - 1]
+    for valeur in valeurs:
+        ecrire_varint(tampon, valeur)
+    position = 0
+    for valeur in valeurs:
+        lue, position = lire_varint(tampon, position)
+        assert lue == valeur
+    assert position == len(tampon)
+
+# Des parties écrites dans un fichier sont relues et rejouées à l'identique
+@pytest.mark.parametrize("moteur", ["liste", "bitboard", "creux"])
+def test_aller_retour_fichier(tmp_path, moteur):
+    chemin = tmp_path / "parties.bnav"
+    collecteur = Collecteur()
+    with open(chemin, "wb") as fichier:
+        ecrivain = EcrivainParties(fichier)
+        for indice in range(5):
+            graine = graine_partie(11, indice)
+            jouer_partie("Facile", "Difficile", moteur, rng=random.Random(graine), ecrivain=collecteur, graine=graine)
+            ecrivain.ecrire(collecteur.parties[-1])
+
+    relues = list(lire_parties(str(chemin)))
+    assert len(relues) == 5
+    for originale, relue in zip(collecteur.parties, relues):
+        assert relue.graine == originale.graine and relue.taille == originale.taille
+        assert relue.flottes == originale.flottes
+        assert relue.tirs == originale.tirs
+        joueurs = relue.reconstruire()
+        gagnant = relue.gagnant()
+        assert gagnant is not None and all(navire.est_coule() for navire in joueurs[1 - gagnant].plateau.navires)
+        assert [len(joueur.tirs_effectues) for joueur in joueurs] == [relue.nb_tirs(0), relue.nb_tirs(1)]
+
+# Une relecture partielle s'arrête au tir demandé
+def test_reconstruction_partielle():
+    collecteur = Collecteur()
+    jouer_partie("Facile", "Difficile", rng=random.Random(5), ecrivain=collecteur)
+    partie = collecteur.parties[0]
+    joueurs = partie.reconstruire(10)
+    assert len(joueurs[0].tirs_effectues) + len(joueurs[1].tirs_effectues) == 10
+    assert partie.reconstruire(0)[0].tirs_effectues == []
+
+# Le fichier écrit par simuler contient une partie par simulation, avec sa graine, et se filtre à la lecture
+def test_simuler_enregistre(tmp_path):
+    chemin = tmp_path / "simulation.bnav"
+    stats = simuler(8, "Facile", "Difficile", graine=4, sortie=str(chemin))
+    parties = list(lire_parties(str(chemin)))
+    assert len(parties) == stats.parties == 8
+    assert [partie.graine for partie in parties] == [graine_partie(4, i) for i in range(8)]
+    assert sorted(partie.gagnant() for partie in parties) == sorted(
+        gagnant for gagnant, victoires in enumerate(stats.victoires) for _ in range(victoires))
+    gagnees = [partie for partie in parties if partie.gagnant() == 1]
+    assert list(lire_parties(str(chemin), lambda partie: partie.gagnant() == 1))[0].tirs == gagnees[0].tirs
+
+# Un fichier sans partie se lit comme vide ; un fichier étranger est refusé
+def test_fichiers_particuliers(tmp_path):
+    vide = tmp_path / "vide.bnav"
+    vide.write_bytes(MAGIE)
+    assert list(lire_enregistrements(str(vide))) == []
+    etranger = tmp_path / "etranger.bnav"
+    etranger.write_bytes(b"PK\x03\x04 pas des parties")
+    with pytest.raises(ValueError):
+        list(lire_enregistrements(str(etranger)))
+
+# Une partie relue qui ne correspond plus à ses flottes est refusée
+def test_relecture_incoherente():
+    collecteur = Collecteur()
+    jouer_partie("Facile", "Difficile", rng=random.Random(6), ecrivain=collecteur)
+    partie = collecteur.parties[0]
+    tireur, coordonnees, code = partie.tirs[0]
+    tirs = [(tireur, coordonnees, 1 if code == 0 else 0)] + partie.tirs[1:]
+    with pytest.raises(ValueError):
+        PartieEnregistree(partie.graine, partie.taille, partie.flottes, tirs).reconstruire()
+
+# Un fichier coupé au milieu d'un enregistrement livre les parties complètes puis lève ValueError
+def test_fichier_tronque(tmp_path):
+    complet = tmp_path / "complet.bnav"
+    simuler(3, "Facile", "Difficile", graine=8, sortie=str(complet))
+    donnees = complet.read_bytes()
+    corps = list(lire_enregistrements(str(complet)))
+    debut_derniere = len(donnees) - len(corps[-1]) - 1  # Dernier octet de la longueur du dernier enregistrement
+    for coupure in range(debut_derniere, len(donnees)):
+        tronque = tmp_path / f"tronque{coupure}.bnav"
+        tronque.write_bytes(donnees[:coupure])
+        lues = []
+        with pytest.raises(ValueError, match="tronqué"):
+            for partie in lire_parties(str(tronque)):
+                lues.append(partie)
+        assert len(lues) == 2
+
+# Un corps d'enregistrement coupé est refusé avec ValueError
+def test_corps_tronque():
+    collecteur = Collecteur()
+    jouer_partie("Facile", "Difficile", rng=random.Random(9), ecrivain=collecteur)
+    corps = collecteur.parties[0].encoder()
+    for coupure in (0, 1, len(corps) // 2, len(corps) - 1):
+        with pytest.raises(ValueError, match="tronqué"):
+            PartieEnregistree.decoder(corps[:coupure])
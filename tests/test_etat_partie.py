@@ -0,0 +1,108 @@
+# États de partie : tirs, annulation et rétablissement, sauvegarde et chargement
+import random
+
+import pytest
+
+from etat_partie import EtatPartie, Historique, mesurer
+from moteur import flotte_plateau
+from placement import generer_flotte
+
+# État initial avec deux flottes tirées de la graine, et les cases du plateau dans un ordre aléatoire
+def depart(graine, taille=10):
+    rng = random.Random(graine)
+    flotte = flotte_plateau(taille)
+    flottes = [list(zip([nom for nom, _ in flotte], generer_flotte(taille, [l for _, l in flotte], rng)))
+               for _ in range(2)]
+    cases = [(x, y) for x in range(taille) for y in range(taille)]
+    rng.shuffle(cases)
+    return EtatPartie.initial(taille, flottes), cases
+
+# Les deux joueurs visent à tour de rôle les cases données, dans l'ordre, jusqu'à la victoire ou n tirs
+def jouer(historique, cases, n=None):
+    for indice in range(2 * len(cases)):
+        if historique.etat.gagnant() is not None or indice == n:
+            break
+        historique.jouer(indice % 2, cases[indice // 2])
+
+# Chaque tir donne le même résultat que le moteur rejoué depuis les flottes
+def test_resultats_identiques_au_moteur():
+    etat, cases = depart(0)
+    historique = Historique(etat)
+    jouer(historique, cases)
+    joueurs = historique.etat.reconstruire()
+    assert historique.etat.gagnant() is not None
+    assert [joueur.tirs_reussis for joueur in joueurs] == [
+        sum(etat.code != 0 for etat in historique.etat.etats() if etat.tireur == joueur) for joueur in (0, 1)]
+    assert joueurs[1 - historique.etat.gagnant()].a_perdu()
+
+# Annuler puis rétablir revient exactement aux mêmes états ; jouer efface les tirs à rétablir
+def test_annuler_retablir():
+    etat, cases = depart(1)
+    historique = Historique(etat)
+    jouer(historique, cases, 30)
+    etats = [etat] + historique.etat.etats()
+    assert historique.etat.profondeur == 30
+
+    for profondeur in range(29, -1, -1):
+        assert historique.annuler()
+        assert historique.etat is etats[profondeur]
+    assert not historique.annuler()
+    for profondeur in range(1, 31):
+        assert historique.retablir()
+        assert historique.etat is etats[profondeur]
+    assert not historique.retablir()
+
+    for _ in range(5):
+        historique.annuler()
+    historique.jouer(historique.etat.tireur ^ 1, next(c for c in cases if not historique.etat.deja_vise(1, c)))
+    assert not historique.a_retablir and not historique.retablir()
+
+# Un état annulé reste utilisable : les états sont immuables et partagent leur structure
+def test_etats_immuables():
+    etat, cases = depart(2)
+    premier, resultat = etat.jouer(0, cases[0])
+    second, _ = premier.jouer(1, cases[0])
+    autre, _ = premier.jouer(1, cases[1])
+    assert premier.resultat() == resultat and second.parent is premier and autre.parent is premier
+    assert second.flottes is etat.flottes
+    assert premier.deja_vise(0, cases[0]) and not premier.deja_vise(1, cases[0])
+    assert etat.profondeur == 0 and not etat.deja_vise(0, cases[0])
+    with pytest.raises(ValueError):
+        premier.jouer(0, cases[0])
+    with pytest.raises(ValueError):
+        etat.jouer(0, (10, 0))
+
+# Une sauvegarde rechargée redonne le même état, tirs et résultats compris
+@pytest.mark.parametrize("tirs", [0, 1, 17, None])
+def test_sauvegarder_charger(tirs):
+    etat, cases = depart(3)
+    historique = Historique(etat)
+    jouer(historique, cases, tirs)
+    donnees = historique.etat.sauvegarder()
+    charge = EtatPartie.charger(donnees)
+    assert charge.historique() == historique.etat.historique()
+    assert charge.flottes.navires == historique.etat.flottes.navires
+    assert (charge.tirs, charge.coules, charge.gagnant()) == (historique.etat.tirs, historique.etat.coules,
+                                                             historique.etat.gagnant())
+    assert [e.resultat() for e in charge.etats()] == [e.resultat() for e in historique.etat.etats()]
+    assert charge.sauvegarder() == donnees
+
+# Une sauvegarde étrangère ou dont les tirs ne correspondent plus aux flottes est refusée
+def test_sauvegarde_invalide():
+    etat, cases = depart(4)
+    historique = Historique(etat)
+    jouer(historique, cases, 20)
+    with pytest.raises(ValueError):
+        EtatPartie.charger(b"BNAV\x01" + historique.etat.partie().encoder())
+    partie = historique.etat.partie()
+    tireur, coordonnees, code = partie.tirs[0]
+    partie.tirs[0] = (tireur, coordonnees, 1 if code == 0 else 0)
+    with pytest.raises(ValueError):
+        EtatPartie.charger(b"BNSV\x01" + partie.encoder())
+
+# La mesure des instantanés renvoie des durées positives et une sauvegarde d'un à deux octets par tir
+def test_mesurer():
+    resultats = mesurer(tirs=20, repetitions=10)
+    assert set(resultats) == {"copie_profonde_us", "instantane_us", "tir_us", "annulation_us", "sauvegarde_octets"}
+    assert all(valeur >= 0 for valeur in resultats.values())
+    assert 40 <= resultats["sauvegarde_octets"] - len(b"BNSV\x01") <= 200
@@ -0,0 +1,78 @@
+# IA probabiliste : la carte de chaleur tenue à jour tir après tir doit rester égale à celle qu'on
+# recalcule de zéro, et le choix en mode chasse doit viser la case la plus dense
+import random
+
+import pytest
+
+from ia import COULEE, MANQUEE, IAProbabiliste
+from modele_adversaire import ModeleAdversaire
+from moteur import JoueurBitboard, Navire, PlateauBitboard
+from placement import generer_flotte
+from transposition import TableTransposition
+
+# Densité recalculée de zéro à partir des états observés : placements ne traversant ni tir manqué
+# ni navire coulé, pondérés par leur poids a priori et par les navires restants de leur longueur
+def densite_de_zero(ia):
+    densite = [0] * (ia.taille * ia.taille)
+    for longueur in ia.longueurs:
+        for indice, cases in enumerate(ia.placements[longueur]):
+            if any(ia.etats[case] in (MANQUEE, COULEE) for case in cases):
+                assert not ia.valides[longueur][indice]
+                continue
+            assert ia.valides[longueur][indice]
+            poids = ia.poids[longueur][indice] if ia.poids is not None else 1
+            for case in cases:
+                densite[case] += ia.restants[longueur] * poids
+    return densite
+
+# Partie d'une IA probabiliste contre une flotte tirée de la graine ; la carte est vérifiée après
+# chaque tir
+def verifier_partie(graine, a_priori=None):
+    rng = random.Random(graine)
+    cible = PlateauBitboard(10)
+    for positions in generer_flotte(10, [5, 4, 3, 3, 2], rng):
+        cible.placer_navire(Navire(f"Navire {len(cible.navires)}", len(positions)), positions)
+    attaquant = JoueurBitboard("A", PlateauBitboard(10))
+    flotte = [(navire.nom, navire.taille) for navire in cible.navires]
+    ia = IAProbabiliste(attaquant, rng, flotte=flotte, a_priori=a_priori)
+    while not cible.tous_coules():
+        if not ia.touches_non_resolues:
+            case = ia.choisir_chasse()
+            libres = [c for c in range(100) if not ia.tire[c]]
+            assert ia.densite[case] == max(ia.densite[c] for c in libres)
+        coordonnees = ia.choisir_tir()
+        ia.observer(coordonnees, attaquant.jouer(coordonnees, cible))
+        assert ia.densite == densite_de_zero(ia)
+    assert not any(ia.restants.values())
+
+# La carte incrémentale reste exacte tout au long de parties complètes
+@pytest.mark.parametrize("graine", range(5))
+def test_carte_incrementale(graine):
+    verifier_partie(graine)
+
+# Idem avec des poids a priori issus d'un modèle d'adversaire
+def test_carte_incrementale_a_priori():
+    modele = ModeleAdversaire()
+    for graine in range(3):
+        plateau = PlateauBitboard(10, random.Random(graine))
+        plateau.placer_flotte_aleatoire([Navire("Navire", longueur) for longueur in (5, 4, 3, 3, 2)])
+        modele.observer_flotte(plateau.navires)
+    verifier_partie(10, modele)
+
+# La table de transposition ne change aucun choix : même partie avec ou sans
+def test_table_sans_effet_sur_les_choix():
+    table = TableTransposition()
+    parties = []
+    for avec_table in (False, True, True):
+        rng = random.Random(3)
+        cible = PlateauBitboard(10, rng)
+        cible.placer_flotte_aleatoire([Navire("Navire", longueur) for longueur in (5, 4, 3, 3, 2)])
+        attaquant = JoueurBitboard("A", PlateauBitboard(10))
+        ia = IAProbabiliste(attaquant, rng, flotte=[("Navire", l) for l in (5, 4, 3, 3, 2)],
+                            table=table if avec_table else None)
+        while not cible.tous_coules():
+            coordonnees = ia.choisir_tir()
+            ia.observer(coordonnees, attaquant.jouer(coordonnees, cible))
+        parties.append(attaquant.tirs_effectues)
+    assert parties[0] == parties[1] == parties[2]
+    assert table.succes > 0
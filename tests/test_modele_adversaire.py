@@ -0,0 +1,73 @@
+# Modèle d'adversaire : format du fichier, fréquences apprises et gain de l'ordinateur contre un
+# joueur habitué
+import random
+import struct
+
+import pytest
+
+from modele_adversaire import ENTETE, MAGIE, ModeleAdversaire, flotte_habituelle, mesurer
+from moteur import Navire, flotte_plateau
+from placement import generer_flotte
+
+# Navires du moteur placés selon une flotte tirée de la graine
+def navires(graine):
+    flotte = flotte_plateau(10)
+    resultat = []
+    for (nom, longueur), positions in zip(flotte, generer_flotte(10, [l for _, l in flotte], random.Random(graine))):
+        navire = Navire(nom, longueur)
+        navire.positions = positions
+        resultat.append(navire)
+    return resultat
+
+# Modèle ayant observé quelques flottes
+def modele_entraine():
+    modele = ModeleAdversaire()
+    for graine in range(5):
+        modele.observer_flotte(navires(graine % 2))
+    return modele
+
+# Un modèle encodé puis décodé est identique, et se relit depuis un fichier
+def test_aller_retour(tmp_path):
+    modele = modele_entraine()
+    relu = ModeleAdversaire.decoder(modele.encoder())
+    assert (relu.taille, relu.longueurs, list(relu.valeurs)) == (modele.taille, modele.longueurs, list(modele.valeurs))
+    assert relu.poids_placements(5) == modele.poids_placements(5)
+    chemin = str(tmp_path / "adversaire.bnad")
+    modele.sauver(chemin)
+    assert list(ModeleAdversaire.charger(chemin).valeurs) == list(modele.valeurs)
+
+# Un fichier tronqué, trop long, étranger ou d'une autre version est refusé
+def test_fichiers_refuses():
+    donnees = modele_entraine().encoder()
+    for longueur in (0, ENTETE.size - 1, ENTETE.size + 3, len(donnees) - 1):
+        with pytest.raises(ValueError):
+            ModeleAdversaire.decoder(donnees[:longueur])
+    with pytest.raises(ValueError):
+        ModeleAdversaire.decoder(donnees + b"\x00" * 8)
+    with pytest.raises(ValueError):
+        ModeleAdversaire.decoder(b"BNAV\x01" + donnees[5:])
+    with pytest.raises(ValueError):
+        ModeleAdversaire.decoder(MAGIE + struct.pack("<H", 2) + donnees[6:])
+
+# Les cases toujours occupées deviennent habituelles, et leurs placements pèsent davantage
+def test_frequences():
+    modele = ModeleAdversaire()
+    assert modele.poids_placements(3) is None and modele.cases_habituelles() == []
+    flotte = navires(0)
+    for _ in range(10):
+        modele.observer_flotte(flotte)
+    occupees = {x * 10 + y for navire in flotte for x, y in navire.positions}
+    assert set(modele.cases_habituelles()) == occupees
+    frequences = modele.frequences()
+    assert min(frequences[case] for case in occupees) > max(f for case, f in enumerate(frequences) if case not in occupees)
+
+# Un joueur parfaitement fidèle replace toujours sa flotte de base
+def test_flotte_habituelle():
+    base = [(navire.nom, navire.positions) for navire in navires(3)]
+    assert sorted(flotte_habituelle(base, 10, random.Random(0), fidelite=1.0)) == sorted(base)
+
+# Contre un joueur habitué, l'ordinateur coule la flotte en moins de tirs avec le modèle que sans
+def test_gain_contre_joueur_habitue():
+    resultats = mesurer(("Difficile", "Probabiliste"), series=6, parties=8, echauffement=2, graine=0)
+    for niveau, (sans, avec) in resultats.items():
+        assert avec < sans, niveau
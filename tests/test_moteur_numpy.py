@@ -0,0 +1,34 @@
+# Moteur vectorisé : mêmes résultats tir par tir que le moteur scalaire, et même distribution de
+# parties que simulation.py
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import moteur_numpy
+from moteur import FLOTTE
+
+# Les flottes placées en lot sont complètes et sans chevauchement
+def test_placement_lot():
+    lot = moteur_numpy.LotPlateaux(50, rng=np.random.default_rng(0))
+    lot.placer_flottes_aleatoires()
+    for indice, (_, longueur) in enumerate(FLOTTE):
+        assert ((lot.navires == indice + 1).sum(axis=1) == longueur).all()
+
+# Chaque tir d'un lot donne le même résultat que le moteur scalaire rejouant les mêmes tirs
+@pytest.mark.parametrize("niveau", sorted(moteur_numpy.STRATEGIES))
+def test_parite_moteur_scalaire(niveau):
+    assert moteur_numpy.verifier_contre_moteur_scalaire(50, niveau, graine=1) == []
+
+# Taux de victoire et distribution des tirs conformes au simulateur scalaire
+def test_comparer_au_simulateur():
+    vectorise, scalaire, ecarts = moteur_numpy.comparer_au_simulateur(300, graine=2)
+    assert ecarts == []
+    assert vectorise.parties == scalaire.parties == 300
+
+# Distance de Kolmogorov-Smirnov : nulle entre distributions égales, maximale si elles sont disjointes
+def test_distance_ks():
+    a = Counter({40: 2, 50: 2})
+    assert moteur_numpy.distance_ks(a, Counter({40: 1, 50: 1})) == 0
+    assert moteur_numpy.distance_ks(a, Counter({60: 3})) == 1
+    assert moteur_numpy.distance_ks(a, Counter({40: 1, 60: 1})) == pytest.approx(0.5)
@@ -0,0 +1,61 @@
+# Parité des moteurs : pour une même graine, les moteurs liste, bitboard, compact et creux doivent
+# donner exactement la même partie
+import random
+
+import pytest
+
+from ia import creer_ia
+from moteur import Navire, flotte_plateau
+from placement import generer_flotte
+from simulation import MOTEURS, simuler
+
+# Joue une partie sur un moteur : flottes et IA sont tirées de la graine, indépendamment du moteur ;
+# renvoie la suite des (tireur, coordonnées, résultat)
+def partie(moteur, graine, niveaux=("Facile", "Difficile"), taille=10):
+    classe_plateau, classe_joueur = MOTEURS[moteur]
+    rng = random.Random(graine)
+    flotte = flotte_plateau(taille)
+    joueurs = []
+    for nom in ("A", "B"):
+        plateau = classe_plateau(taille)
+        for (nom_navire, longueur), positions in zip(flotte, generer_flotte(taille, [l for _, l in flotte], rng)):
+            plateau.placer_navire(Navire(nom_navire, longueur), positions)
+        joueurs.append(classe_joueur(nom, plateau))
+    ias = [creer_ia(niveau, joueur, random.Random(f"{graine}:{i}")) for i, (niveau, joueur) in enumerate(zip(niveaux, joueurs))]
+
+    tirs = []
+    tour = 0
+    while True:
+        tireur, cible = joueurs[tour], joueurs[1 - tour]
+        coordonnees = ias[tour].choisir_tir()
+        resultat = tireur.jouer(coordonnees, cible.plateau)
+        ias[tour].observer(coordonnees, resultat)
+        tirs.append((tour, coordonnees, resultat))
+        if cible.plateau.tous_coules():
+            assert tireur.tirs_reussis == sum(longueur for _, longueur in flotte)
+            return tirs
+        tour = 1 - tour
+
+# Toutes les parties d'une graine sont identiques d'un moteur à l'autre
+@pytest.mark.parametrize("niveaux", [("Facile", "Difficile"), ("Probabiliste", "Difficile")])
+@pytest.mark.parametrize("graine", range(4))
+def test_parite_parties(niveaux, graine):
+    reference = partie("liste", graine, niveaux)
+    for moteur in MOTEURS:
+        assert partie(moteur, graine, niveaux) == reference, moteur
+
+# Sur un plateau standard, tous les moteurs placent leurs flottes avec placement.generer_flotte et
+# donnent les mêmes statistiques
+def test_parite_simulation():
+    references = simuler(30, "Facile", "Difficile", moteur="liste", graine=7)
+    for moteur in ("bitboard", "compact", "creux"):
+        stats = simuler(30, "Facile", "Difficile", moteur=moteur, graine=7)
+        assert stats.victoires == references.victoires
+        assert stats.tirs_pour_gagner == references.tirs_pour_gagner
+
+# Même graine, même simulation
+@pytest.mark.parametrize("moteur", sorted(MOTEURS))
+def test_simulation_reproductible(moteur):
+    a = simuler(10, "Facile", "Difficile", moteur=moteur, graine=3)
+    b = simuler(10, "Facile", "Difficile", moteur=moteur, graine=3)
+    assert a.victoires == b.victoires and a.tirs_pour_gagner == b.tirs_pour_gagner
@@ -0,0 +1,75 @@
+# Livre d'ouverture et tables de placement : gain du livre, fichiers absents ou corrompus et flottes
+# de l'ordinateur toujours complètes
+import random
+
+import pytest
+
+from ia import IADifficile
+from moteur import JoueurBitboard, PlateauBitboard, Plateau, creer_flotte
+from ouverture import FICHIER, charger_table, placer_flotte_ordinateur, table_ouverture
+from simulation import graine_partie, placer_flotte
+
+# Tirs moyens de l'IA difficile pour couler des flottes uniformes tirées des graines
+def tirs_moyens(ouverture, parties=200, graine=0):
+    total = 0
+    for i in range(parties):
+        rng = random.Random(graine_partie(graine, i))
+        cible = PlateauBitboard(10, rng)
+        placer_flotte(cible)
+        attaquant = JoueurBitboard("A", PlateauBitboard(10, rng))
+        ia = IADifficile(attaquant, rng, ouverture=ouverture)
+        while not cible.tous_coules():
+            coordonnees = ia.choisir_tir()
+            ia.observer(coordonnees, attaquant.jouer(coordonnees, cible))
+        total += len(attaquant.tirs_effectues)
+    return total / parties
+
+# Vérifie qu'un plateau porte une flotte standard complète, sans chevauchement, dans les limites
+def verifier_flotte(plateau):
+    attendus = sorted((navire.nom, navire.taille) for navire in creer_flotte(plateau.taille))
+    assert sorted((navire.nom, len(navire.positions)) for navire in plateau.navires) == attendus
+    cases = [case for navire in plateau.navires for case in navire.positions]
+    assert len(cases) == len(set(cases))
+    assert all(0 <= x < plateau.taille and 0 <= y < plateau.taille for x, y in cases)
+    for navire in plateau.navires:
+        xs, ys = sorted(x for x, _ in navire.positions), sorted(y for _, y in navire.positions)
+        assert (len(set(xs)) == 1 and ys == list(range(ys[0], ys[0] + len(ys)))
+                or len(set(ys)) == 1 and xs == list(range(xs[0], xs[0] + len(xs))))
+
+# Le fichier livré avec le jeu contient le livre et les tables du plateau standard
+def test_fichier_livre():
+    table = table_ouverture(10)
+    assert table is not None and len(table.ouverture) > 0
+    assert sorted(table.poids) == sorted({navire.taille for navire in creer_flotte(10)})
+    assert table_ouverture(7) is None
+
+# Avec le livre, l'IA difficile coule une flotte uniforme en moins de tirs
+def test_livre_reduit_les_tirs():
+    assert tirs_moyens(True) < tirs_moyens(False)
+
+# Un fichier absent, étranger ou tronqué donne None au lieu d'une erreur
+def test_fichiers_absents_ou_corrompus(tmp_path):
+    assert charger_table(str(tmp_path / "absent.bnov")) is None
+    with open(FICHIER, "rb") as fichier:
+        donnees = fichier.read()
+    corrompus = {
+        "vide.bnov": b"",
+        "etranger.bnov": b"PK\x03\x04" + donnees[4:],
+        "version.bnov": donnees[:4] + b"\xff\xff" + donnees[6:],
+        "entete.bnov": donnees[:7],
+        "tronque.bnov": donnees[:len(donnees) // 2],
+    }
+    for nom, contenu in corrompus.items():
+        chemin = tmp_path / nom
+        chemin.write_bytes(contenu)
+        assert charger_table(str(chemin)) is None, nom
+
+# Avec les tables, ou à défaut (fichier absent, autre plateau), la flotte de l'ordinateur est complète
+@pytest.mark.parametrize("classe_plateau", [Plateau, PlateauBitboard])
+def test_placer_flotte_ordinateur(tmp_path, classe_plateau):
+    absent = str(tmp_path / "absent.bnov")
+    for graine in range(100):
+        for taille, chemin in ((10, FICHIER), (10, absent), (8, FICHIER)):
+            plateau = classe_plateau(taille, random.Random(graine))
+            placer_flotte_ordinateur(plateau, random.Random(graine), chemin)
+            verifier_flotte(plateau)
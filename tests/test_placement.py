@@ -0,0 +1,98 @@
+# Placement des flottes : navires alignés, dans le plateau, sans chevauchement et, avec sans_contact,
+# sans contact même en diagonale
+import random
+
+import pytest
+
+from moteur import Navire, creer_flotte
+from moteur_creux import CASES_RECHERCHE_MAX, PlateauCreux
+from placement import generer_flotte, generer_flottes
+from simulation import MOTEURS
+
+LONGUEURS = [5, 4, 3, 3, 2]
+
+# Vérifie une flotte (liste des positions de chaque navire) et renvoie l'ensemble de ses cases
+def verifier_flotte(flotte, taille, longueurs, sans_contact=False):
+    assert [len(positions) for positions in flotte] == longueurs
+    cases = {}
+    for indice, positions in enumerate(flotte):
+        xs, ys = {x for x, _ in positions}, {y for _, y in positions}
+        assert len(xs) == 1 or len(ys) == 1  # Navire horizontal ou vertical
+        assert sorted(positions) == [(min(xs) + i * (len(xs) > 1), min(ys) + i * (len(ys) > 1))
+                                     for i in range(len(positions))]  # Cases contiguës
+        for x, y in positions:
+            assert 0 <= x < taille and 0 <= y < taille
+            assert (x, y) not in cases
+            cases[(x, y)] = indice
+    if sans_contact:
+        for (x, y), indice in cases.items():
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    assert cases.get((x + dx, y + dy), indice) == indice
+    return set(cases)
+
+# Flottes valides avec et sans contact, reproductibles pour une même graine
+@pytest.mark.parametrize("sans_contact", [False, True])
+def test_generer_flotte(sans_contact):
+    for graine in range(200):
+        flotte = generer_flotte(10, LONGUEURS, random.Random(graine), sans_contact)
+        verifier_flotte(flotte, 10, LONGUEURS, sans_contact)
+        assert flotte == generer_flotte(10, LONGUEURS, random.Random(graine), sans_contact)
+
+# Sans la contrainte, des navires finissent par se toucher ; avec, jamais
+def test_sans_contact_change_les_flottes():
+    rng = random.Random(0)
+    flottes = list(generer_flottes(200, 10, LONGUEURS, rng))
+    assert any(not verifier_contact(flotte) for flotte in flottes)
+    for flotte in generer_flottes(200, 10, LONGUEURS, rng, sans_contact=True):
+        assert verifier_contact(flotte)
+
+# Vrai si aucun navire n'en touche un autre, même en diagonale
+def verifier_contact(flotte):
+    proprietaire = {case: indice for indice, positions in enumerate(flotte) for case in positions}
+    return all(proprietaire.get((x + dx, y + dy), indice) == indice
+               for (x, y), indice in proprietaire.items() for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+# Sur un plateau très chargé, une disposition existante est toujours trouvée
+def test_plateau_charge():
+    flotte = generer_flotte(5, [5, 5, 5, 5, 5], random.Random(1))
+    assert len(verifier_flotte(flotte, 5, [5] * 5)) == 25
+    flotte = generer_flotte(7, [4, 3, 3, 2], random.Random(2), sans_contact=True)
+    verifier_flotte(flotte, 7, [4, 3, 3, 2], sans_contact=True)
+
+# Une flotte qui ne tient pas sur le plateau est refusée
+def test_flotte_impossible():
+    with pytest.raises(ValueError):
+        generer_flotte(3, [3, 3, 3, 2], random.Random(0))
+    with pytest.raises(ValueError):
+        generer_flotte(3, [3, 3, 3], random.Random(0), sans_contact=True)
+
+# Chaque moteur place une flotte complète et valide, avec et sans contact
+@pytest.mark.parametrize("moteur", sorted(MOTEURS))
+@pytest.mark.parametrize("sans_contact", [False, True])
+def test_placer_flotte_aleatoire(moteur, sans_contact):
+    classe_plateau, _ = MOTEURS[moteur]
+    for graine in range(20):
+        plateau = classe_plateau(10, random.Random(graine))
+        navires = creer_flotte(10)
+        plateau.placer_flotte_aleatoire(navires, sans_contact)
+        flotte = [list(navire.positions) for navire in plateau.navires]
+        verifier_flotte(flotte, 10, [len(positions) for positions in flotte], sans_contact)
+        assert sorted(map(len, flotte)) == sorted(navire.taille for navire in navires)
+
+# Sur un plateau encombré où le tirage navire par navire échoue souvent, le moteur creux trouve
+# toujours une disposition existante
+def test_creux_plateau_encombre():
+    longueurs = [5, 5, 5, 5, 4, 4, 4, 4]
+    for graine in range(10):
+        plateau = PlateauCreux(6, random.Random(graine))
+        plateau.placer_flotte_aleatoire([Navire("Navire", longueur) for longueur in longueurs])
+        verifier_flotte([list(navire.positions) for navire in plateau.navires], 6, longueurs)
+
+# Au-delà de CASES_RECHERCHE_MAX, le moteur creux renonce après un nombre d'essais annoncé
+def test_creux_grand_plateau_impossible():
+    taille = 33
+    assert taille * taille > CASES_RECHERCHE_MAX
+    plateau = PlateauCreux(taille, random.Random(0))
+    with pytest.raises(ValueError, match="ESSAIS_FLOTTE"):
+        plateau.placer_flotte_aleatoire([Navire("Navire", taille)] * (taille + 1))
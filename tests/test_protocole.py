@@ -0,0 +1,65 @@
+# Protocole réseau : construction et lecture des trames, codage des résultats et des placements
+import asyncio
+
+import pytest
+
+import protocole
+from moteur import FLOTTE
+
+# Lit les trames d'un flux contenant les octets donnés ; renvoie les trames lues et l'erreur finale
+def lire(donnees):
+    async def lire_tout():
+        reader = asyncio.StreamReader()
+        reader.feed_data(donnees)
+        reader.feed_eof()
+        trames = []
+        try:
+            while True:
+                trames.append(await protocole.lire_trame(reader))
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            return trames, e
+    return asyncio.run(lire_tout())
+
+# Une suite de trames est relue à l'identique, trames sans contenu comprises
+def test_aller_retour_trames():
+    messages = [(protocole.REJOINDRE, bytes([protocole.CONTRE_ORDINATEUR, 1])), (protocole.PLACER, b""),
+                (protocole.TIRER, protocole.COORDONNEES.pack(3, 7)), (protocole.ERREUR, "Case déjà visée.".encode()),
+                (protocole.PLACER, bytes(range(256)) * 3)]
+    donnees = b"".join(protocole.trame(type_message, contenu) for type_message, contenu in messages)
+    trames, erreur = lire(donnees)
+    assert trames == messages
+    assert isinstance(erreur, asyncio.IncompleteReadError) and erreur.partial == b""
+
+# En-tête : longueur (type compris) sur deux octets big-endian, puis le type
+def test_format_trame():
+    assert protocole.trame(protocole.FIN, b"\x01") == b"\x00\x02\x84\x01"
+    assert protocole.trame(protocole.DEBUT) == b"\x00\x01\x82"
+
+# Une trame de longueur nulle est refusée ; une trame tronquée n'est pas rendue
+def test_trames_invalides():
+    trames, erreur = lire(b"\x00\x00\x03" + protocole.trame(protocole.TIRER, b"\x00\x01\x00\x02"))
+    assert trames == [] and isinstance(erreur, ValueError)
+    trames, erreur = lire(protocole.trame(protocole.TIRER, b"\x00\x01\x00\x02")[:-1])
+    assert trames == [] and isinstance(erreur, asyncio.IncompleteReadError)
+
+# Les résultats du moteur passent par le réseau sans perte
+@pytest.mark.parametrize("resultat", ["Manqué", "Touché"] + [f"Coulé: {nom}" for nom, _ in FLOTTE])
+def test_resultats(resultat):
+    type_message, contenu = lire(protocole.trame_resultat(1, (4, 9), resultat))[0][0]
+    assert type_message == protocole.RESULTAT
+    tireur, x, y, code, navire = protocole.RESULTAT_TIR.unpack(contenu)
+    assert (tireur, x, y) == (1, 4, 9)
+    assert protocole.decoder_resultat(code, navire) == resultat
+
+# Un placement est relu à l'identique ; un placement incomplet est refusé
+def test_placement():
+    dispositions = []
+    for ligne, (_, taille) in enumerate(FLOTTE):
+        if ligne % 2:
+            dispositions.append([(ligne, y) for y in range(taille)])
+        else:
+            dispositions.append([(x, ligne) for x in range(taille)])
+    contenu = protocole.coder_placement(dispositions)
+    assert protocole.decoder_placement(contenu) == dispositions
+    with pytest.raises(ValueError):
+        protocole.decoder_placement(contenu[:-1])
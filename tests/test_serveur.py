@@ -0,0 +1,150 @@
+# Serveur : déroulement complet d'une partie contre l'ordinateur et entre deux joueurs, réponses aux
+# messages invalides et enregistrement des parties, sur de vraies connexions locales
+import asyncio
+import io
+
+import protocole
+from enregistrement import EcrivainParties, MAGIE, PartieEnregistree, lire_varint
+from serveur import NIVEAUX_RESEAU, Serveur
+
+# Client de test : envoie des trames et lit les réponses du serveur
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    # Ouvre une connexion vers le serveur de test
+    @classmethod
+    async def connecter(cls, port):
+        return cls(*await asyncio.open_connection("127.0.0.1", port))
+
+    # Envoie une trame
+    async def envoyer(self, type_message, contenu=b""):
+        self.writer.write(protocole.trame(type_message, contenu))
+        await self.writer.drain()
+
+    # Trame suivante (type, contenu), ou None si le serveur a fermé la connexion
+    async def recevoir(self):
+        try:
+            return await asyncio.wait_for(protocole.lire_trame(self.reader), 10)
+        except asyncio.IncompleteReadError:
+            return None
+
+    # Ferme la connexion
+    async def fermer(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+# Lance un scénario (coroutine recevant le serveur et son port) contre un serveur local
+def avec_serveur(scenario, ecrivain=None):
+    async def executer():
+        serveur = Serveur(graine=0, ecrivain=ecrivain)
+        ecoute = await asyncio.start_server(serveur.gerer_connexion, "127.0.0.1", 0)
+        async with ecoute:
+            await scenario(serveur, ecoute.sockets[0].getsockname()[1])
+    asyncio.run(executer())
+
+# Le client tire sur toutes les cases dans l'ordre, chaque tir étant suivi de celui de l'ordinateur,
+# jusqu'à la fin ; renvoie (a gagné, nombre de tirs du client)
+async def jouer_contre_ordinateur(client):
+    for tirs, case in enumerate([(x, y) for x in range(10) for y in range(10)], 1):
+        await client.envoyer(protocole.TIRER, protocole.COORDONNEES.pack(*case))
+        while True:
+            type_message, contenu = await client.recevoir()
+            assert type_message in (protocole.RESULTAT, protocole.FIN)
+            if type_message == protocole.FIN:
+                return bool(contenu[0]), tirs
+            tireur, x, y, _, _ = protocole.RESULTAT_TIR.unpack(contenu)
+            assert tireur == 1 or (x, y) == case
+            if tireur == 1:
+                break
+
+# Partie complète contre l'ordinateur : placement aléatoire, tirs jusqu'à la fin, partie enregistrée
+def test_partie_contre_ordinateur():
+    fichier = io.BytesIO()
+    ecrivain = EcrivainParties(fichier)
+
+    async def scenario(serveur, port):
+        client = await Client.connecter(port)
+        await client.envoyer(protocole.REJOINDRE, bytes([protocole.CONTRE_ORDINATEUR, NIVEAUX_RESEAU.index("Facile")]))
+        type_message, contenu = await client.recevoir()
+        assert type_message == protocole.PARTIE and int.from_bytes(contenu[:2], "big") == 10
+        await client.envoyer(protocole.PLACER)
+        type_message, contenu = await client.recevoir()
+        assert (type_message, contenu) == (protocole.DEBUT, b"\x01")
+        gagne, tirs = await jouer_contre_ordinateur(client)
+        await client.fermer()
+        assert tirs >= 17 if gagne else tirs >= 1
+
+    avec_serveur(scenario, ecrivain)
+    donnees = fichier.getvalue()
+    assert donnees.startswith(MAGIE)
+    longueur, position = lire_varint(donnees, len(MAGIE))
+    partie = PartieEnregistree.decoder(donnees[position:position + longueur])
+    assert position + longueur == len(donnees)
+    assert partie.gagnant() is not None
+    joueurs = partie.reconstruire()
+    assert joueurs[1 - partie.gagnant()].plateau.tous_coules()
+
+# Deux joueurs : le premier attend le second, chacun place sa flotte, tirer hors de son tour est
+# refusé sans fermer la connexion, et une déconnexion donne la victoire à l'adversaire
+def test_partie_entre_joueurs():
+    async def scenario(serveur, port):
+        a, b = await Client.connecter(port), await Client.connecter(port)
+        await a.envoyer(protocole.REJOINDRE, bytes([protocole.CONTRE_JOUEUR, 0]))
+        await asyncio.sleep(0.05)
+        assert serveur.en_attente is not None
+        await b.envoyer(protocole.REJOINDRE, bytes([protocole.CONTRE_JOUEUR, 0]))
+        for client in (a, b):
+            assert (await client.recevoir())[0] == protocole.PARTIE
+            await client.envoyer(protocole.PLACER)
+        debuts = [await client.recevoir() for client in (a, b)]
+        assert sorted(contenu for _, contenu in debuts) == [b"\x00", b"\x01"]
+        premier, second = (a, b) if debuts[0][1] == b"\x01" else (b, a)
+
+        await second.envoyer(protocole.TIRER, protocole.COORDONNEES.pack(0, 0))
+        type_message, contenu = await second.recevoir()
+        assert type_message == protocole.ERREUR and contenu.decode() == "Ce n'est pas votre tour."
+        await premier.envoyer(protocole.TIRER, protocole.COORDONNEES.pack(0, 0))
+        for client, tireur in ((premier, 0), (second, 1)):
+            type_message, contenu = await client.recevoir()
+            assert type_message == protocole.RESULTAT and protocole.RESULTAT_TIR.unpack(contenu)[:3] == (tireur, 0, 0)
+
+        await premier.fermer()
+        assert await second.recevoir() == (protocole.FIN, b"\x01")
+        await second.fermer()
+        await asyncio.sleep(0.05)
+        assert serveur.connexions == 0
+
+    avec_serveur(scenario)
+
+# Un message refusé renvoie ERREUR et laisse la connexion ouverte ; une trame de longueur nulle la ferme
+def test_messages_invalides():
+    async def scenario(serveur, port):
+        client = await Client.connecter(port)
+        for type_message, contenu, erreur in (
+                (protocole.TIRER, protocole.COORDONNEES.pack(0, 0), "Aucune partie en cours."),
+                (protocole.REJOINDRE, bytes([7, 0]), "Mode inconnu."),
+                (protocole.REJOINDRE, bytes([protocole.CONTRE_ORDINATEUR, len(NIVEAUX_RESEAU)]), "Niveau inconnu."),
+                (protocole.REJOINDRE, b"\x00", "Message REJOINDRE mal formé.")):
+            await client.envoyer(type_message, contenu)
+            assert await client.recevoir() == (protocole.ERREUR, erreur.encode())
+
+        await client.envoyer(protocole.REJOINDRE, bytes([protocole.CONTRE_ORDINATEUR, 0]))
+        assert (await client.recevoir())[0] == protocole.PARTIE
+        await client.envoyer(protocole.PLACER, b"\x00")
+        assert await client.recevoir() == (protocole.ERREUR, "Placement incomplet.".encode())
+        await client.envoyer(protocole.PLACER)
+        assert (await client.recevoir())[0] == protocole.DEBUT
+        await client.envoyer(protocole.TIRER, b"\x00")
+        assert await client.recevoir() == (protocole.ERREUR, "Tir mal formé.".encode())
+
+        client.writer.write(b"\x00\x00\x03")
+        await client.writer.drain()
+        assert await client.recevoir() == (protocole.ERREUR, "Trame de longueur nulle.".encode())
+        assert await client.recevoir() is None
+        await client.fermer()
+        await asyncio.sleep(0.05)
+        assert serveur.connexions == 0
+
+    avec_serveur(scenario)
@@ -0,0 +1,86 @@
+# Table de transposition : éviction du moins récemment utilisé, statistiques, empreintes de Zobrist
+# et statistiques de simulation indépendantes du nombre de processus
+import random
+import sys
+
+from simulation import simuler, simuler_parallele
+from transposition import TableTransposition, zobrist
+
+# Au-delà de la capacité, l'entrée la moins récemment utilisée (rangée ou trouvée) est évincée
+def test_eviction_lru():
+    table = TableTransposition(capacite=3)
+    for cle in "abc":
+        table.ranger(cle, cle.upper())
+    assert table.chercher("a") == "A"  # "a" devient la plus récente : "b" est la plus ancienne
+    table.ranger("d", "D")
+    assert list(table.entrees) == ["c", "a", "d"]
+    assert table.chercher("b") is None
+    table.ranger("c", "C2")  # Remplacer une entrée la rafraîchit sans éviction
+    table.ranger("e", "E")
+    assert list(table.entrees) == ["d", "c", "e"] and table.chercher("c") == "C2"
+    assert table.statistiques() == {"entrees": 3, "capacite": 3, "octets": 0, "succes": 2, "echecs": 1,
+                                    "evictions": 2, "taux_succes": 2 / 3}
+
+# vider efface entrées et statistiques
+def test_vider():
+    table = TableTransposition(capacite=2)
+    for cle in range(5):
+        table.ranger(cle, cle + 1)
+    table.chercher(4)
+    table.vider()
+    assert len(table) == 0 and table.statistiques()["evictions"] == 0 and table.taux_succes() == 0.0
+
+# Les empreintes ne dépendent que de la position, pas de l'ordre des tirs qui y mènent
+def test_zobrist():
+    cles = zobrist(10, (5, 4, 3, 3, 2))
+    assert cles is zobrist(10, (5, 4, 3, 3, 2))
+    a = cles.initiale ^ cles.case(3, 0, 1) ^ cles.case(7, 0, 2)
+    b = cles.initiale ^ cles.case(7, 0, 2) ^ cles.case(3, 0, 1)
+    assert a == b != cles.initiale
+    assert a ^ cles.case(3, 0, 1) ^ cles.case(7, 0, 2) == cles.initiale
+    coule = cles.initiale ^ cles.restant(3, 2, 1)
+    assert coule != cles.initiale and coule ^ cles.restant(3, 2, 1) == cles.initiale
+
+# Avec ou sans processus, les lots ont chacun leur table : parties et statistiques de la table
+# se reproduisent à partir de la seule graine
+def test_statistiques_independantes_des_processus():
+    seul = simuler(60, "Facile", "Probabiliste", graine=7, transposition=5000, taille_lot=25)
+    parallele = simuler_parallele(60, "Facile", "Probabiliste", graine=7, processus=2, taille_lot=25,
+                                  transposition=5000)
+    assert seul.tirs_pour_gagner == parallele.tirs_pour_gagner
+    assert seul.transposition == parallele.transposition
+    assert seul.transposition["succes"] > 0
+
+# Les entrées rangées avec leur taille sont limitées ensemble à octets_max : les entrées les moins
+# récemment utilisées partent d'abord, quelle que soit leur taille ; les entrées sans taille ne
+# comptent pas dans les octets
+def test_limite_octets():
+    table = TableTransposition(capacite=100, octets_max=1000)
+    table.ranger("sans taille", 1)
+    for cle in range(4):
+        table.ranger(cle, cle, 300)
+    assert list(table.entrees) == [1, 2, 3] and table.octets == 900 and table.evictions == 2
+    table.ranger(2, "plus grande", 500)  # Remplacer une entrée compte sa nouvelle taille
+    assert list(table.entrees) == [3, 2] and table.octets == 800
+    table.ranger("sans taille", 0)
+    assert table.octets == 800 and list(table.entrees) == [3, 2, "sans taille"]
+    table.vider()
+    assert table.octets == 0 and not table.tailles
+
+# L'IA experte range, par position, le nombre d'échantillons et leur couverture de chaque case, avec
+# la taille de cette couverture ; une même position retrouvée cumule les échantillons
+def test_entrees_ia_experte():
+    from ia import IAExpert
+    from moteur import FLOTTE, JoueurBitboard, PlateauBitboard
+
+    table = TableTransposition()
+    ias = [IAExpert(JoueurBitboard("A", PlateauBitboard(10)), random.Random(graine), table=table,
+                    echantillons_max=200, budget=1.0) for graine in (1, 2)]
+    for ia in ias:
+        ia.observer((0, 0), "Manqué")
+        ia.choisir_tir()
+    (n, couverture), = table.entrees.values()
+    assert n == ias[0].echantillons + 200 == ias[1].echantillons
+    assert len(couverture) == 100 and couverture[0] == 0
+    assert sum(couverture) == n * sum(longueur for _, longueur in FLOTTE)  # Toutes les cases de chaque flotte
+    assert table.octets == sys.getsizeof(couverture) < 1000
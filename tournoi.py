@@ -0,0 +1,207 @@
+# Tournoi toutes rondes entre stratégies de tir : chaque paire de niveaux joue un nombre de
+# parties à graines fixées (réparties sur plusieurs processus), puis les stratégies sont classées
+# par un modèle de Bradley-Terry exprimé en points Elo, avec des intervalles de confiance obtenus
+# par rééchantillonnage (bootstrap) des parties. La latence de décision par coup de chaque
+# stratégie est mesurée pendant le tournoi, pour comparer force et coût CPU.
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import time
+
+from ia import NIVEAUX
+from instrumentation import Histogramme
+from simulation import MOTEURS, graine_partie, jouer_partie
+
+ELO_MOYEN = 1500  # Classement moyen des stratégies
+ECHELLE_ELO = 400 / math.log(10)  # Points Elo par unité de log-force
+PRIOR = 0.5  # Victoires fictives accordées à chaque joueur d'une paire (évite les forces infinies)
+ITERATIONS = 200  # Itérations maximales de l'estimation des forces
+TOLERANCE = 1e-9  # Variation relative des forces en deçà de laquelle l'estimation s'arrête
+
+# Résultats d'un tournoi : victoires par paire et latences de décision par stratégie
+class Resultats:
+    def __init__(self, niveaux):
+        self.niveaux = list(niveaux)
+        self.victoires = {}  # (gagnant, perdant) -> nombre de victoires
+        self.parties = []  # (niveau A, niveau B, indice du gagnant) de chaque partie
+        self.latences = {niveau: Histogramme("latence", (("ia", niveau),), "") for niveau in self.niveaux}
+        self.duree = 0.0  # Temps réel écoulé (s)
+
+    # Enregistre une partie
+    def ajouter(self, niveau_a, niveau_b, gagnant):
+        self.parties.append((niveau_a, niveau_b, gagnant))
+        vainqueur, vaincu = (niveau_a, niveau_b) if gagnant == 0 else (niveau_b, niveau_a)
+        self.victoires[vainqueur, vaincu] = self.victoires.get((vainqueur, vaincu), 0) + 1
+
+    # Ajoute les résultats d'un lot de parties
+    def fusionner(self, autre):
+        for partie in autre.parties:
+            self.ajouter(*partie)
+        for niveau, histogramme in autre.latences.items():
+            self.latences[niveau].fusionner(histogramme)
+
+    # Taux de victoire de niveau_a contre niveau_b
+    def score(self, niveau_a, niveau_b):
+        gagnees = self.victoires.get((niveau_a, niveau_b), 0)
+        perdues = self.victoires.get((niveau_b, niveau_a), 0)
+        return gagnees / (gagnees + perdues) if gagnees + perdues else 0.0
+
+# Classement Elo (Bradley-Terry) : forces maximisant la vraisemblance des victoires observées,
+# calculées par l'algorithme MM de Hunter, ramenées à une moyenne de ELO_MOYEN
+def classement_elo(niveaux, victoires):
+    forces = {niveau: 1.0 for niveau in niveaux}
+    paires = list(itertools.combinations(niveaux, 2))
+    gagnees = {niveau: 0.0 for niveau in niveaux}
+    rencontres = {}
+    for a, b in paires:
+        w_ab, w_ba = victoires.get((a, b), 0) + PRIOR, victoires.get((b, a), 0) + PRIOR
+        gagnees[a] += w_ab
+        gagnees[b] += w_ba
+        rencontres[a, b] = rencontres[b, a] = w_ab + w_ba
+
+    for _ in range(ITERATIONS):
+        nouvelles = {}
+        for niveau in niveaux:
+            denominateur = sum(rencontres[niveau, autre] / (forces[niveau] + forces[autre])
+                               for autre in niveaux if autre != niveau)
+            nouvelles[niveau] = gagnees[niveau] / denominateur if denominateur else forces[niveau]
+        moyenne = math.exp(sum(math.log(f) for f in nouvelles.values()) / len(nouvelles))
+        nouvelles = {niveau: f / moyenne for niveau, f in nouvelles.items()}
+        ecart = max(abs(nouvelles[n] - forces[n]) / forces[n] for n in niveaux)
+        forces = nouvelles
+        if ecart < TOLERANCE:
+            break
+    return {niveau: ELO_MOYEN + ECHELLE_ELO * math.log(force) for niveau, force in forces.items()}
+
+# Intervalle de confiance (niveau donné) du classement de chaque stratégie : les parties de chaque
+# paire sont rééchantillonnées avec remise et le classement recalculé
+def intervalles_confiance(resultats, tirages=200, niveau=0.95, graine=0):
+    rng = random.Random(graine)
+    par_paire = {}
+    for niveau_a, niveau_b, gagnant in resultats.parties:
+        cle = tuple(sorted((niveau_a, niveau_b)))
+        par_paire.setdefault(cle, []).append(niveau_a if gagnant == 0 else niveau_b)
+
+    for gagnants in par_paire.values():
+        gagnants.sort()  # Indépendant de l'ordre d'arrivée des lots
+    echantillons = {n: [] for n in resultats.niveaux}
+    for _ in range(tirages):
+        victoires = {}
+        for (a, b), gagnants in par_paire.items():
+            for vainqueur in rng.choices(gagnants, k=len(gagnants)):
+                cle = (a, b) if vainqueur == a else (b, a)
+                victoires[cle] = victoires.get(cle, 0) + 1
+        for n, elo in classement_elo(resultats.niveaux, victoires).items():
+            echantillons[n].append(elo)
+
+    alpha = (1 - niveau) / 2
+    intervalles = {}
+    for n, valeurs in echantillons.items():
+        valeurs.sort()
+        intervalles[n] = (valeurs[int(alpha * (len(valeurs) - 1))], valeurs[int((1 - alpha) * (len(valeurs) - 1))])
+    return intervalles
+
+# Joue les parties d'indices debut à fin - 1 d'une paire (joueur qui commence alterné) ; point
+# d'entrée des processus de travail (les arguments arrivent sous forme de tuple)
+def jouer_lot(arguments):
+    niveau_a, niveau_b, moteur, graine, debut, fin = arguments
+    resultats = Resultats((niveau_a, niveau_b))
+    chronos = [resultats.latences[niveau_a], resultats.latences[niveau_b]]
+    for i in range(debut, fin):
+        graine_i = graine_partie(graine, i)
+        gagnant, _ = jouer_partie(niveau_a, niveau_b, moteur, premier=i % 2, rng=random.Random(graine_i),
+                                  chronos=chronos)
+        resultats.ajouter(niveau_a, niveau_b, gagnant)
+    return resultats
+
+# Tournoi toutes rondes : parties parties par paire de niveaux, en lots répartis sur un groupe de
+# processus (processus=1 : sans parallélisme). Pour une graine donnée, les parties jouées ne
+# dépendent pas du nombre de processus (sauf pour les niveaux limités par un budget de temps)
+def jouer_tournoi(niveaux, parties=100, moteur="bitboard", graine=0, processus=1, taille_lot=50):
+    lots = []
+    for k, (niveau_a, niveau_b) in enumerate(itertools.combinations(niveaux, 2)):
+        graine_paire = graine_partie(graine, k)
+        lots.extend((niveau_a, niveau_b, moteur, graine_paire, debut, min(debut + taille_lot, parties))
+                    for debut in range(0, parties, taille_lot))
+
+    resultats = Resultats(niveaux)
+    chrono = time.perf_counter()
+    if processus == 1:
+        for lot in lots:
+            resultats.fusionner(jouer_lot(lot))
+    else:
+        with multiprocessing.Pool(processus) as pool:
+            for lot in pool.imap_unordered(jouer_lot, lots):
+                resultats.fusionner(lot)
+    resultats.duree = time.perf_counter() - chrono
+    return resultats
+
+# Rapport du tournoi sous forme de dictionnaire sérialisable en JSON
+def rapport(resultats, tirages=200):
+    elo = classement_elo(resultats.niveaux, resultats.victoires)
+    intervalles = intervalles_confiance(resultats, tirages)
+    strategies = {}
+    for niveau in sorted(resultats.niveaux, key=lambda n: -elo[n]):
+        latence = resultats.latences[niveau].instantane()
+        strategies[niveau] = {
+            "elo": elo[niveau],
+            "ic95": list(intervalles[niveau]),
+            "latence_moyenne_s": latence["moyenne"],
+            "latence_p50_s": latence["p50"],
+            "latence_p99_s": latence["p99"],
+            "coups": latence["nombre"],
+        }
+    return {
+        "parties": len(resultats.parties),
+        "duree_s": resultats.duree,
+        "strategies": strategies,
+        "scores": {a: {b: resultats.score(a, b) for b in resultats.niveaux if b != a} for a in resultats.niveaux},
+    }
+
+# Affiche le classement et la table des scores
+def afficher(document):
+    print(f"{document['parties']} parties en {document['duree_s']:.1f}s")
+    print(f"{'stratégie':14s} {'Elo':>6s} {'IC 95 %':>15s} {'latence moy.':>13s} {'p50':>9s} {'p99':>9s}")
+    for niveau, ligne in document["strategies"].items():
+        bas, haut = ligne["ic95"]
+        print(f"{niveau:14s} {ligne['elo']:6.0f} {f'[{bas:.0f}, {haut:.0f}]':>15s} "
+              f"{ligne['latence_moyenne_s'] * 1e6:10.1f} µs {ligne['latence_p50_s'] * 1e6:6.0f} µs "
+              f"{ligne['latence_p99_s'] * 1e6:6.0f} µs")
+    niveaux = list(document["strategies"])
+    print()
+    print(" " * 14 + "".join(f"{niveau[:12]:>13s}" for niveau in niveaux))
+    for a in niveaux:
+        print(f"{a:14s}" + "".join(f"{'-' if a == b else format(document['scores'][a][b], '.1%'):>13s}"
+                                   for b in niveaux))
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Tournoi toutes rondes entre stratégies de tir, classement Elo")
+    parser.add_argument("niveaux", nargs="*", default=None, help="stratégies engagées (toutes par défaut)")
+    parser.add_argument("-n", "--parties", type=int, default=100, help="parties par paire de stratégies")
+    parser.add_argument("--moteur", choices=sorted(MOTEURS), default="bitboard", help="représentation du plateau")
+    parser.add_argument("--graine", type=int, default=0, help="graine maîtresse")
+    parser.add_argument("-p", "--processus", type=int, default=1,
+                        help="nombre de processus (0 = tous les cœurs, 1 = sans parallélisme)")
+    parser.add_argument("--taille-lot", type=int, default=50, help="parties par lot en parallèle")
+    parser.add_argument("--bootstrap", type=int, default=200, help="tirages pour les intervalles de confiance")
+    parser.add_argument("--json", default=None, help="fichier où écrire le rapport")
+    args = parser.parse_args(arguments)
+
+    niveaux = args.niveaux or list(NIVEAUX)
+    inconnus = [niveau for niveau in niveaux if niveau not in NIVEAUX]
+    if inconnus or len(niveaux) < 2:
+        parser.error(f"il faut au moins deux niveaux parmi {', '.join(NIVEAUX)}")
+    resultats = jouer_tournoi(niveaux, args.parties, args.moteur, args.graine, args.processus or None,
+                              args.taille_lot)
+    document = rapport(resultats, args.bootstrap)
+    afficher(document)
+    if args.json:
+        with open(args.json, "w") as fichier:
+            json.dump(document, fichier, indent=2)
+
+# Point d'entrée pour lancer un tournoi
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Table de transposition des IA : une position observée (état de chaque case et navires encore
+# à flot) est identifiée par une empreinte de Zobrist, mise à jour par XOR à chaque observation,
+# et les évaluations déjà calculées pour cette position sont conservées dans un cache LRU borné.
+import random
+from collections import OrderedDict
+from functools import lru_cache
+
+# États d'une case observée
+INCONNUE = 0
+MANQUEE = 1
+TOUCHEE = 2  # Touchée, navire pas encore identifié
+COULEE = 3  # Appartient à un navire coulé identifié
+
+CAPACITE = 100_000  # Nombre d'entrées par défaut d'une table
+OCTETS_MAX = 16 * 2**20  # Mémoire par défaut des entrées volumineuses (rangées avec leur taille)
+
+# Clés aléatoires de Zobrist pour un plateau et une flotte donnés
+class Zobrist:
+    def __init__(self, taille, longueurs, graine=0x5EED):
+        rng = random.Random(f"{graine}:{taille}:{longueurs}")
+        nombres = {longueur: longueurs.count(longueur) for longueur in longueurs}
+        # Clé de chaque état de chaque case (l'état INCONNUE vaut 0 : case absente de l'empreinte)
+        self.cases = [(0, rng.getrandbits(64), rng.getrandbits(64), rng.getrandbits(64))
+                      for _ in range(taille * taille)]
+        # Clé de chaque nombre possible de navires à flot, par longueur
+        self.restants = {longueur: [rng.getrandbits(64) for _ in range(nombre + 1)]
+                         for longueur, nombre in nombres.items()}
+        self.initiale = 0  # Empreinte de la position de départ (aucun tir, flotte complète)
+        for longueur, nombre in nombres.items():
+            self.initiale ^= self.restants[longueur][nombre]
+
+    # Terme à combiner par XOR pour faire passer une case d'un état à un autre
+    def case(self, case, ancien, nouveau):
+        cles = self.cases[case]
+        return cles[ancien] ^ cles[nouveau]
+
+    # Terme à combiner par XOR quand le nombre de navires à flot d'une longueur change
+    def restant(self, longueur, ancien, nouveau):
+        cles = self.restants[longueur]
+        return cles[ancien] ^ cles[nouveau]
+
+# Clés partagées par toutes les IA d'un même plateau et d'une même flotte
+@lru_cache(maxsize=None)
+def zobrist(taille, longueurs):
+    return Zobrist(taille, tuple(longueurs))
+
+# Cache borné (éviction du moins récemment utilisé) avec statistiques de succès. Le nombre
+# d'entrées est limité par capacite ; les entrées volumineuses, rangées avec leur taille en octets,
+# sont en plus limitées ensemble à octets_max.
+class TableTransposition:
+    def __init__(self, capacite=CAPACITE, octets_max=OCTETS_MAX):
+        self.capacite = capacite
+        self.octets_max = octets_max
+        self.entrees = OrderedDict()
+        self.tailles = {}  # Taille en octets des entrées rangées avec leur taille
+        self.octets = 0  # Somme de ces tailles
+        self.succes = 0  # Recherches ayant trouvé une entrée
+        self.echecs = 0  # Recherches infructueuses
+        self.evictions = 0  # Entrées retirées faute de place
+
+    # Valeur associée à une clé (None si absente) ; l'entrée devient la plus récente
+    def chercher(self, cle):
+        valeur = self.entrees.get(cle)
+        if valeur is None:
+            self.echecs += 1
+            return None
+        self.entrees.move_to_end(cle)
+        self.succes += 1
+        return valeur
+
+    # Associe une valeur (non None) à une clé, en évinçant les entrées les plus anciennes tant que la
+    # table est pleine ; octets : taille de la valeur, à fournir pour les valeurs volumineuses
+    def ranger(self, cle, valeur, octets=0):
+        self.octets += octets - self.tailles.pop(cle, 0)
+        if octets:
+            self.tailles[cle] = octets
+        self.entrees[cle] = valeur
+        self.entrees.move_to_end(cle)
+        while len(self.entrees) > self.capacite or self.octets > self.octets_max:
+            ancienne, _ = self.entrees.popitem(last=False)
+            self.octets -= self.tailles.pop(ancienne, 0)
+            self.evictions += 1
+
+    # Vide la table et remet les statistiques à zéro
+    def vider(self):
+        self.entrees.clear()
+        self.tailles.clear()
+        self.octets = 0
+        self.succes = self.echecs = self.evictions = 0
+
+    def __len__(self):
+        return len(self.entrees)
+
+    # Proportion des recherches servies par la table
+    def taux_succes(self):
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+    # Statistiques sous forme de dictionnaire
+    def statistiques(self):
+        return {
+            "entrees": len(self.entrees),
+            "capacite": self.capacite,
+            "octets": self.octets,
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+            "taux_succes": self.taux_succes(),
+        }